@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+import sys
+
+sys.path.append(".")
+
+# isort: split
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+from bench.fixtures import load_watch_lines
+from kube.codec import create_codec, get_available_backends
+from kube.events.objects import Action
+
+
+def parse_action_by_scan(item) -> Action:
+    # how actions used to be parsed, for comparison
+    action_str = item["type"]
+
+    for attname in dir(Action):
+        attvalue = getattr(Action, attname)
+        if attname.startswith("_") or callable(attvalue):
+            continue
+
+        if attname == action_str:
+            return attvalue
+
+    raise RuntimeError("Failed to parse action from item: %r" % item)
+
+
+def parse_action_by_value(item) -> Action:
+    return Action(item["type"])
+
+
+def measure(label: str, func: Callable[[], Any], *, events: int, rounds: int):
+    # warm up
+    func()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - start
+
+    print("%-24s %10.0f events/s" % (label, events * rounds / elapsed))
+
+
+def main(args: argparse.Namespace) -> None:
+    lines = load_watch_lines(args.file, args.count)
+    size = sum(len(line) for line in lines)
+
+    print(
+        "Decoding %s watch events (%s bytes), %s rounds"
+        % (len(lines), size, args.rounds)
+    )
+
+    for name in get_available_backends():
+        codec = create_codec(name)
+
+        def decode(lines: List[bytes] = lines) -> None:
+            for line in lines:
+                dct = codec.loads(line)
+                parse_action_by_value(dct)
+
+        measure(name, decode, events=len(lines), rounds=args.rounds)
+
+    items = [create_codec("json").loads(line) for line in lines]
+
+    for label, parse in (
+        ("action by dir() scan", parse_action_by_scan),
+        ("action by value", parse_action_by_value),
+    ):
+
+        def parse_actions(parse=parse) -> None:
+            for item in items:
+                parse(item)
+
+        measure(label, parse_actions, events=len(items), rounds=args.rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        dest="file",
+        action="store",
+        help="Recorded watch stream (one json event per line), generated if not set",
+    )
+    parser.add_argument(
+        "--count",
+        dest="count",
+        action="store",
+        type=int,
+        default=5000,
+        help="Number of pods to generate watch events for",
+    )
+    parser.add_argument(
+        "--rounds",
+        dest="rounds",
+        action="store",
+        type=int,
+        default=5,
+        help="Number of times to decode the stream",
+    )
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+import sys
+
+sys.path.append(".")
+
+# isort: split
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+from bench.fixtures import load_pod_list
+from kube.config import Cluster, Context, User
+from kube.events.objects import Action, ObjectEvent
+from podview.model.model import ScreenModel
+from podview.model.updater import ModelUpdater
+
+
+def create_context() -> Context:
+    user = User(
+        name="user",
+        username=None,
+        password=None,
+        client_cert_path=None,
+        client_key_path=None,
+        client_cert_data=None,
+        client_key_data=None,
+        exec=None,
+    )
+    cluster = Cluster(
+        name="cluster",
+        server="https://localhost:6443",
+        ca_cert_path=None,
+        ca_cert_data=None,
+    )
+    return Context(name="context", user=user, cluster=cluster, namespace=None)
+
+
+def measure(
+    label: str,
+    setup: Callable[[], Any],
+    func: Callable[[Any], Any],
+    *,
+    items: int,
+    rounds: int
+):
+    # warm up
+    func(setup())
+
+    elapsed = 0.0
+    for _ in range(rounds):
+        # events cache what they parse, so every round needs fresh ones
+        arg = setup()
+
+        start = time.perf_counter()
+        func(arg)
+        elapsed += time.perf_counter() - start
+
+    per_sec = items * rounds / elapsed
+    print(
+        "%-28s %10.0f events/s  %8.1f ms/round"
+        % (label, per_sec, elapsed / rounds * 1000)
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    pod_list = load_pod_list(args.file, args.count)
+    items = pod_list["items"]
+
+    # the client fills these in on list items
+    for item in items:
+        item["apiVersion"] = "v1"
+        item["kind"] = "Pod"
+
+    context = create_context()
+    updater_args = argparse.Namespace(pod="*", namespace=None, cluster_context="*")
+    updater = ModelUpdater(contexts=[context], receivers=[], args=updater_args)
+    pipeline = updater.create_pipeline()
+
+    def create_events() -> List[ObjectEvent]:
+        return [
+            ObjectEvent(context=context, action=Action.LISTED, object=item)
+            for item in items
+        ]
+
+    def process_events() -> List[ObjectEvent]:
+        events = [pipeline.process(event) for event in create_events()]
+        return [event for event in events if event is not None]
+
+    def apply(events: List[ObjectEvent]) -> None:
+        model = ScreenModel(updater_args)
+        for event in events:
+            updater.update_model(model, event)
+
+    def filter_and_apply(events: List[ObjectEvent]) -> None:
+        model = ScreenModel(updater_args)
+        for event in events:
+            if updater.filter_event(event):
+                updater.update_model(model, event)
+
+    print("Processing %s pod events, %s rounds" % (len(items), args.rounds))
+
+    items_count = len(items)
+    measure(
+        "ui thread, unprocessed",
+        create_events,
+        filter_and_apply,
+        items=items_count,
+        rounds=args.rounds,
+    )
+    measure(
+        "loop thread, pipeline",
+        create_events,
+        lambda events: [pipeline.process(event) for event in events],
+        items=items_count,
+        rounds=args.rounds,
+    )
+    measure(
+        "ui thread, processed",
+        process_events,
+        apply,
+        items=items_count,
+        rounds=args.rounds,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        dest="file",
+        action="store",
+        help="Recorded pod list (kubectl get pods -o json), generated if not set",
+    )
+    parser.add_argument(
+        "--count",
+        dest="count",
+        action="store",
+        type=int,
+        default=5000,
+        help="Number of pods to generate",
+    )
+    parser.add_argument(
+        "--rounds",
+        dest="rounds",
+        action="store",
+        type=int,
+        default=5,
+        help="Number of times to process the events",
+    )
+    args = parser.parse_args()
+
+    main(args)
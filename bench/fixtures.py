@@ -0,0 +1,197 @@
+"""
+Fixtures for the benchmarks.
+
+The benchmarks run on recorded data where possible, eg.
+
+    $ kubectl get pods -A -o json > pods.json
+
+When no recording is given we generate pod lists that look like the ones a
+real cluster returns, including managedFields and the last-applied annotation.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+EPOCH = datetime(2021, 6, 1, tzinfo=timezone.utc)
+
+
+def format_date(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_container_status(rnd: random.Random, name: str, started: datetime):
+    return {
+        "containerID": "containerd://%032x" % rnd.getrandbits(128),
+        "image": f"registry.example.com/{name}:1.{rnd.randint(0, 99)}.0",
+        "imageID": f"registry.example.com/{name}@sha256:%064x" % rnd.getrandbits(256),
+        "lastState": {},
+        "name": name,
+        "ready": True,
+        "restartCount": rnd.randint(0, 3),
+        "started": True,
+        "state": {"running": {"startedAt": format_date(started)}},
+    }
+
+
+def make_container(name: str, image: str):
+    return {
+        "image": image,
+        "imagePullPolicy": "IfNotPresent",
+        "name": name,
+        "ports": [{"containerPort": 8080, "name": "http", "protocol": "TCP"}],
+        "env": [{"name": "APP_NAME", "value": name}],
+        "resources": {
+            "limits": {"cpu": "500m", "memory": "512Mi"},
+            "requests": {"cpu": "100m", "memory": "128Mi"},
+        },
+        "terminationMessagePath": "/dev/termination-log",
+        "terminationMessagePolicy": "File",
+    }
+
+
+def make_pod(rnd: random.Random, index: int, namespace: str = "default"):
+    app = "app-%s" % (index % 50)
+    name = "%s-%08x-%05x" % (app, rnd.getrandbits(32), rnd.getrandbits(20))
+    created = EPOCH + timedelta(seconds=index * 7)
+    started = created + timedelta(seconds=3)
+
+    container_names = [app, "sidecar"]
+    containers = [
+        make_container(cont, f"registry.example.com/{cont}:1.0.0")
+        for cont in container_names
+    ]
+    last_applied = json.dumps({"apiVersion": "v1", "kind": "Pod", "spec": containers})
+
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {
+            "annotations": {
+                "kubectl.kubernetes.io/last-applied-configuration": last_applied,
+            },
+            "creationTimestamp": format_date(created),
+            "generateName": f"{app}-",
+            "labels": {"app": app, "pod-template-hash": "%08x" % index},
+            "managedFields": [
+                {
+                    "apiVersion": "v1",
+                    "fieldsType": "FieldsV1",
+                    "fieldsV1": {
+                        "f:metadata": {"f:labels": {".": {}, "f:app": {}}},
+                        "f:spec": {"f:containers": {f'k:{{"name":"{app}"}}': {}}},
+                    },
+                    "manager": "kube-controller-manager",
+                    "operation": "Update",
+                    "time": format_date(created),
+                },
+                {
+                    "apiVersion": "v1",
+                    "fieldsType": "FieldsV1",
+                    "fieldsV1": {
+                        "f:status": {"f:conditions": {}, "f:containerStatuses": {}}
+                    },
+                    "manager": "kubelet",
+                    "operation": "Update",
+                    "time": format_date(started),
+                },
+            ],
+            "name": name,
+            "namespace": namespace,
+            "ownerReferences": [
+                {
+                    "apiVersion": "apps/v1",
+                    "blockOwnerDeletion": True,
+                    "controller": True,
+                    "kind": "ReplicaSet",
+                    "name": f"{app}-%08x" % index,
+                    "uid": "%032x" % rnd.getrandbits(128),
+                }
+            ],
+            "resourceVersion": str(100000 + index),
+            "uid": "%032x" % rnd.getrandbits(128),
+        },
+        "spec": {
+            "containers": containers,
+            "dnsPolicy": "ClusterFirst",
+            "nodeName": "node-%s" % (index % 20),
+            "priority": 0,
+            "restartPolicy": "Always",
+            "schedulerName": "default-scheduler",
+            "serviceAccountName": "default",
+            "terminationGracePeriodSeconds": 30,
+        },
+        "status": {
+            "conditions": [
+                {
+                    "lastTransitionTime": format_date(started),
+                    "status": "True",
+                    "type": cond,
+                }
+                for cond in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+            ],
+            "containerStatuses": [
+                make_container_status(rnd, cont, started) for cont in container_names
+            ],
+            "hostIP": "10.0.%s.%s" % (index % 20, 1),
+            "phase": "Running",
+            "podIP": "10.1.%s.%s" % (index // 250 % 250, index % 250),
+            "podIPs": [{"ip": "10.1.%s.%s" % (index // 250 % 250, index % 250)}],
+            "qosClass": "Burstable",
+            "startTime": format_date(started),
+        },
+    }
+
+
+def generate_pod_list(count: int, seed: int = 1) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    items = [make_pod(rnd, index) for index in range(count)]
+
+    # items in a list response do not carry apiVersion/kind
+    for item in items:
+        item.pop("apiVersion")
+        item.pop("kind")
+
+    return {
+        "apiVersion": "v1",
+        "kind": "PodList",
+        "metadata": {"resourceVersion": str(100000 + count)},
+        "items": items,
+    }
+
+
+def load_pod_list(path: Optional[str], count: int) -> Dict[str, Any]:
+    "Loads a recorded pod list, or generates one"
+
+    if path:
+        with open(path, "rb") as fl:
+            return json.load(fl)
+
+    return generate_pod_list(count)
+
+
+def iter_watch_events(pod_list: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    "Turns a pod list into the watch events a rollout would produce"
+
+    for item in pod_list["items"]:
+        obj = dict(item, apiVersion="v1", kind="Pod")
+        yield {"type": "ADDED", "object": obj}
+        yield {"type": "MODIFIED", "object": obj}
+
+
+def to_watch_lines(pod_list: Dict[str, Any]) -> List[bytes]:
+    return [json.dumps(event).encode() + b"\n" for event in iter_watch_events(pod_list)]
+
+
+def load_watch_lines(path: Optional[str], count: int) -> List[bytes]:
+    """Loads a recorded watch stream, or generates one. Record one with eg.
+
+    $ kubectl get --raw '/api/v1/pods?watch=1' > watch.jsonl
+    """
+
+    if path:
+        with open(path, "rb") as fl:
+            return [line for line in fl if line.strip()]
+
+    return to_watch_lines(generate_pod_list(count))
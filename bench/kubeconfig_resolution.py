@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+
+import sys
+
+sys.path.append(".")
+
+# isort: split
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from kube.config import (
+    Context,
+    KubeConfigCache,
+    KubeConfigFile,
+    KubeConfigLoader,
+    KubeConfigSelector,
+)
+from kube.model.selector import compile_glob
+
+
+def measure(label: str, func: Callable[[], Any], *, items: int, rounds: int):
+    # warm up
+    func()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - start
+
+    per_sec = items * rounds / elapsed
+    print(
+        "%-22s %10.0f contexts/s  %8.1f ms/round"
+        % (label, per_sec, elapsed / rounds * 1000)
+    )
+
+
+def write_configs(path: str, *, count: int, files: int) -> None:
+    """Writes count contexts spread over files config files, the way tools
+    that generate a context per cluster and role do. The users live in a file
+    of their own, so resolving them crosses files."""
+
+    users = ["- name: role-%s\n  user:\n    token: t%s\n" % (i, i) for i in range(10)]
+    with open(os.path.join(path, "users.yaml"), "w") as fl:
+        fl.write("apiVersion: v1\nkind: Config\nusers:\n" + "".join(users))
+
+    for num in range(files):
+        clusters = []
+        contexts = []
+
+        for i in range(num, count, files):
+            cluster = "cluster-%s.example.com" % i
+            clusters.append(
+                "- name: %s\n  cluster:\n    server: https://%s\n" % (cluster, cluster)
+            )
+            contexts.append(
+                "- name: ctx-%s\n  context:\n    cluster: %s\n    user: role-%s\n"
+                % (i, cluster, i % 10)
+            )
+
+        with open(os.path.join(path, "config-%03d.yaml" % num), "w") as fl:
+            fl.write("apiVersion: v1\nkind: Config\n")
+            fl.write("clusters:\n" + "".join(clusters))
+            fl.write("contexts:\n" + "".join(contexts))
+
+
+def resolve_linear(config_files: List[KubeConfigFile]) -> Dict[str, Context]:
+    "How contexts used to be resolved: a scan of the users and clusters each"
+
+    users = [user for fl in config_files for user in fl.users]
+    clusters = [cluster for fl in config_files for cluster in fl.clusters]
+
+    contexts = {}
+    for fl in config_files:
+        for ref in fl.context_refs:
+            user = [user for user in users if user.name == ref.user_name]
+            cluster = [cl for cl in clusters if cl.name == ref.cluster_name]
+            if user and cluster:
+                contexts[ref.name] = Context(
+                    name=ref.name,
+                    user=user[0],
+                    cluster=cluster[0],
+                    namespace=ref.namespace,
+                )
+
+    return contexts
+
+
+def fnmatch_unindexed(contexts: Dict[str, Context], pattern: str) -> List[Context]:
+    "How contexts used to be selected: sort and match all the names every time"
+
+    names = compile_glob(pattern).filter(sorted(contexts.keys()))
+    return [contexts[name] for name in names]
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory(prefix="kube-configs.") as path:
+        write_configs(path, count=args.count, files=args.files)
+
+        os.environ.pop("KUBECONFIG", None)
+        loader = KubeConfigLoader(config_dir=path, cache=KubeConfigCache())
+        collection = loader.create_collection()
+        assert len(collection.contexts) == args.count
+
+        config_files = [loader.load_file(fp) for fp in loader.get_candidate_files()]
+        parsed = [fl for fl in config_files if fl]
+
+        print(
+            "Resolving %s contexts from %s files, %s rounds"
+            % (args.count, len(parsed), args.rounds)
+        )
+
+        def load_cold() -> None:
+            KubeConfigLoader(
+                config_dir=path, cache=KubeConfigCache()
+            ).create_collection()
+
+        # a linear scan is too slow to repeat at this size
+        measure(
+            "resolve linear", lambda: resolve_linear(parsed), items=args.count, rounds=1
+        )
+        measure(
+            "resolve indexed",
+            loader.create_collection,
+            items=args.count,
+            rounds=args.rounds,
+        )
+        measure("load cold", load_cold, items=args.count, rounds=args.rounds)
+
+        patterns = ["*", "ctx-4*", "ctx-%s" % (args.count // 2)]
+        selector = KubeConfigSelector(collection=collection)
+
+        def select_unindexed() -> None:
+            for pattern in patterns:
+                fnmatch_unindexed(collection.contexts, pattern)
+
+        def select_indexed() -> None:
+            for pattern in patterns:
+                selector.fnmatch_context(pattern)
+
+        def select_indexed_cold() -> None:
+            # as after a reload, which replaces the collection
+            collection.sorted_names = None
+            selector.collection = collection
+            select_indexed()
+
+        items = args.count * len(patterns)
+        measure("select unindexed", select_unindexed, items=items, rounds=args.rounds)
+        measure(
+            "select indexed cold", select_indexed_cold, items=items, rounds=args.rounds
+        )
+        measure("select indexed", select_indexed, items=items, rounds=args.rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--count",
+        dest="count",
+        action="store",
+        type=int,
+        default=5000,
+        help="Number of contexts to generate",
+    )
+    parser.add_argument(
+        "--files",
+        dest="files",
+        action="store",
+        type=int,
+        default=1,
+        help="Number of config files to spread the contexts over",
+    )
+    parser.add_argument(
+        "--rounds",
+        dest="rounds",
+        action="store",
+        type=int,
+        default=5,
+        help="Number of times to resolve the contexts",
+    )
+    args = parser.parse_args()
+
+    main(args)
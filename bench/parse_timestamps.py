@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+import sys
+
+sys.path.append(".")
+
+# isort: split
+
+import argparse
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+from dateutil.parser import parse as parse_date
+
+from bench.fixtures import load_pod_list
+from kube.tools.timekeeping import parse_timestamp, parse_timestamp_uncached
+
+
+def measure(label: str, func: Callable[[], Any], *, items: int, rounds: int):
+    # warm up
+    func()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - start
+
+    per_sec = items * rounds / elapsed
+    print(
+        "%-18s %10.0f parses/s  %8.1f ms/round"
+        % (label, per_sec, elapsed / rounds * 1000)
+    )
+
+
+def iter_timestamps(value: Any) -> Iterator[str]:
+    "Finds the timestamps in an object the way the object model reads them"
+
+    if isinstance(value, list):
+        for item in value:
+            yield from iter_timestamps(item)
+
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, str) and key in TIMESTAMP_KEYS:
+                yield item
+            else:
+                yield from iter_timestamps(item)
+
+
+TIMESTAMP_KEYS = {
+    "creationTimestamp",
+    "deletionTimestamp",
+    "startTime",
+    "startedAt",
+    "finishedAt",
+}
+
+
+def main(args: argparse.Namespace) -> None:
+    pod_list = load_pod_list(args.file, args.count)
+    timestamps: List[str] = list(iter_timestamps(pod_list["items"]))
+    distinct = len(set(timestamps))
+
+    print(
+        "Parsing %s timestamps (%s distinct) from %s pods, %s rounds"
+        % (len(timestamps), distinct, len(pod_list["items"]), args.rounds)
+    )
+
+    def cached_cold() -> None:
+        # the hits only come from repeats within the list
+        parse_timestamp.cache_clear()
+        for ts in timestamps:
+            parse_timestamp(ts)
+
+    def cached_warm() -> None:
+        # like the MODIFIED events that follow a list (if they fit the cache)
+        for ts in timestamps:
+            parse_timestamp(ts)
+
+    cases: Dict[str, Callable[[], Any]] = {
+        "dateutil": lambda: [parse_date(ts) for ts in timestamps],
+        "rfc3339": lambda: [parse_timestamp_uncached(ts) for ts in timestamps],
+        "rfc3339 memo cold": cached_cold,
+        "rfc3339 memo warm": cached_warm,
+    }
+
+    for label, func in cases.items():
+        measure(label, func, items=len(timestamps), rounds=args.rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        dest="file",
+        action="store",
+        help="Recorded pod list (kubectl get pods -o json), generated if not set",
+    )
+    parser.add_argument(
+        "--count",
+        dest="count",
+        action="store",
+        type=int,
+        default=5000,
+        help="Number of pods to generate",
+    )
+    parser.add_argument(
+        "--rounds",
+        dest="rounds",
+        action="store",
+        type=int,
+        default=5,
+        help="Number of times to parse the timestamps",
+    )
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+import sys
+
+sys.path.append(".")
+
+# isort: split
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+from bench.fixtures import load_pod_list
+from kube.model.object_model.kinds import Pod
+
+
+def measure(label: str, func: Callable[[], Any], *, items: int, rounds: int):
+    # warm up
+    func()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - start
+
+    per_sec = items * rounds / elapsed
+    print(
+        "%-18s %10.0f wrappers/s  %8.1f ms/round"
+        % (label, per_sec, elapsed / rounds * 1000)
+    )
+
+
+def wrap(items: List[Any]) -> None:
+    for item in items:
+        Pod(item)
+
+
+def wrap_and_filter(items: List[Any]) -> None:
+    # what a filter typically reads
+    for item in items:
+        pod = Pod(item)
+        pod.meta.name
+        pod.meta.labels.get("app")
+
+
+def wrap_and_read_all(items: List[Any]) -> None:
+    # everything, which is what the wrappers used to parse up front
+    for item in items:
+        pod = Pod(item)
+        meta = pod.meta
+        meta.name, meta.uid, meta.namespace, meta.labels, meta.annotations
+        meta.creationTimestamp, meta.deletionTimestamp, meta.resourceVersion
+
+        status = pod.status
+        status.phase, status.startTime, status.message, status.reason
+
+        for cont in status.initContainerStatuses + status.containerStatuses:
+            cont.name, cont.ready, cont.restartCount, cont.image, cont.imageID
+            cont.started, cont.lastState
+
+            state = cont.state
+            for attr in ("startedAt", "finishedAt", "exitCode", "message"):
+                getattr(state, attr, None)
+
+
+def main(args: argparse.Namespace) -> None:
+    pod_list = load_pod_list(args.file, args.count)
+    items = pod_list["items"]
+
+    # the client fills these in on list items
+    for item in items:
+        item["apiVersion"] = "v1"
+        item["kind"] = "Pod"
+
+    print("Wrapping a list of %s pods, %s rounds" % (len(items), args.rounds))
+
+    measure("wrap", lambda: wrap(items), items=len(items), rounds=args.rounds)
+    measure(
+        "wrap + filter",
+        lambda: wrap_and_filter(items),
+        items=len(items),
+        rounds=args.rounds,
+    )
+    measure(
+        "wrap + read all",
+        lambda: wrap_and_read_all(items),
+        items=len(items),
+        rounds=args.rounds,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        dest="file",
+        action="store",
+        help="Recorded pod list (kubectl get pods -o json), generated if not set",
+    )
+    parser.add_argument(
+        "--count",
+        dest="count",
+        action="store",
+        type=int,
+        default=5000,
+        help="Number of pods to generate",
+    )
+    parser.add_argument(
+        "--rounds",
+        dest="rounds",
+        action="store",
+        type=int,
+        default=5,
+        help="Number of times to wrap the list",
+    )
+    args = parser.parse_args()
+
+    main(args)
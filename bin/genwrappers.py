@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+import sys
+
+sys.path.append(".")
+
+# isort: split
+import argparse
+import json
+from typing import Any, List
+
+from kube.async_loop import launch_in_background_thread
+from kube.cluster_facade import SyncClusterFacade
+from kube.config import get_selector
+from kube.model.object_model.codegen import (
+    DEFAULT_GROUP_VERSIONS,
+    DEFAULT_TARGETS,
+    Generator,
+    WrapperTarget,
+    load_schemas,
+)
+from kube.tools.logs import configure_logging
+
+
+def fetch_documents(args: argparse.Namespace) -> List[Any]:
+    async_loop = launch_in_background_thread()
+
+    contexts = get_selector().fnmatch_context(args.context)
+    if not contexts:
+        raise SystemExit("No context matches %r" % args.context)
+
+    # all clusters of the same version serve the same schemas
+    facade = SyncClusterFacade(async_loop=async_loop, context=contexts[0])
+    group_versions = DEFAULT_GROUP_VERSIONS + (args.group_versions or [])
+    return facade.get_openapi_documents(group_versions=group_versions)
+
+
+def load_documents(args: argparse.Namespace) -> List[Any]:
+    documents = []
+
+    for path in args.files:
+        with open(path) as fl:
+            documents.append(json.load(fl))
+
+    return documents
+
+
+def format_source(source: str) -> str:
+    # black is a development dependency, the output is valid without it
+    try:
+        import black
+    except ImportError:
+        return source
+
+    return black.format_str(source, mode=black.Mode())
+
+
+def main(args: argparse.Namespace) -> None:
+    configure_logging()
+
+    if args.context:
+        documents = fetch_documents(args)
+    else:
+        documents = load_documents(args)
+
+    targets = list(DEFAULT_TARGETS)
+    for name in args.kinds or []:
+        targets.append(WrapperTarget(name, namespaced=True))
+    for name in args.cluster_kinds or []:
+        targets.append(WrapperTarget(name, namespaced=False))
+
+    generator = Generator(load_schemas(documents), max_depth=args.max_depth)
+    source = format_source(generator.generate(targets))
+
+    with open(args.output, "w") as fl:
+        fl.write(source)
+
+    print("Wrote %s classes to %s" % (len(generator.class_names), args.output))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generates lazy object wrappers from OpenAPI v3 schemas"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "-c",
+        "--context",
+        dest="context",
+        action="store",
+        help=(f"Kube context to fetch /openapi/v3 from"),
+    )
+    source.add_argument(
+        "-f",
+        "--file",
+        dest="files",
+        action="append",
+        help=(f"Saved OpenAPI v3 document - can be given more than once"),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        action="store",
+        default="kube/model/object_model/generated.py",
+        help=(f"Module to write"),
+    )
+    parser.add_argument(
+        "-g",
+        "--group-version",
+        dest="group_versions",
+        action="append",
+        help=(f"Extra document to fetch, eg. apis/example.com/v1 for a CRD"),
+    )
+    parser.add_argument(
+        "-k",
+        "--kind",
+        dest="kinds",
+        action="append",
+        help=(f"Extra namespaced kind by schema name, eg. com.example.v1.Widget"),
+    )
+    parser.add_argument(
+        "--cluster-kind",
+        dest="cluster_kinds",
+        action="append",
+        help=(f"Extra cluster scoped kind by schema name"),
+    )
+    parser.add_argument(
+        "--max-depth",
+        dest="max_depth",
+        action="store",
+        type=int,
+        default=5,
+        help=(f"Levels of nested objects to wrap below each kind"),
+    )
+    args = parser.parse_args()
+
+    main(args)
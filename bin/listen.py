@@ -6,10 +6,10 @@ sys.path.append(".")
 
 # isort: split
 import argparse
-import fnmatch
 import pprint
 import re
 import time
+from functools import partial
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import deepdiff
@@ -17,12 +17,24 @@ from colored import bg, fg
 from colored.colored import stylize
 
 from kube.async_loop import get_loop, launch_in_background_thread
-from kube.channels.objects import OEvReceiver
-from kube.cluster_facade import SyncClusterFacade
+from kube.channels.objects import (
+    FilteredOEvSender,
+    OEvReceiver,
+    OEvSender,
+    create_oev_chan,
+)
+from kube.cluster_facade import AsyncClusterFacade
+from kube.codec import BACKENDS, configure_codec
 from kube.config import Context, get_selector
-from kube.events.objects import Action
+from kube.events.objects import Action, ObjectEvent
+from kube.fanout import FanOutQuery
 from kube.model.api_resource import NamespaceKind, PodKind
-from kube.model.selector import ObjectSelector
+from kube.model.projection import DropNoisyFields, Projection
+from kube.model.selector import (
+    ObjectSelector,
+    compile_glob,
+    compile_label_selector,
+)
 from kube.tools.logs import configure_logging
 from kube.tools.terminal import TerminalPrinter
 
@@ -40,41 +52,67 @@ ACTION_COLORS = {
     Action.MODIFIED: [fg("yellow")],
     Action.DELETED: [fg("dark_gray")],
     Action.LISTED: [fg("cyan")],
+    Action.DEGRADED: [fg("red")],
+    Action.RECOVERED: [fg("green")],
 }
 
 STORE: Dict[str, Any] = {}
 
 
-def find_matching_namespace(
-    args: argparse.Namespace, context: Context
+async def find_matching_namespace(
+    args: argparse.Namespace, facade: AsyncClusterFacade
 ) -> Optional[str]:
     if not args.namespace:
         return None
 
-    async_loop = get_loop()
-    facade = SyncClusterFacade(async_loop=async_loop, context=context)
-    selector = ObjectSelector(res=NamespaceKind)
-    namespace_objs = facade.list_objects(selector=selector)
+    selector = ObjectSelector(res=NamespaceKind, projection=Projection(keep=[]))
+    namespace_objs = await facade.list_objects(selector=selector)
     namespaces = [namespace["metadata"]["name"] for namespace in namespace_objs]
 
-    namespaces = fnmatch.filter(namespaces, args.namespace)
+    namespaces = compile_glob(args.namespace).filter(namespaces)
     assert len(namespaces) == 1
 
     return namespaces[0]
 
 
-def launch(args: argparse.Namespace, context: Context) -> OEvReceiver:
+async def get_pod_selectors(
+    args: argparse.Namespace, facade: AsyncClusterFacade
+) -> List[ObjectSelector]:
+    namespace = await find_matching_namespace(args, facade)
+    selector = ObjectSelector(
+        res=PodKind, namespace=namespace, projection=DropNoisyFields
+    )
+    return [selector]
+
+
+def launch(args: argparse.Namespace, contexts: List[Context]) -> OEvReceiver:
     async_loop = get_loop()
-    facade = SyncClusterFacade(async_loop=async_loop, context=context)
+    oev_chan = create_oev_chan()
+
+    oev_sender: OEvSender = oev_chan.sender
+    if args.label_selector:
+        label_selector = compile_label_selector(args.label_selector)
 
-    namespace = find_matching_namespace(args, context)
-    selector = ObjectSelector(res=PodKind, namespace=namespace)
+        def filter_event(event: ObjectEvent) -> bool:
+            # let watch status events through
+            if not isinstance(event.object, dict):
+                return True
+
+            return label_selector.matches(event.object)
+
+        oev_sender = FilteredOEvSender(oev_sender, filter_event)
 
     # list first to advance the resourceVersion in the client to the current
     # point in time - so we can skip events that are in the past
-    facade.list_objects(selector=selector)
+    query = FanOutQuery(async_loop=async_loop, contexts=contexts)
+    coro = query.list_then_watch(
+        get_selectors=partial(get_pod_selectors, args),
+        oev_sender=oev_sender,
+        emit_listed=False,
+    )
+    async_loop.launch_coro(coro)
 
-    return facade.start_watching(selector=selector)
+    return oev_chan.receiver
 
 
 def show_change(prev, cur) -> Tuple[str, Any]:
@@ -117,17 +155,25 @@ def run_forever(contexts: List[Context], oev_receivers: Sequence[OEvReceiver]) -
     while True:
         for oev_receiver in oev_receivers:
             event = oev_receiver.recv_nowait()
-            if event:
-                uid = event.object["metadata"]["uid"]
+            if event and event.action in (Action.DEGRADED, Action.RECOVERED):
+                ctx_cols = CONTEXT_COLORS[
+                    contexts.index(event.context) % len(CONTEXT_COLORS)
+                ]
+                ctx = stylize(event.context.short_name, styles=ctx_cols)
+                act = stylize(event.action.value, styles=ACTION_COLORS[event.action])
+                print(ctx, act, event.object or "")
+
+            elif event:
+                uid = event.uid
 
-                prev = STORE.get(uid)
+                prev = STORE.get(uid) if uid is not None else None
                 change, ddiff = "", None
                 if prev and event.action is Action.MODIFIED:
                     change, ddiff = show_change(prev, event.object)
 
                 kind = event.object["kind"]
                 name = event.object["metadata"]["name"]
-                ver = event.object["metadata"]["resourceVersion"]
+                ver = event.resource_version
 
                 ctx_cols = CONTEXT_COLORS[
                     contexts.index(event.context) % len(CONTEXT_COLORS)
@@ -142,13 +188,15 @@ def run_forever(contexts: List[Context], oev_receivers: Sequence[OEvReceiver]) -
                     pprint.pprint(ddiff)
 
                 # cache in store
-                STORE[uid] = event.object
+                if uid is not None:
+                    STORE[uid] = event.object
 
         time.sleep(0.01)
 
 
 def main(args: argparse.Namespace) -> None:
     configure_logging()
+    configure_codec(args.json_backend)
     launch_in_background_thread()
 
     printer = TerminalPrinter()
@@ -156,7 +204,7 @@ def main(args: argparse.Namespace) -> None:
     selector = get_selector()
     contexts = selector.fnmatch_context(args.context)
 
-    oev_receivers = [launch(args, ctx) for ctx in contexts]
+    oev_receivers = [launch(args, contexts)]
 
     try:
         run_forever(contexts, oev_receivers)
@@ -181,6 +229,27 @@ if __name__ == "__main__":
         action="store",
         help=(f"Kube namespace to select - matched like a filesystem wildcard"),
     )
+    parser.add_argument(
+        "-l",
+        "--selector",
+        dest="label_selector",
+        action="store",
+        help=(f"Kube label selector to filter pods on, eg. 'app in (web,api)'"),
+    )
+    parser.add_argument(
+        "-j",
+        "--json-backend",
+        dest="json_backend",
+        action="store",
+        choices=list(BACKENDS),
+        help=(f"Json backend to decode with - the fastest available by default"),
+    )
     args = parser.parse_args()
 
+    if args.label_selector:
+        try:
+            compile_label_selector(args.label_selector)
+        except ValueError as exc:
+            parser.error(str(exc))
+
     main(args)
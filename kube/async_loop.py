@@ -1,9 +1,11 @@
 import asyncio
+import logging
 import time
+from asyncio import Task
 from asyncio.events import AbstractEventLoop
 from asyncio.exceptions import CancelledError
 from threading import Event, Thread
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from kube.cluster_loop import AsyncClusterLoop
 from kube.config import Context
@@ -17,6 +19,12 @@ class AsyncLoop:
         self.initialized_event = initialized_event
 
         self.cluster_loops: Dict[Context, AsyncClusterLoop] = {}
+        self.cluster_loop_tasks: Dict[Context, Task] = {}
+
+        # monotonic time each cluster loop was last asked for
+        self.cluster_loop_last_used: Dict[Context, float] = {}
+
+        self.logger = logging.getLogger("async_loop")
 
     @classmethod
     def get_instance(cls) -> "AsyncLoop":
@@ -33,17 +41,68 @@ class AsyncLoop:
         self.initialized_event.set()
 
     async def get_cluster_loop(self, context: Context) -> AsyncClusterLoop:
+        self.cluster_loop_last_used[context] = time.monotonic()
+
         cluster_loop = self.cluster_loops.get(context)
 
         if cluster_loop is None:
             cluster_loop = AsyncClusterLoop(async_loop=self, context=context)
             self.cluster_loops[context] = cluster_loop
 
-            self.loop.create_task(cluster_loop.mainloop())
+            task = self.loop.create_task(cluster_loop.mainloop())
+            self.cluster_loop_tasks[context] = task
             await cluster_loop.wait_until_initialized()
 
         return cluster_loop
 
+    async def stop_cluster_loop(self, context: Context) -> None:
+        """Stops the watches of the cluster loop and closes its session. The
+        next get_cluster_loop() starts a new one."""
+
+        cluster_loop = self.cluster_loops.pop(context, None)
+        task = self.cluster_loop_tasks.pop(context, None)
+        self.cluster_loop_last_used.pop(context, None)
+
+        if cluster_loop is not None:
+            await cluster_loop.stop()
+
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def stop_idle_cluster_loops(self, max_idle: float) -> List[Context]:
+        """Stops the cluster loops not asked for in max_idle seconds. A loop
+        with watches is in use, its watches are stopped by their owners."""
+
+        now = time.monotonic()
+        contexts = [
+            context
+            for context, last_used in self.cluster_loop_last_used.items()
+            if now - last_used > max_idle and not self.cluster_loops[context].watches
+        ]
+
+        for context in contexts:
+            await self.stop_cluster_loop(context)
+
+        return contexts
+
+    async def reap_idle_cluster_loops(
+        self, *, max_idle: float, interval: Optional[float] = None
+    ) -> None:
+        "Stops idle cluster loops every interval seconds, until cancelled"
+
+        interval = interval or max_idle / 4
+
+        while True:
+            await asyncio.sleep(interval)
+
+            contexts = await self.stop_idle_cluster_loops(max_idle)
+            if contexts:
+                self.logger.info(
+                    "Stopped cluster loops idle for %ss: %s",
+                    max_idle,
+                    ", ".join(context.name for context in contexts),
+                )
+
     async def mainloop(self):
         await self.initialize()
 
@@ -78,6 +137,19 @@ class AsyncLoop:
 
         return fut.result()
 
+    async def close(self) -> None:
+        "Stops the cluster loops, for an AsyncLoop attached to the caller's loop"
+
+        for cluster_loop in self.cluster_loops.values():
+            await cluster_loop.stop()
+
+        # wait for the mainloops to close their sessions
+        await asyncio.gather(*self.cluster_loop_tasks.values())
+
+        self.cluster_loops.clear()
+        self.cluster_loop_tasks.clear()
+        self.cluster_loop_last_used.clear()
+
     def shutdown(self):
         "Shutdown the AsyncLoop and join the thread it runs in."
 
@@ -111,5 +183,16 @@ def launch_in_background_thread() -> AsyncLoop:
     return async_loop
 
 
+def attach_to_running_loop() -> AsyncLoop:
+    """
+    Returns an AsyncLoop that runs its cluster loops on the caller's event loop
+    instead of on a background thread. For use with AsyncClusterFacade, the
+    helpers that run coroutines from another thread would deadlock here.
+    """
+
+    loop = asyncio.get_running_loop()
+    return AsyncLoop(loop=loop, initialized_event=Event())
+
+
 def get_loop() -> AsyncLoop:
     return AsyncLoop.get_instance()
@@ -7,10 +7,9 @@ from typing import Optional, Union
 
 import humanize
 from aiohttp import BasicAuth
-from dateutil.parser import parse as parse_date
 
 from kube.config import Context
-from kube.tools.timekeeping import date_now
+from kube.tools.timekeeping import date_now, parse_timestamp
 
 
 class BearerAuth(BasicAuth):
@@ -93,7 +92,7 @@ class AuthProvider:
                 token = status.get("token")
                 expirationTimestamp = status.get("expirationTimestamp")
 
-                expiry_date = parse_date(expirationTimestamp)
+                expiry_date = parse_timestamp(expirationTimestamp)
                 time_left = humanize.naturaldelta(expiry_date - date_now())
 
                 self.logger.info(
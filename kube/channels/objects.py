@@ -1,7 +1,10 @@
+import asyncio
 from queue import Queue
+from typing import Callable, Optional
 
 from kube.channels.generic import ChanReceiver, ChanSender
 from kube.events.objects import ObjectEvent
+from kube.events.pipeline import EventPipeline
 
 OEvSender = ChanSender[ObjectEvent]
 OEvReceiver = ChanReceiver[ObjectEvent]
@@ -18,3 +21,90 @@ def create_oev_chan() -> OEvChan:
     sender = OEvSender(queue)
     receiver = OEvReceiver(queue)
     return OEvChan(sender=sender, receiver=receiver)
+
+
+class FilteredOEvSender(ChanSender[ObjectEvent]):
+    "Sends only the events that pass the predicate on to another sender"
+
+    def __init__(
+        self, sender: OEvSender, predicate: Callable[[ObjectEvent], bool]
+    ) -> None:
+        super().__init__(sender.queue)
+        self.sender = sender
+        self.predicate = predicate
+
+    def send(self, obj: ObjectEvent) -> None:
+        if self.predicate(obj):
+            self.sender.send(obj)
+
+
+class PipelineOEvSender(ChanSender[ObjectEvent]):
+    """Runs events through a pipeline on the sending thread, and sends on what
+    comes out of it to another sender"""
+
+    def __init__(self, sender: OEvSender, pipeline: EventPipeline) -> None:
+        super().__init__(sender.queue)
+        self.sender = sender
+        self.pipeline = pipeline
+
+    def send(self, obj: ObjectEvent) -> None:
+        event = self.pipeline.process(obj)
+        if event is not None:
+            self.sender.send(event)
+
+
+class AsyncOEvReceiver:
+    """Receives object events on the event loop they are sent from, as an async
+    iterator. Iteration ends when the channel is closed."""
+
+    def __init__(self, queue: asyncio.Queue) -> None:
+        self.queue = queue
+
+    def __aiter__(self) -> "AsyncOEvReceiver":
+        return self
+
+    async def __anext__(self) -> ObjectEvent:
+        event = await self.recv()
+        if event is None:
+            raise StopAsyncIteration
+
+        return event
+
+    async def recv(self) -> Optional[ObjectEvent]:
+        "Returns None once the channel is closed"
+
+        event = await self.queue.get()
+
+        # keep returning None to anyone else waiting
+        if event is None:
+            self.queue.put_nowait(None)
+
+        return event
+
+    def recv_nowait(self) -> Optional[ObjectEvent]:
+        try:
+            event = self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+        if event is None:
+            self.queue.put_nowait(None)
+
+        return event
+
+
+class AsyncOEvChan:
+    def __init__(self, sender: OEvSender, receiver: AsyncOEvReceiver) -> None:
+        self.sender = sender
+        self.receiver = receiver
+
+    def close(self) -> None:
+        self.receiver.queue.put_nowait(None)
+
+
+def create_async_oev_chan() -> AsyncOEvChan:
+    # the sender only needs put_nowait(), which asyncio.Queue also has
+    queue: asyncio.Queue = asyncio.Queue()
+    sender = OEvSender(queue)  # type: ignore
+    receiver = AsyncOEvReceiver(queue)
+    return AsyncOEvChan(sender=sender, receiver=receiver)
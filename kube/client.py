@@ -1,13 +1,15 @@
 import asyncio
-import json
 import logging
+import random
 import re
 from asyncio.exceptions import TimeoutError
 from asyncio.locks import Lock
-from typing import Any, List
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlencode
+from weakref import WeakKeyDictionary, WeakSet
 
-from aiohttp import ClientSession
+from aiohttp import ClientResponse, ClientSession
 from aiohttp.client import ClientTimeout
 from aiohttp.client_exceptions import (
     ClientConnectorCertificateError,
@@ -21,12 +23,30 @@ from aiohttp.client_exceptions import (
 
 from kube.auth import AuthProvider
 from kube.channels.objects import OEvSender
+from kube.codec import JsonCodec, get_codec
 from kube.config import Context
 from kube.events.objects import Action, ObjectEvent
+from kube.metrics import WatchMetrics
 from kube.model.api_group import ApiGroup
 from kube.model.api_resource import ApiResource
 from kube.model.selector import ObjectSelector
 from kube.tools.logs import CtxLogger
+from kube.transfer import ACCEPT_ENCODING, DecodingReader, TransferStats
+
+# The server ends each watch after a random interval in this range, like
+# client-go does, so that watches started together don't reconnect together.
+WATCH_TIMEOUT_MIN = 300
+WATCH_TIMEOUT_MAX = 600
+
+# We ask for bookmarks, which the server sends about once a minute. If not a
+# single byte arrives for this long then the connection is most likely dead.
+# Servers that don't send bookmarks can leave a quiet watch silent until it
+# ends, so the deadline only applies once we have seen one for the selector.
+WATCH_PROGRESS_DEADLINE = 150
+
+
+class WatchStalledError(Exception):
+    pass
 
 
 class ApiError(Exception):
@@ -57,20 +77,39 @@ class ApiError(Exception):
         return self.code in (429, 500, 502, 503, 504)
 
     def is_resource_version_too_old(self):
-        return self.rx.search(self.message) is not None
+        # 410 Gone, not every server says which version it has instead
+        return self.code == 410 or self.rx.search(self.message) is not None
 
-    def extract_resource_version(self):
+    def extract_resource_version(self) -> Optional[int]:
         match = self.rx.search(self.message)
-        assert match is not None
+        if match is None:
+            return None
+
         return int(match.group(1))
 
 
 class AsyncClient:
+    """
+    The session must be created with `auto_decompress=False` because we
+    decompress responses ourselves, see kube.transfer.create_session().
+    """
+
     def __init__(
-        self, *, session: ClientSession, context: Context, logger=None
+        self,
+        *,
+        session: ClientSession,
+        context: Context,
+        codec: Optional[JsonCodec] = None,
+        watch_progress_deadline: float = WATCH_PROGRESS_DEADLINE,
+        logger=None,
     ) -> None:
+        # responses would be decompressed twice
+        assert not session.auto_decompress
+
         self.session = session
         self.context = context
+        self.codec = codec or get_codec()
+        self.watch_progress_deadline = watch_progress_deadline
         self.logger = logger or logging.getLogger("client")
 
         self.ssl_context = self.context.create_ssl_context()
@@ -79,6 +118,22 @@ class AsyncClient:
         self.resource_version_lock = Lock()
         self.resource_version = 0
 
+        # where the watch of a selector starts, and resumes when it reconnects:
+        # the version of the last list of the selector, then of the last event
+        # or bookmark the watch received
+        self.selector_versions: "WeakKeyDictionary[ObjectSelector, int]" = (
+            WeakKeyDictionary()
+        )
+
+        # the selectors the server sends bookmarks for, whose watches are given
+        # the progress deadline
+        self.bookmarked_selectors: "WeakSet[ObjectSelector]" = WeakSet()
+
+        # byte counts of the most recent requests, newest last
+        self.recent_transfers: Deque[TransferStats] = deque(maxlen=100)
+
+        self.watch_metrics: Dict[ObjectSelector, WatchMetrics] = {}
+
     # Logging
 
     def get_ctx_logger(self, selector: ObjectSelector) -> CtxLogger:
@@ -88,12 +143,40 @@ class AsyncClient:
             prefix="[%(context)s] [%(selector)s] ",
         )
 
+    def get_watch_metrics(self, selector: ObjectSelector) -> WatchMetrics:
+        metrics = self.watch_metrics.get(selector)
+
+        if metrics is None:
+            metrics = WatchMetrics()
+            self.watch_metrics[selector] = metrics
+
+        return metrics
+
+    def drop_watch_metrics(self, selector: ObjectSelector) -> None:
+        "Called when the watch is stopped"
+        self.watch_metrics.pop(selector, None)
+
     # Manage resourceVersion
 
-    async def get_resource_version(self) -> int:
+    async def get_resource_version(self, selector: ObjectSelector) -> int:
+        "Selectors watched without being listed first use the latest version seen"
+
+        version = self.selector_versions.get(selector)
+        if version is not None:
+            return version
+
         async with self.resource_version_lock:
             return self.resource_version
 
+    def advance_selector_version(self, selector: ObjectSelector, dct: Any) -> None:
+        version_str = (dct.get("metadata") or {}).get("resourceVersion")
+        if not version_str:
+            return
+
+        version = int(version_str)
+        if version > self.selector_versions.get(selector, 0):
+            self.selector_versions[selector] = version
+
     async def update_resource_version(self, *, dct=None, exc: ApiError = None) -> None:
         assert dct or exc
         version = None
@@ -112,20 +195,38 @@ class AsyncClient:
             if version > self.resource_version:
                 self.resource_version = version
 
+    # Reading responses
+
+    def open_reader(self, url: str, response: ClientResponse) -> DecodingReader:
+        encoding = response.headers.get("Content-Encoding", "")
+        stats = TransferStats(url=url, encoding=encoding)
+        return DecodingReader(response, stats)
+
+    def record_transfer(
+        self, reader: DecodingReader, log: Union[logging.Logger, CtxLogger]
+    ) -> None:
+        reader.stats.finish()
+        self.recent_transfers.append(reader.stats)
+
+        log.debug("Transferred %s", reader.stats.pretty())
+
     # Parsing responses
 
     def parse_watch_action(self, item) -> Action:
-        action_str = item["type"]
-
-        for attname in dir(Action):
-            attvalue = getattr(Action, attname)
-            if attname.startswith("_") or callable(attvalue):
-                continue
+        # enum lookup by value is a dict lookup
+        try:
+            return Action(item["type"])
+        except ValueError:
+            raise RuntimeError("Failed to parse action from item: %r" % item)
 
-            if attname == action_str:
-                return attvalue
+    async def read_json_line(self, reader: DecodingReader) -> Optional[Any]:
+        # read one line at a time, b'\n' terminated
+        line = await reader.readline()
+        if not line:
+            return None
 
-        raise RuntimeError("Failed to parse action from item: %r" % item)
+        self.logger.debug("Parsing response line [len: %s] as json", len(line))
+        return self.codec.loads(line)
 
     def maybe_parse_error(self, dct) -> None:
         # if it's a watch item them the object is wrapped
@@ -139,7 +240,11 @@ class AsyncClient:
             raise ApiError(context=self.context, code=code, reason=reason, message=message)
 
     async def construct_url(
-        self, selector: ObjectSelector, watch: bool = False, timeout: int = None
+        self,
+        selector: ObjectSelector,
+        watch: bool = False,
+        timeout: int = None,
+        object_name: str = None,
     ) -> str:
         server = self.context.cluster.server
         prefix = selector.res.group.endpoint
@@ -150,11 +255,15 @@ class AsyncClient:
             namespace = selector.namespace
             url = f"{server}{prefix}/namespaces/{namespace}/{name}"
 
-        query_args = {}
+        if object_name:
+            url = f"{url}/{object_name}"
+
+        query_args: Dict[str, Any] = {}
 
         if watch:
             query_args["watch"] = 1
-            query_args["resourceVersion"] = await self.get_resource_version()
+            query_args["resourceVersion"] = await self.get_resource_version(selector)
+            query_args["allowWatchBookmarks"] = "true"
             # TODO: add resourceVersionMatch?
 
         if timeout is not None:
@@ -169,14 +278,6 @@ class AsyncClient:
 
         return url
 
-    def send_error(self, exc: Exception, oev_sender: OEvSender) -> None:
-        event = ObjectEvent(
-            context=self.context,
-            action=Action.ADDED,
-            object=exc,
-        )
-        oev_sender.send(event)
-
     async def list_api_groups(self) -> List[ApiGroup]:
         server = self.context.cluster.server
         url = f"{server}/apis"
@@ -184,6 +285,7 @@ class AsyncClient:
         kwargs = dict(
             ssl_context=self.ssl_context,
             auth=self.auth_provider.get_auth(),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
             timeout=ClientTimeout(
                 sock_connect=3,
                 total=15,
@@ -193,8 +295,12 @@ class AsyncClient:
         self.logger.info("Listing api groups on %s", url)
         async with self.session.get(url, allow_redirects=True, **kwargs) as response:
 
+            reader = self.open_reader(url, response)
+            body = await reader.read()
+            self.record_transfer(reader, self.logger)
+
             self.logger.debug("Parsing api group response as json")
-            js = await response.json()
+            js = self.codec.loads(body)
 
             # may raise
             self.maybe_parse_error(js)
@@ -224,6 +330,7 @@ class AsyncClient:
         kwargs = dict(
             ssl_context=self.ssl_context,
             auth=self.auth_provider.get_auth(),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
             timeout=ClientTimeout(
                 sock_connect=3,
                 total=15,
@@ -233,9 +340,13 @@ class AsyncClient:
         self.logger.info("Listing %s api resources on %s", group.name, url)
         async with self.session.get(url, allow_redirects=True, **kwargs) as response:
 
+            reader = self.open_reader(url, response)
+            body = await reader.read()
+            self.record_transfer(reader, self.logger)
+
             self.logger.debug("Parsing %s api resource response as json", group.name)
             try:
-                js = await response.json()
+                js = self.codec.loads(body)
             except Exception:
                 self.logger.error("error: %s", response)
                 raise
@@ -261,7 +372,39 @@ class AsyncClient:
             self.logger.debug("Returning %s api resources", group.name)
             return api_resources
 
-    async def list_attempt(self, selector: ObjectSelector) -> List[Any]:
+    async def get_openapi_document(self, path: str = "/openapi/v3") -> Any:
+        """Returns the index of the OpenAPI v3 documents by default, or the
+        document at a `serverRelativeURL` found in it"""
+
+        server = self.context.cluster.server
+        url = f"{server}{path}"
+
+        kwargs = dict(
+            ssl_context=self.ssl_context,
+            auth=self.auth_provider.get_auth(),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            timeout=ClientTimeout(
+                sock_connect=3,
+                total=60,
+            ),
+        )
+
+        self.logger.info("Getting openapi document on %s", url)
+        async with self.session.get(url, allow_redirects=True, **kwargs) as response:
+
+            reader = self.open_reader(url, response)
+            body = await reader.read()
+            self.record_transfer(reader, self.logger)
+
+            self.logger.debug("Parsing openapi response as json")
+            js = self.codec.loads(body)
+
+            # may raise
+            self.maybe_parse_error(js)
+
+            return js
+
+    async def list_attempt(self, selector: ObjectSelector) -> Tuple[List[Any], int]:
         log = self.get_ctx_logger(selector)
 
         kind = selector.res.kind
@@ -270,6 +413,7 @@ class AsyncClient:
         kwargs = dict(
             ssl_context=self.ssl_context,
             auth=self.auth_provider.get_auth(),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
             timeout=ClientTimeout(
                 sock_connect=3,
                 total=15,
@@ -279,8 +423,12 @@ class AsyncClient:
         log.info("Listing %s objects on %s", kind, url)
         async with self.session.get(url, allow_redirects=True, **kwargs) as response:
 
+            reader = self.open_reader(url, response)
+            body = await reader.read()
+            self.record_transfer(reader, log)
+
             log.debug("Parsing %s response as json", kind)
-            js = await response.json()
+            js = self.codec.loads(body)
 
             # may raise
             self.maybe_parse_error(js)
@@ -292,10 +440,25 @@ class AsyncClient:
                 item["kind"] = js["kind"].replace("List", "")
                 await self.update_resource_version(dct=item)
 
+            # a watch of the selector starts after what the list returned
+            self.advance_selector_version(selector, js)
+            version = self.selector_versions.get(selector, 0)
+
+            if selector.projection is not None:
+                items = [selector.projection.apply(item) for item in items]
+
             log.debug("Returning %s items", kind)
-            return items
+            return items, version
 
     async def list_objects(self, selector: ObjectSelector) -> List[Any]:
+        items, _ = await self.list_objects_with_version(selector)
+        return items
+
+    async def list_objects_with_version(
+        self, selector: ObjectSelector
+    ) -> Tuple[List[Any], int]:
+        "Also returns the resourceVersion the list is at"
+
         log = self.get_ctx_logger(selector)
 
         retries = 0
@@ -351,50 +514,122 @@ class AsyncClient:
                 log.exception("List request failed with unexpected error - giving up")
                 raise
 
+    async def get_object(self, selector: ObjectSelector, name: str) -> Optional[Any]:
+        "Returns None if there is no such object"
+
+        log = self.get_ctx_logger(selector)
+
+        kind = selector.res.kind
+        url = await self.construct_url(selector, object_name=name)
+
+        kwargs = dict(
+            ssl_context=self.ssl_context,
+            auth=self.auth_provider.get_auth(),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            timeout=ClientTimeout(
+                sock_connect=3,
+                total=15,
+            ),
+        )
+
+        log.info("Getting %s object on %s", kind, url)
+        async with self.session.get(url, allow_redirects=True, **kwargs) as response:
+
+            reader = self.open_reader(url, response)
+            body = await reader.read()
+            self.record_transfer(reader, log)
+
+            log.debug("Parsing %s response as json", kind)
+            js = self.codec.loads(body)
+
+            try:
+                self.maybe_parse_error(js)
+            except ApiError as exc:
+                if exc.code == 404:
+                    return None
+                raise
+
+            if selector.projection is not None:
+                js = selector.projection.apply(js)
+
+            log.debug("Returning %s object", kind)
+            return js
+
     async def watch_attempt(
         self, selector: ObjectSelector, oev_sender: OEvSender
     ) -> None:
         log = self.get_ctx_logger(selector)
 
         kind = selector.res.kind
-        url = await self.construct_url(selector, watch=True)
+        timeout = random.randint(WATCH_TIMEOUT_MIN, WATCH_TIMEOUT_MAX)
+        url = await self.construct_url(selector, watch=True, timeout=timeout)
+        metrics = self.get_watch_metrics(selector)
+
+        # without bookmarks the watch is only bounded by the total timeout
+        progress_deadline = None
+        if selector in self.bookmarked_selectors:
+            progress_deadline = self.watch_progress_deadline
 
         kwargs = dict(
             ssl_context=self.ssl_context,
             auth=self.auth_provider.get_auth(),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
             timeout=ClientTimeout(
                 sock_connect=3,
-                total=300,
+                # the progress deadline: time allowed between two reads
+                sock_read=progress_deadline,
+                # the server should always end the watch before we do
+                total=timeout + 30,
             ),
         )
 
         log.info("Watching %s objects on %s", kind, url)
         async with self.session.get(url, allow_redirects=True, **kwargs) as response:
+            # error responses are parsed (and raised) from the body below
+            if response.ok:
+                metrics.on_connected()
+
+            reader = self.open_reader(url, response)
+            try:
+                while True:
+                    log.debug("Waiting for %s response item", kind)
+                    dct = await self.read_json_line(reader)
 
-            # read one line at a time, b'\n' terminated
-            while True:
-                log.debug("Waiting for %s response line", kind)
-                line = await response.content.readline()
+                    if dct is None:
+                        log.info("Received end of stream, exiting")
+                        break
 
-                if not line:
-                    log.info("Received empty line, exiting")
-                    break
+                    # may raise
+                    self.maybe_parse_error(dct)
 
-                log.debug("Parsing %s response line [len: %s] as json", kind, len(line))
-                dct = json.loads(line)
+                    # bookmarks only tell us how far along the watch is
+                    if dct["type"] == "BOOKMARK":
+                        self.bookmarked_selectors.add(selector)
+                        await self.update_resource_version(dct=dct["object"])
+                        self.advance_selector_version(selector, dct["object"])
+                        continue
 
-                # may raise
-                self.maybe_parse_error(dct)
+                    obj = dct["object"]
+                    if selector.projection is not None:
+                        obj = selector.projection.apply(obj)
 
-                action = self.parse_watch_action(dct)
-                event = ObjectEvent(
-                    context=self.context, action=action, object=dct["object"]
-                )
+                    action = self.parse_watch_action(dct)
+                    event = ObjectEvent(context=self.context, action=action, object=obj)
+
+                    await self.update_resource_version(dct=obj)
+                    self.advance_selector_version(selector, obj)
 
-                await self.update_resource_version(dct=dct["object"])
+                    log.debug("Returning %s item", kind)
+                    oev_sender.send(event)
 
-                log.debug("Returning %s item", kind)
-                oev_sender.send(event)
+            except ServerTimeoutError:
+                metrics.on_stalled()
+                raise WatchStalledError("No data received for %ss" % progress_deadline)
+
+            finally:
+                metrics.on_disconnected()
+                self.record_transfer(reader, log)
+                log.info("Watch metrics: %r", metrics)
 
     async def watch_objects(
         self, *, selector: ObjectSelector, oev_sender: OEvSender
@@ -418,9 +653,14 @@ class AsyncClient:
             try:
                 await self.watch_attempt(selector, oev_sender)
 
+            except WatchStalledError as exc:
+                # the connection is most likely half open, reconnect right away
+                log.warn("Watch request stalled: %r - reconnecting", exc)
+                continue
+
             except successful_completion_exceptions as exc:
                 # the server timed out the watch - we expect this to happen
-                # after the normal server timeout interval (5-15min)
+                # after the timeoutSeconds we asked for (5-10min)
                 # (this could also happen if the server is unreachable....)
                 log.info("Watch request completed - restarting: %r", exc)
                 await asyncio.sleep(1)  # don't retry aggressively
@@ -443,21 +683,26 @@ class AsyncClient:
                     await asyncio.sleep(1)  # don't retry aggressively
                     continue
 
-                # the server said our resourceVersion is too old, but also told
-                # us an acceptable resourceVersion so let's use that
+                # the server no longer has the events since our resourceVersion.
+                # The watch fails, which consumers are told with a DEGRADED
+                # event so that they list again, and resumes from a version the
+                # server has, or from any version if it did not say
                 if exc.is_resource_version_too_old():
-                    await self.update_resource_version(exc=exc)
-                    continue
+                    self.selector_versions[selector] = (
+                        exc.extract_resource_version() or 0
+                    )
+                    log.warn("Watch request expired: %r - listing again", exc)
+                    raise
 
-                # if the http error seems permanet then log a traceback and exit
+                # if the http error seems permanet then log a traceback and
+                # leave it to the cluster loop to restart the watch
                 log.exception(
                     "Watch request failed with non-retryable error - giving up"
                 )
-                self.send_error(exc, oev_sender)
-                break
+                raise
 
-            except Exception as exc:
-                # we don't know what the error is so log a traceback and exit
+            except Exception:
+                # we don't know what the error is so log a traceback and leave
+                # it to the cluster loop to restart the watch
                 log.exception("Watch request failed with unexpected error - giving up")
-                self.send_error(exc, oev_sender)
-                break
+                raise
@@ -1,9 +1,15 @@
 import asyncio
 import logging
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from kube.async_loop import AsyncLoop
-from kube.channels.objects import OEvReceiver, create_oev_chan
+from kube.channels.objects import (
+    AsyncOEvChan,
+    AsyncOEvReceiver,
+    OEvReceiver,
+    create_async_oev_chan,
+    create_oev_chan,
+)
 from kube.config import Context
 from kube.events.objects import Action, ObjectEvent
 from kube.model.api_group import CoreV1
@@ -11,46 +17,160 @@ from kube.model.api_resource import ApiResource
 from kube.model.selector import ObjectSelector
 
 
-class SyncClusterFacade:
+class AsyncClusterFacade:
+    """
+    The facade for use from asyncio code. Runs on the caller's own event loop
+    when given an AsyncLoop from `attach_to_running_loop()`, and watches are
+    consumed as async iterators:
+
+        async_loop = attach_to_running_loop()
+        facade = AsyncClusterFacade(async_loop=async_loop, context=context)
+
+        async for event in await facade.list_then_watch(selector=selector):
+            ...
+
+        await async_loop.close()
+    """
+
     def __init__(self, *, async_loop: AsyncLoop, context: Context, logger=None) -> None:
         self.async_loop = async_loop
         self.context = context
         self.logger = logger or logging.getLogger("facade")
 
-    def list_api_resources(self) -> List[ApiResource]:
-        async def list_resources():
-            cluster_loop = await self.async_loop.get_cluster_loop(self.context)
-            client = await cluster_loop.get_client()
+        self.watch_chans: Dict[ObjectSelector, AsyncOEvChan] = {}
+
+    async def list_api_resources(self) -> List[ApiResource]:
+        cluster_loop = await self.async_loop.get_cluster_loop(self.context)
+        client = await cluster_loop.get_client()
+
+        groups = [CoreV1]
+        non_core_groups = await client.list_api_groups()
+        groups.extend(non_core_groups)
+
+        all_resources = []
+
+        coros = [client.list_api_resources(group) for group in groups]
+        resource_lists = await asyncio.gather(*coros)
 
-            groups = [CoreV1]
-            non_core_groups = await client.list_api_groups()
-            groups.extend(non_core_groups)
+        for resources in resource_lists:
+            all_resources.extend(resources)
 
-            all_resources = []
+        return all_resources
 
-            coros = [client.list_api_resources(group) for group in groups]
-            resource_lists = await asyncio.gather(*coros)
+    async def get_openapi_documents(self, *, group_versions: List[str]) -> List[Any]:
+        "Returns the OpenAPI v3 documents for eg. 'api/v1', 'apis/apps/v1'"
 
-            for resources in resource_lists:
-                all_resources.extend(resources)
+        cluster_loop = await self.async_loop.get_cluster_loop(self.context)
+        client = await cluster_loop.get_client()
+
+        index = await client.get_openapi_document()
+        paths = index["paths"]
+
+        missing = [gv for gv in group_versions if gv not in paths]
+        if missing:
+            raise ValueError("No openapi documents for: %s" % ", ".join(missing))
+
+        coros = [
+            client.get_openapi_document(paths[gv]["serverRelativeURL"])
+            for gv in group_versions
+        ]
+        return await asyncio.gather(*coros)
+
+    async def list_objects(self, *, selector: ObjectSelector) -> List[Any]:
+        cluster_loop = await self.async_loop.get_cluster_loop(self.context)
+        client = await cluster_loop.get_client()
+        return await client.list_objects(selector)
+
+    async def list_objects_with_version(
+        self, *, selector: ObjectSelector
+    ) -> Tuple[List[Any], int]:
+        "Also returns the resourceVersion the list is at"
+
+        cluster_loop = await self.async_loop.get_cluster_loop(self.context)
+        client = await cluster_loop.get_client()
+        return await client.list_objects_with_version(selector)
+
+    async def get_object(self, *, selector: ObjectSelector, name: str) -> Optional[Any]:
+        cluster_loop = await self.async_loop.get_cluster_loop(self.context)
+        client = await cluster_loop.get_client()
+        return await client.get_object(selector, name)
+
+    async def start_watching(self, *, selector: ObjectSelector) -> AsyncOEvReceiver:
+        oev_chan = create_async_oev_chan()
+        self.watch_chans[selector] = oev_chan
+
+        cluster_loop = await self.async_loop.get_cluster_loop(self.context)
+        await cluster_loop.start_watch(selector, oev_chan.sender)
+
+        return oev_chan.receiver
 
-            return all_resources
+    async def stop_watching(self, *, selector: ObjectSelector) -> None:
+        "Iterating over the receiver of the watch ends once it is drained"
 
-        return self.async_loop.run_coro_until_completion(list_resources())
+        cluster_loop = await self.async_loop.get_cluster_loop(self.context)
+        await cluster_loop.stop_watch(selector)
+
+        oev_chan = self.watch_chans.pop(selector, None)
+        if oev_chan is not None:
+            oev_chan.close()
+
+    async def list_then_watch(self, *, selector: ObjectSelector) -> AsyncOEvReceiver:
+        "Raises if the list fails, unlike the sync version"
+
+        oev_chan = create_async_oev_chan()
+
+        cluster_loop = await self.async_loop.get_cluster_loop(self.context)
+        client = await cluster_loop.get_client()
+
+        items = await client.list_objects(selector)
+        for item in items:
+            event = ObjectEvent(context=self.context, action=Action.LISTED, object=item)
+            oev_chan.sender.send(event)
+
+        self.watch_chans[selector] = oev_chan
+        await cluster_loop.start_watch(selector, oev_chan.sender)
+
+        return oev_chan.receiver
+
+
+class SyncClusterFacade:
+    def __init__(self, *, async_loop: AsyncLoop, context: Context, logger=None) -> None:
+        self.async_loop = async_loop
+        self.context = context
+        self.logger = logger or logging.getLogger("facade")
+
+        # the operations that don't involve a channel are the same in both
+        self.async_facade = AsyncClusterFacade(
+            async_loop=async_loop, context=context, logger=logger
+        )
+
+    def list_api_resources(self) -> List[ApiResource]:
+        coro = self.async_facade.list_api_resources()
+        return self.async_loop.run_coro_until_completion(coro)
+
+    def get_openapi_documents(self, *, group_versions: List[str]) -> List[Any]:
+        coro = self.async_facade.get_openapi_documents(group_versions=group_versions)
+        return self.async_loop.run_coro_until_completion(coro)
 
     def list_objects(self, *, selector: ObjectSelector) -> List[Any]:
-        async def list_objects():
-            cluster_loop = await self.async_loop.get_cluster_loop(self.context)
-            client = await cluster_loop.get_client()
-            items = await client.list_objects(selector)
-            return items
+        coro = self.async_facade.list_objects(selector=selector)
+        return self.async_loop.run_coro_until_completion(coro)
+
+    def list_objects_with_version(
+        self, *, selector: ObjectSelector
+    ) -> Tuple[List[Any], int]:
+        coro = self.async_facade.list_objects_with_version(selector=selector)
+        return self.async_loop.run_coro_until_completion(coro)
 
-        return self.async_loop.run_coro_until_completion(list_objects())
+    def get_object(self, *, selector: ObjectSelector, name: str) -> Optional[Any]:
+        coro = self.async_facade.get_object(selector=selector, name=name)
+        return self.async_loop.run_coro_until_completion(coro)
 
     def get_resource(
         self, *, apires: ApiResource, namespace: Optional[str], name: str
     ) -> Optional[Any]:
-        pass
+        selector = ObjectSelector(res=apires, namespace=namespace)
+        return self.get_object(selector=selector, name=name)
 
     def start_watching(self, *, selector: ObjectSelector) -> OEvReceiver:
         oev_chan = create_oev_chan()
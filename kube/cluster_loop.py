@@ -1,15 +1,48 @@
-import asyncio
 import logging
-from asyncio import Event, Lock, Task
-from asyncio.exceptions import CancelledError
+from asyncio import Event, Lock, Task, TimerHandle
+from functools import partial
 from typing import Any, Dict, Optional
 
-import aiohttp
-
 from kube.channels.objects import OEvSender
 from kube.client import AsyncClient
 from kube.config import Context
+from kube.events.objects import Action, ObjectEvent
+from kube.metrics import WatchMetrics, WatchState
 from kube.model.selector import ObjectSelector
+from kube.transfer import create_session
+
+# delay before restarting a failed watch, doubled for every consecutive failure
+WATCH_RESTART_DELAY_MIN = 1.0
+WATCH_RESTART_DELAY_MAX = 60.0
+
+
+class SupervisedWatch:
+    """A watch task plus what we need to restart it when it fails. The state of
+    the watch itself is kept in its WatchMetrics."""
+
+    def __init__(
+        self, *, selector: ObjectSelector, oev_sender: OEvSender, metrics: WatchMetrics
+    ) -> None:
+        self.selector = selector
+        self.oev_sender = oev_sender
+        self.metrics = metrics
+
+        self.task: Optional[Task] = None
+        self.restart_handle: Optional[TimerHandle] = None
+
+        # consecutive failures, reset once the watch connects
+        self.restarts = 0
+        # whether the consumer has been told the watch is degraded
+        self.is_degraded = False
+        self.is_stopped = False
+
+    def __repr__(self) -> str:
+        return "<%s selector=%r, state=%r, restarts=%r>" % (
+            self.__class__.__name__,
+            self.selector,
+            self.metrics.state.value,
+            self.restarts,
+        )
 
 
 class AsyncClusterLoop:
@@ -23,8 +56,10 @@ class AsyncClusterLoop:
         self.initialized_event = Event()
         self.client: Optional[AsyncClient] = None
 
+        self.stopped_event = Event()
+
         self.watches_lock = Lock()
-        self.watches: Dict[ObjectSelector, Task] = {}
+        self.watches: Dict[ObjectSelector, SupervisedWatch] = {}
 
     async def wait_until_initialized(self):
         await self.initialized_event.wait()
@@ -40,45 +75,116 @@ class AsyncClusterLoop:
     ) -> None:
         assert self.client is not None  # help mypy
 
-        loop = self.async_loop.get_loop()
-        coro = self.client.watch_objects(selector=selector, oev_sender=oev_sender)
-        task = loop.create_task(coro)
+        watch = SupervisedWatch(
+            selector=selector,
+            oev_sender=oev_sender,
+            metrics=self.client.get_watch_metrics(selector),
+        )
+        watch.metrics.on_state_change = partial(self.on_watch_state_change, watch)
 
         async with self.watches_lock:
-            self.watches[selector] = task
+            self.watches[selector] = watch
+
+        self.launch_watch(watch)
 
     async def stop_watch(self, selector: ObjectSelector) -> None:
         async with self.watches_lock:
-            task = self.watches.pop(selector, None)
+            watch = self.watches.pop(selector, None)
 
-        if task is None:
+        if watch is None:
             raise RuntimeError("No such watch for selector %r" % selector)
 
-        try:
-            task.cancel()
-        except CancelledError:
-            pass
+        watch.is_stopped = True
+        watch.metrics.on_state_change = None
+
+        if self.client is not None:
+            self.client.drop_watch_metrics(selector)
+
+        if watch.restart_handle is not None:
+            watch.restart_handle.cancel()
+
+        if watch.task is not None:
+            watch.task.cancel()
+
+    async def stop(self) -> None:
+        "Stops all the watches and lets the mainloop exit"
 
-    async def detect_stopped_watches(self):
         async with self.watches_lock:
-            for selector, task in self.watches.items():
-                if not task.done():
-                    continue
-
-                exc = task.exception()
-                if exc is not None:
-                    self.logger.error(
-                        "Watch with selector %r errored out: %r", selector, exc
-                    )
-                    return
-
-                # okay, it didn't crash but... it exited for some reason?
-                self.logger.warn(
-                    "Watch with selector %r completed prematurely", selector
-                )
+            selectors = list(self.watches.keys())
+
+        for selector in selectors:
+            await self.stop_watch(selector)
+
+        self.stopped_event.set()
+
+    def launch_watch(self, watch: SupervisedWatch) -> None:
+        assert self.client is not None  # help mypy
+
+        watch.restart_handle = None
+        if watch.is_stopped:
+            return
+
+        if watch.metrics.state is WatchState.FAILED:
+            watch.metrics.set_state(WatchState.RECONNECTING)
+
+        loop = self.async_loop.get_loop()
+        coro = self.client.watch_objects(
+            selector=watch.selector, oev_sender=watch.oev_sender
+        )
+        watch.task = loop.create_task(coro)
+        watch.task.add_done_callback(partial(self.on_watch_done, watch))
+
+    def on_watch_done(self, watch: SupervisedWatch, task: Task) -> None:
+        if watch.is_stopped or task.cancelled():
+            return
+
+        exc = task.exception()
+        if exc is not None:
+            self.logger.error(
+                "Watch with selector %r errored out: %r", watch.selector, exc
+            )
+        else:
+            # okay, it didn't crash but... it exited for some reason?
+            self.logger.warn(
+                "Watch with selector %r completed prematurely", watch.selector
+            )
+            exc = RuntimeError("Watch completed prematurely")
+
+        assert isinstance(exc, Exception)  # help mypy
+        watch.metrics.on_failed(exc)
+
+        delay = min(
+            WATCH_RESTART_DELAY_MIN * 2 ** min(watch.restarts, 10),
+            WATCH_RESTART_DELAY_MAX,
+        )
+        watch.restarts += 1
+
+        self.logger.info("Restarting watch %r in %.0fs", watch, delay)
+        loop = self.async_loop.get_loop()
+        watch.restart_handle = loop.call_later(delay, self.launch_watch, watch)
+
+    def on_watch_state_change(
+        self, watch: SupervisedWatch, metrics: WatchMetrics, previous: WatchState
+    ) -> None:
+        if metrics.state is WatchState.FAILED and not watch.is_degraded:
+            watch.is_degraded = True
+            self.send_watch_status(watch, Action.DEGRADED, metrics.last_error)
+
+        elif metrics.state is WatchState.CONNECTED:
+            watch.restarts = 0
+
+            if watch.is_degraded:
+                watch.is_degraded = False
+                self.send_watch_status(watch, Action.RECOVERED, None)
+
+    def send_watch_status(
+        self, watch: SupervisedWatch, action: Action, obj: Any
+    ) -> None:
+        event = ObjectEvent(context=self.context, action=action, object=obj)
+        watch.oev_sender.send(event)
 
     async def mainloop(self):
-        async with aiohttp.ClientSession() as session:
+        async with create_session() as session:
             logger = logging.getLogger("client")
             logger.setLevel(logging.INFO)
 
@@ -89,6 +195,6 @@ class AsyncClusterLoop:
             # once we have a client we announce we are ready for use
             self.initialized_event.set()
 
-            while True:
-                await self.detect_stopped_watches()
-                await asyncio.sleep(1)
+            # watches are supervised through their done callbacks, so there is
+            # nothing to do until we are stopped
+            await self.stopped_event.wait()
@@ -0,0 +1,134 @@
+"""
+Pluggable json backends.
+
+Decoding json is the most expensive thing we do per watch event, so we use a
+faster backend when one is installed. The backends are optional dependencies,
+we fall back on the stdlib json module when none of them are available.
+
+The backend can be chosen explicitly with `configure_codec()` or by setting
+$KUBE_JSON_BACKEND, otherwise the fastest available backend is picked.
+"""
+
+import datetime
+import json
+import os
+from typing import Any, Dict, List, Optional, Type, Union
+
+ENV_VAR = "KUBE_JSON_BACKEND"
+
+
+class JsonCodec:
+    name = ""
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        raise NotImplementedError
+
+    def dumps_pretty(self, obj: Any) -> str:
+        "Serializes with sorted keys and an indent of 2"
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return "<%s name=%r>" % (self.__class__.__name__, self.name)
+
+
+class StdlibCodec(JsonCodec):
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        def default(obj):
+            if isinstance(obj, datetime.date):
+                return obj.isoformat()
+
+        return json.dumps(obj, sort_keys=True, indent=2, default=default)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self.orjson = orjson
+        self.pretty_option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self.orjson.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return self.orjson.dumps(obj, option=self.pretty_option).decode()
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self.msgspec = msgspec
+        self.decoder = msgspec.json.Decoder()
+        self.encoder = msgspec.json.Encoder(order="sorted")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self.decoder.decode(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        block = self.encoder.encode(obj)
+        return self.msgspec.json.format(block, indent=2).decode()
+
+
+# in order of preference
+BACKENDS: Dict[str, Type[JsonCodec]] = {
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+    StdlibCodec.name: StdlibCodec,
+}
+
+_codec: Optional[JsonCodec] = None
+
+
+def create_codec(name: str) -> JsonCodec:
+    "Raises ImportError if the backend is not installed"
+
+    codec_cls = BACKENDS.get(name)
+    if codec_cls is None:
+        raise ValueError(
+            "Unknown json backend %r, choose from: %s" % (name, ", ".join(BACKENDS))
+        )
+
+    return codec_cls()
+
+
+def get_available_backends() -> List[str]:
+    names = []
+
+    for name in BACKENDS:
+        try:
+            create_codec(name)
+        except ImportError:
+            continue
+
+        names.append(name)
+
+    return names
+
+
+def configure_codec(name: Optional[str] = None) -> JsonCodec:
+    global _codec
+
+    name = name or os.getenv(ENV_VAR)
+    if name:
+        _codec = create_codec(name)
+        return _codec
+
+    _codec = create_codec(get_available_backends()[0])
+    return _codec
+
+
+def get_codec() -> JsonCodec:
+    if _codec is None:
+        return configure_codec()
+
+    return _codec
@@ -1,15 +1,19 @@
 import base64
-import fnmatch
 import logging
 import os
 import tempfile
 from ssl import SSLContext, create_default_context
-from typing import Dict, List, Optional, Sequence
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import yaml
 
+from kube.model.selector import compile_glob
 from kube.tools.repr import disp_secret_blob, disp_secret_string
 
+# the C loader is many times faster, it needs pyyaml built against libyaml
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ExecCmd:
     def __init__(self, *, command: str, args: List[str], env: Dict[str, str]) -> None:
@@ -190,12 +194,40 @@ class Context:
         return ssl_context
 
 
+class ContextRef:
+    """A context as written in a kube config, naming its user and cluster.
+    These may be defined in another file, so they are resolved only once all
+    the files are loaded."""
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        user_name: str,
+        cluster_name: str,
+        namespace: Optional[str],
+    ) -> None:
+        self.name = name
+        self.user_name = user_name
+        self.cluster_name = cluster_name
+        self.namespace = namespace
+
+    def __repr__(self) -> str:
+        return "<%s name=%r, user_name=%r, cluster_name=%r, namespace=%r>" % (
+            self.__class__.__name__,
+            self.name,
+            self.user_name,
+            self.cluster_name,
+            self.namespace,
+        )
+
+
 class KubeConfigFile:
     def __init__(
         self,
         *,
         filepath: str,
-        contexts: Sequence[Context],
+        context_refs: Sequence[ContextRef],
         users: Sequence[User],
         clusters: Sequence[Cluster],
         ctime: float,
@@ -203,45 +235,67 @@ class KubeConfigFile:
         atime: float,
     ) -> None:
         self.filepath = filepath
-        self.contexts = contexts or []
+        self.context_refs = context_refs or []
         self.users = users or []
         self.clusters = clusters or []
         self.ctime = ctime
         self.mtime = mtime
         self.atime = atime
 
+        # the first definition of a name in the file wins
+        self.users_by_name: Dict[str, User] = {}
+        for user in self.users:
+            self.users_by_name.setdefault(user.name, user)
+
+        self.clusters_by_name: Dict[str, Cluster] = {}
+        for cluster in self.clusters:
+            self.clusters_by_name.setdefault(cluster.name, cluster)
+
     def __repr__(self) -> str:
-        return "<%s filepath=%r, contexts=%r, users=%r, clusters=%r>" % (
+        return "<%s filepath=%r, context_refs=%r, users=%r, clusters=%r>" % (
             self.__class__.__name__,
             self.filepath,
-            self.contexts,
+            self.context_refs,
             self.users,
             self.clusters,
         )
 
 
 class KubeConfigCollection:
+    """The merged contents of the kube config files, indexed by name. Like
+    kubectl, the first file to define a name wins. A context is resolved
+    against the users and clusters of its own file, and those of the other
+    files only for names its file does not define, see resolve_context()."""
+
     def __init__(self) -> None:
         self.clusters: Dict[str, Cluster] = {}
         self.contexts: Dict[str, Context] = {}
         self.users: Dict[str, User] = {}
 
-    def add_file(self, config_file: KubeConfigFile) -> None:
-        # NOTE: does not enforce uniqueness of context/user/cluster names
+        # name -> (ref, the file that defines it)
+        self.context_refs: Dict[str, Tuple[ContextRef, KubeConfigFile]] = {}
+
+        self.sorted_names: Optional[List[str]] = None
 
+    def add_file(self, config_file: KubeConfigFile) -> None:
         for cluster in config_file.clusters:
-            self.clusters[cluster.name] = cluster
+            self.clusters.setdefault(cluster.name, cluster)
 
-        for context in config_file.contexts:
-            self.contexts[context.name] = context
+        for ref in config_file.context_refs:
+            self.context_refs.setdefault(ref.name, (ref, config_file))
 
         for user in config_file.users:
-            self.users[user.name] = user
+            self.users.setdefault(user.name, user)
+
+    def add_context(self, context: Context) -> None:
+        self.contexts[context.name] = context
+        self.sorted_names = None
 
     def get_context_names(self) -> Sequence[str]:
-        names = list(self.contexts.keys())
-        names.sort()
-        return names
+        if self.sorted_names is None:
+            self.sorted_names = sorted(self.contexts.keys())
+
+        return self.sorted_names
 
     def get_context(self, name) -> Optional[Context]:
         return self.contexts.get(name)
@@ -251,20 +305,128 @@ class KubeConfigSelector:
     def __init__(self, *, collection: KubeConfigCollection) -> None:
         self.collection = collection
 
+    @property
+    def collection(self) -> KubeConfigCollection:
+        return self._collection
+
+    @collection.setter
+    def collection(self, collection: KubeConfigCollection) -> None:
+        # the collection is replaced on reload, which invalidates the matches
+        self._collection = collection
+        self.matches: Dict[str, List[Context]] = {}
+
     def fnmatch_context(self, pattern: str) -> List[Context]:
+        contexts = self.matches.get(pattern)
+        if contexts is None:
+            contexts = self.match_contexts(pattern)
+            self.matches[pattern] = contexts
+
+        return list(contexts)
+
+    def match_contexts(self, pattern: str) -> List[Context]:
+        matcher = compile_glob(pattern)
+
+        # a plain name does not need to look at the other names
+        if matcher.is_literal:
+            context = self.collection.get_context(pattern)
+            return [context] if context else []
+
         names = self.collection.get_context_names()
-        names = fnmatch.filter(names, pattern)
-        objs = [self.collection.get_context(name) for name in names]
-        contexts = [ctx for ctx in objs if ctx]
+        if not matcher.matches_everything:
+            names = matcher.filter(names)
+
+        return [self.collection.contexts[name] for name in names]
+
+
+# identifies a version of a file: (mtime_ns, size, inode)
+FileVersion = Tuple[int, int, int]
+
+
+class KubeConfigCache:
+    """Parsed kube config files by path, reused for as long as the file is
+    unchanged. Files that failed to parse are cached too (as None), so they
+    are not parsed again until they change.
+
+    The contexts resolved by the last load are kept too, and reused when
+    neither their file nor their user and cluster changed. That is what lets
+    a reload tell unchanged contexts from changed ones."""
+
+    def __init__(self) -> None:
+        self.entries: Dict[str, Tuple[FileVersion, Optional[KubeConfigFile]]] = {}
+        self.contexts: Dict[str, Context] = {}
+        self.lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return "<%s entries=%r, hits=%r, misses=%r>" % (
+            self.__class__.__name__,
+            len(self.entries),
+            self.hits,
+            self.misses,
+        )
+
+    def get(
+        self, filepath: str, version: FileVersion
+    ) -> Tuple[bool, Optional[KubeConfigFile]]:
+        "Returns (found, config_file)"
+
+        with self.lock:
+            entry = self.entries.get(filepath)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return True, entry[1]
+
+            self.misses += 1
+            return False, None
+
+    def put(
+        self,
+        filepath: str,
+        version: FileVersion,
+        config_file: Optional[KubeConfigFile],
+    ) -> None:
+        with self.lock:
+            self.entries[filepath] = (version, config_file)
+
+    def reuse_contexts(self, contexts: Dict[str, Context]) -> Dict[str, Context]:
+        """Swaps in the contexts of the previous load that are unchanged, and
+        keeps the result for the next load"""
+
+        with self.lock:
+            for name, context in contexts.items():
+                previous = self.contexts.get(name)
+                if (
+                    previous is not None
+                    and previous.file is context.file
+                    and previous.user is context.user
+                    and previous.cluster is context.cluster
+                    and previous.namespace == context.namespace
+                ):
+                    contexts[name] = previous
+
+            self.contexts = dict(contexts)
+
         return contexts
 
 
+# shared by all loaders, so that every get_selector() benefits
+CONFIG_CACHE = KubeConfigCache()
+
+
 class KubeConfigLoader:
     def __init__(
-        self, *, config_dir="$HOME/.kube", config_var="KUBECONFIG", logger=None
+        self,
+        *,
+        config_dir="$HOME/.kube",
+        config_var="KUBECONFIG",
+        cache: Optional[KubeConfigCache] = None,
+        logger=None,
     ) -> None:
         self.config_dir = config_dir
         self.config_var = config_var
+        self.cache = cache or CONFIG_CACHE
         self.logger = logger or logging.getLogger("config-loader")
 
     def get_candidate_files(self) -> Sequence[str]:
@@ -275,9 +437,10 @@ class KubeConfigLoader:
             filepaths = [fp.strip() for fp in filepaths if fp.strip()]
             return filepaths
 
-        # fall back on config_dir
+        # fall back on config_dir, in a stable order since the first file to
+        # define a name wins
         path = os.path.expandvars(self.config_dir)
-        filenames = os.listdir(path)
+        filenames = sorted(os.listdir(path))
         filepaths = []
 
         for fn in filenames:
@@ -289,6 +452,22 @@ class KubeConfigLoader:
 
         return filepaths
 
+    def get_watch_paths(self) -> List[str]:
+        "The directories to watch for changes to the candidate files"
+
+        env_var = os.getenv(self.config_var)
+        if not env_var:
+            return [os.path.expandvars(self.config_dir)]
+
+        # watch the directories, files are often replaced rather than written
+        paths: List[str] = []
+        for filepath in self.get_candidate_files():
+            dirname = os.path.dirname(os.path.abspath(filepath))
+            if dirname not in paths:
+                paths.append(dirname)
+
+        return paths
+
     def take_after_last_slash(self, name: str) -> str:
         # arn:aws:iam::123:role/myrole -> myrole
         if "/" in name:
@@ -296,9 +475,7 @@ class KubeConfigLoader:
 
         return name
 
-    def parse_context(
-        self, clusters: Sequence[Cluster], users: Sequence[User], dct
-    ) -> Optional[Context]:
+    def parse_context(self, dct) -> Optional[ContextRef]:
         name = dct.get("name")
         name = self.take_after_last_slash(name)
 
@@ -312,31 +489,56 @@ class KubeConfigLoader:
 
         # 'name', 'cluster' and 'user' are required attributes
         if all((name, cluster_id, user_id)):
-            users = [user for user in users if user.name == user_id]
-            if not users:
-                self.logger.warn(
-                    "When parsing context %r could not find matching user %r",
-                    name,
-                    user_id,
-                )
+            return ContextRef(
+                name=name,
+                user_name=user_id,
+                cluster_name=cluster_id,
+                namespace=namespace,
+            )
 
-            clusters = [cluster for cluster in clusters if cluster.name == cluster_id]
-            if not clusters:
-                self.logger.warn(
-                    "When parsing context %r could not find matching cluster %r",
-                    name,
-                    cluster_id,
-                )
+        return None
 
-            if users and clusters:
-                return Context(
-                    name=name,
-                    user=users[0],
-                    cluster=clusters[0],
-                    namespace=namespace,
-                )
+    def resolve_context(
+        self,
+        collection: KubeConfigCollection,
+        ref: ContextRef,
+        config_file: KubeConfigFile,
+    ) -> Optional[Context]:
+        # generated kube configs reuse names like 'kubernetes-admin', which
+        # must not bind a context to another file's credentials or server
+        user = config_file.users_by_name.get(ref.user_name)
+        if user is None:
+            user = collection.users.get(ref.user_name)
+
+        if user is None:
+            self.logger.warn(
+                "When parsing context %r could not find matching user %r",
+                ref.name,
+                ref.user_name,
+            )
 
-        return None
+        cluster = config_file.clusters_by_name.get(ref.cluster_name)
+        if cluster is None:
+            cluster = collection.clusters.get(ref.cluster_name)
+
+        if cluster is None:
+            self.logger.warn(
+                "When parsing context %r could not find matching cluster %r",
+                ref.name,
+                ref.cluster_name,
+            )
+
+        if user is None or cluster is None:
+            return None
+
+        context = Context(
+            name=ref.name,
+            user=user,
+            cluster=cluster,
+            namespace=ref.namespace,
+        )
+        context.set_file(config_file)
+        return context
 
     def parse_cluster(self, dct) -> Optional[Cluster]:
         name = dct.get("name")
@@ -402,15 +604,30 @@ class KubeConfigLoader:
         return None
 
     def load_file(self, filepath: str) -> Optional[KubeConfigFile]:
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            self.logger.warn("Failed to stat kube config: %s", filepath)
+            return None
+
+        version = (st.st_mtime_ns, st.st_size, st.st_ino)
+        found, config_file = self.cache.get(filepath, version)
+        if found:
+            return config_file
+
+        config_file = self.parse_file(filepath, st)
+        self.cache.put(filepath, version, config_file)
+        return config_file
+
+    def parse_file(self, filepath: str, st: os.stat_result) -> Optional[KubeConfigFile]:
         with open(filepath, "rb") as fl:
             try:
-                dct = yaml.load(fl, Loader=yaml.SafeLoader)
+                dct = yaml.load(fl, Loader=SafeLoader)
             except Exception:
                 self.logger.warn("Failed to parse kube config as yaml: %s", filepath)
                 return None
 
-        kind = dct.get("kind")
-        if not kind == "Config":
+        if not isinstance(dct, dict) or dct.get("kind") != "Config":
             self.logger.warn("Kube config does not have kind: Config: %s", filepath)
             return None
 
@@ -420,20 +637,15 @@ class KubeConfigLoader:
         user_list = [self.parse_user(user) for user in dct.get("users") or []]
         users = [user for user in user_list if user]
 
-        ctx_list = [
-            self.parse_context(clusters, users, ctx)
-            for ctx in dct.get("contexts") or []
-        ]
-        contexts = [ctx for ctx in ctx_list if ctx]
-
-        st = os.stat(filepath)
+        ref_list = [self.parse_context(ctx) for ctx in dct.get("contexts") or []]
+        context_refs = [ref for ref in ref_list if ref]
 
-        # The context is the organizing principle of a kube config so if we
-        # didn't find any we failed to parse the file
-        if contexts:
-            config_file = KubeConfigFile(
+        # A file may hold only users or only clusters for the contexts in
+        # another file, but if it has none of them we failed to parse it
+        if context_refs or users or clusters:
+            return KubeConfigFile(
                 filepath=filepath,
-                contexts=contexts,
+                context_refs=context_refs,
                 users=users,
                 clusters=clusters,
                 ctime=st.st_ctime,
@@ -441,12 +653,17 @@ class KubeConfigLoader:
                 atime=st.st_atime,
             )
 
-            for context in contexts:
-                context.set_file(config_file)
+        return None
 
-            return config_file
+    def resolve_contexts(self, collection: KubeConfigCollection) -> None:
+        contexts = {}
+        for ref, config_file in collection.context_refs.values():
+            context = self.resolve_context(collection, ref, config_file)
+            if context:
+                contexts[context.name] = context
 
-        return None
+        for context in self.cache.reuse_contexts(contexts).values():
+            collection.add_context(context)
 
     def create_collection(self) -> KubeConfigCollection:
         collection = KubeConfigCollection()
@@ -456,6 +673,7 @@ class KubeConfigLoader:
             if config_file:
                 collection.add_file(config_file)
 
+        self.resolve_contexts(collection)
         return collection
 
 
@@ -0,0 +1,168 @@
+"""
+Hot reloading of kube configs.
+
+The watcher reloads the collection whenever a file in a config directory is
+written, created, moved or deleted, using inotify where available and polling
+otherwise. Files that did not change come out of the cache as the same
+objects, so a reload can tell which contexts were added and which were
+removed, and a context whose file changed shows up as both (the old object
+removed, a new one added).
+"""
+
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from kube.config import Context, KubeConfigLoader, KubeConfigSelector
+from kube.tools import inotify
+
+# how long to wait for more changes after the first, tools often write
+# several files in a row
+DEBOUNCE_DELAY = 0.2
+
+# how often to check for changes when inotify is not available
+POLL_INTERVAL = 5.0
+
+
+class ConfigChange:
+    def __init__(self, *, added: List[Context], removed: List[Context]) -> None:
+        self.added = added
+        self.removed = removed
+
+    def __repr__(self) -> str:
+        return "<%s added=%r, removed=%r>" % (
+            self.__class__.__name__,
+            [context.name for context in self.added],
+            [context.name for context in self.removed],
+        )
+
+
+class KubeConfigWatcher:
+    """Keeps the collection of a selector up to date on a thread of its own,
+    and calls on_change (on that thread) with what changed"""
+
+    def __init__(
+        self,
+        *,
+        loader: KubeConfigLoader,
+        selector: KubeConfigSelector,
+        on_change: Optional[Callable[[ConfigChange], None]] = None,
+        poll_interval: float = POLL_INTERVAL,
+        logger=None,
+    ) -> None:
+        self.loader = loader
+        self.selector = selector
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger("config-watcher")
+
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return "<%s paths=%r, is_running=%r>" % (
+            self.__class__.__name__,
+            self.loader.get_watch_paths(),
+            self.thread is not None and self.thread.is_alive(),
+        )
+
+    def start(self) -> None:
+        self.thread = threading.Thread(
+            target=self.run, name="ConfigWatcher", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+        if self.thread is not None:
+            self.thread.join()
+
+    def run(self) -> None:
+        if inotify.is_supported():
+            self.run_inotify()
+        else:
+            self.run_polling()
+
+    def run_polling(self) -> None:
+        self.logger.info(
+            "Polling for kube config changes every %ss", self.poll_interval
+        )
+
+        while not self.stopped.wait(self.poll_interval):
+            self.reload()
+
+    def run_inotify(self) -> None:
+        notifier = inotify.Inotify()
+
+        try:
+            for path in self.loader.get_watch_paths():
+                try:
+                    notifier.add_watch(path)
+                except OSError as exc:
+                    self.logger.warn("Cannot watch %s for changes: %r", path, exc)
+
+            self.logger.info("Watching %r for kube config changes", notifier)
+
+            # catch up with changes made since the selector was loaded
+            self.reload()
+
+            while not self.stopped.is_set():
+                # wake up regularly to notice when we are stopped
+                events = notifier.read_events(timeout=1.0)
+                if not events:
+                    continue
+
+                # let a burst of changes settle before reloading once
+                while events and not self.stopped.is_set():
+                    events = notifier.read_events(timeout=DEBOUNCE_DELAY)
+
+                self.reload()
+
+        finally:
+            notifier.close()
+
+    def reload(self) -> Optional[ConfigChange]:
+        "Returns what changed, if anything"
+
+        try:
+            collection = self.loader.create_collection()
+        except Exception:
+            self.logger.exception("Failed to reload kube configs")
+            return None
+
+        # unchanged contexts are the same objects
+        previous = set(self.selector.collection.contexts.values())
+        current = set(collection.contexts.values())
+
+        if previous == current:
+            return None
+
+        change = ConfigChange(
+            added=sorted(current - previous, key=lambda ctx: ctx.name),
+            removed=sorted(previous - current, key=lambda ctx: ctx.name),
+        )
+        self.selector.collection = collection
+        self.logger.info("Kube configs changed: %r", change)
+
+        if self.on_change is not None:
+            try:
+                self.on_change(change)
+            except Exception:
+                self.logger.exception("Failed to apply kube config change")
+
+        return change
+
+
+def watch_configs(
+    *,
+    selector: KubeConfigSelector,
+    on_change: Optional[Callable[[ConfigChange], None]] = None,
+) -> KubeConfigWatcher:
+    "Starts a watcher for the configs that get_selector() loads from"
+
+    watcher = KubeConfigWatcher(
+        loader=KubeConfigLoader(), selector=selector, on_change=on_change
+    )
+    watcher.start()
+    return watcher
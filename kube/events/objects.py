@@ -1,8 +1,10 @@
 import enum
 import time
-from typing import Any
+from typing import Any, Optional
 
 from kube.config import Context
+from kube.model.object_model.base import ObjectWrapper
+from kube.model.object_model.wrap import wrap_object
 
 
 class Action(enum.Enum):
@@ -11,11 +13,119 @@ class Action(enum.Enum):
     DELETED = "DELETED"
     LISTED = "LISTED"
 
+    # not objects: the watch feeding the channel failed and is being restarted
+    # (object is the error), or it is running again (object is None)
+    DEGRADED = "DEGRADED"
+    RECOVERED = "RECOVERED"
+
 
 class ObjectEvent:
-    def __init__(self, *, context: Context, action: Action, object: Any) -> None:
-        self.context = context
-        self.action = action
-        self.object = object
+    """
+    An immutable record of a change to an object, or to the watch of a
+    cluster (see Action).
+
+    Events are created at high rates during rollouts, so they are kept small
+    and cheap to create: the fields are slots behind read-only properties, and
+    the uid and resourceVersion are pulled out of the object once, here.
+    `time_received` is monotonic, for measuring latencies, `time_created` is
+    the wall clock time, for display.
+    """
+
+    __slots__ = (
+        "_context",
+        "_action",
+        "_object",
+        "_uid",
+        "_resource_version",
+        "_time_received",
+        "_time_created",
+        "_wrapper",
+    )
+
+    def __init__(
+        self,
+        *,
+        context: Context,
+        action: Action,
+        object: Any,
+        time_received: Optional[float] = None,
+        time_created: Optional[float] = None,
+    ) -> None:
+        self._context = context
+        self._action = action
+        self._object = object
+
+        meta = object.get("metadata") if type(object) is dict else None
+        if meta:
+            self._uid: Optional[str] = meta.get("uid")
+            self._resource_version: Optional[str] = meta.get("resourceVersion")
+        else:
+            self._uid = self._resource_version = None
+
+        if time_received is None:
+            time_received = time.monotonic()
+        if time_created is None:
+            time_created = time.time()
+        self._time_received = time_received
+        self._time_created = time_created
+
+        self._wrapper: Optional[ObjectWrapper] = None
+
+    def __repr__(self) -> str:
+        return "<%s context=%r, action=%r, uid=%r, resource_version=%r>" % (
+            self.__class__.__name__,
+            self.context.short_name,
+            self._action.value,
+            self._uid,
+            self._resource_version,
+        )
+
+    @property
+    def context(self) -> Context:
+        return self._context
+
+    @property
+    def action(self) -> Action:
+        return self._action
+
+    @property
+    def object(self) -> Any:
+        return self._object
+
+    @property
+    def uid(self) -> Optional[str]:
+        return self._uid
+
+    @property
+    def resource_version(self) -> Optional[str]:
+        return self._resource_version
+
+    @property
+    def time_received(self) -> float:
+        return self._time_received
+
+    @property
+    def time_created(self) -> float:
+        return self._time_created
+
+    @property
+    def wrapper(self) -> Optional[ObjectWrapper]:
+        """The object wrapped according to its kind, built once on first access
+        so that every consumer of the event shares it. None for status events
+        and kinds without a wrapper."""
+
+        if self._wrapper is None and type(self._object) is dict:
+            self._wrapper = wrap_object(self._object)
+
+        return self._wrapper
+
+    def with_object(self, obj: Any) -> "ObjectEvent":
+        "Returns a copy of the event for a different object, eg. a projected one"
 
-        self.time_created = time.time()
+        return ObjectEvent(
+            context=self._context,
+            action=self._action,
+            object=obj,
+            time_received=self._time_received,
+            time_created=self._time_created,
+        )
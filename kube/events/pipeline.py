@@ -0,0 +1,119 @@
+"""
+Middleware for object events.
+
+A pipeline runs every event through a list of middlewares as it is sent,
+which happens on the event loop thread, before the event enters a channel.
+Each middleware returns the event to pass it on, or None to drop it. That way
+the work of projecting, wrapping and filtering events is done by the time
+they reach the consumer, whose thread only has to apply them.
+
+Status events (DEGRADED, RECOVERED) are not objects and pass through the
+stages below untouched.
+"""
+
+import logging
+from typing import Callable, Optional, Sequence
+
+from kube.events.objects import ObjectEvent
+from kube.model.projection import Projection
+
+Middleware = Callable[[ObjectEvent], Optional[ObjectEvent]]
+
+
+class EventPipeline:
+    def __init__(self, middlewares: Sequence[Middleware], logger=None) -> None:
+        self.middlewares = list(middlewares)
+        self.logger = logger or logging.getLogger("pipeline")
+
+    def __repr__(self) -> str:
+        return "<%s middlewares=%r>" % (
+            self.__class__.__name__,
+            [getattr(mw, "__name__", mw) for mw in self.middlewares],
+        )
+
+    def process(self, event: ObjectEvent) -> Optional[ObjectEvent]:
+        "Returns the event to send, or None if it was dropped"
+
+        for middleware in self.middlewares:
+            # a bad event should not take down the watch that sent it
+            try:
+                result = middleware(event)
+            except Exception:
+                self.logger.exception("Dropping event that %r failed on", middleware)
+                return None
+
+            if result is None:
+                return None
+            event = result
+
+        return event
+
+
+def is_object_event(event: ObjectEvent) -> bool:
+    return isinstance(event.object, dict)
+
+
+def project_events(projection: Projection) -> Middleware:
+    "Trims the raw object, must come before anything that wraps it"
+
+    def project_event(event: ObjectEvent) -> Optional[ObjectEvent]:
+        if not is_object_event(event):
+            return event
+
+        return event.with_object(projection.apply(event.object))
+
+    return project_event
+
+
+def decode_events(event: ObjectEvent) -> Optional[ObjectEvent]:
+    "Builds the event's wrapper, so that every later stage shares it"
+
+    event.wrapper  # built and cached on access
+    return event
+
+
+def filter_events(predicate: Callable[[ObjectEvent], bool]) -> Middleware:
+    def filter_event(event: ObjectEvent) -> Optional[ObjectEvent]:
+        if not is_object_event(event):
+            return event
+
+        return event if predicate(event) else None
+
+    return filter_event
+
+
+def enrich_events(func: Callable[[ObjectEvent], None]) -> Middleware:
+    """Calls func on every object event, eg. to read the fields of the
+    wrapper that the consumer needs, which parses and caches them"""
+
+    def enrich_event(event: ObjectEvent) -> Optional[ObjectEvent]:
+        if is_object_event(event):
+            func(event)
+
+        return event
+
+    return enrich_event
+
+
+def create_pipeline(
+    *,
+    projection: Optional[Projection] = None,
+    predicate: Optional[Callable[[ObjectEvent], bool]] = None,
+    enricher: Optional[Callable[[ObjectEvent], None]] = None,
+) -> EventPipeline:
+    "The stages in the order they need to run in: project, decode, filter, enrich"
+
+    middlewares = []
+
+    if projection is not None:
+        middlewares.append(project_events(projection))
+
+    middlewares.append(decode_events)
+
+    if predicate is not None:
+        middlewares.append(filter_events(predicate))
+
+    if enricher is not None:
+        middlewares.append(enrich_events(enricher))
+
+    return EventPipeline(middlewares)
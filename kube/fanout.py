@@ -0,0 +1,369 @@
+"""
+Queries that fan out over many clusters at once.
+
+Each cluster is queried concurrently, up to a limit, and each gets its own
+timeout. Results are returned per cluster as soon as they complete, so a slow
+or unreachable cluster holds up nobody but itself. Clusters that fail or time
+out are reported as such instead of raising, and when they are to be watched,
+queried again until they come back.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from kube.async_loop import AsyncLoop
+from kube.channels.objects import OEvSender
+from kube.cluster_facade import AsyncClusterFacade
+from kube.config import Context
+from kube.events.objects import Action, ObjectEvent
+from kube.model.selector import ObjectSelector
+
+T = TypeVar("T")
+
+# decides which selectors to query on a cluster, eg. after matching namespaces
+SelectorsFunc = Callable[[AsyncClusterFacade], Awaitable[List[ObjectSelector]]]
+
+MAX_CONCURRENCY = 10
+CLUSTER_TIMEOUT = 20.0
+
+# delay before querying a failed cluster again, doubled for every consecutive
+# failure
+CLUSTER_RETRY_DELAY_MIN = 1.0
+CLUSTER_RETRY_DELAY_MAX = 60.0
+
+
+class ClusterTimeoutError(Exception):
+    pass
+
+
+class ClusterResult(Generic[T]):
+    "The outcome of a query on one cluster: either a value or an error"
+
+    def __init__(
+        self,
+        *,
+        context: Context,
+        elapsed: float,
+        value: Optional[T] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        self.context = context
+        self.elapsed = elapsed
+        self.value = value
+        self.error = error
+
+    def __repr__(self) -> str:
+        return "<%s context=%r, elapsed=%.2f, error=%r>" % (
+            self.__class__.__name__,
+            self.context.short_name,
+            self.elapsed,
+            self.error,
+        )
+
+    @property
+    def is_ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def is_timed_out(self) -> bool:
+        return isinstance(self.error, ClusterTimeoutError)
+
+
+def get_creation_timestamp(event: ObjectEvent) -> str:
+    # timestamps are always in UTC with the same format, so they sort as
+    # strings
+    return event.object["metadata"].get("creationTimestamp") or ""
+
+
+class FanOutQuery:
+    def __init__(
+        self,
+        *,
+        async_loop: AsyncLoop,
+        contexts: List[Context],
+        max_concurrency: int = MAX_CONCURRENCY,
+        cluster_timeout: float = CLUSTER_TIMEOUT,
+        logger=None,
+    ) -> None:
+        self.async_loop = async_loop
+        self.contexts = contexts
+        self.max_concurrency = max_concurrency
+        self.cluster_timeout = cluster_timeout
+        self.logger = logger or logging.getLogger("fanout")
+
+        # the clusters being queried again, owned by list_then_watch()
+        self.retry_tasks: Set[asyncio.Task] = set()
+
+    def __repr__(self) -> str:
+        return "<%s contexts=%r, max_concurrency=%r, cluster_timeout=%r>" % (
+            self.__class__.__name__,
+            len(self.contexts),
+            self.max_concurrency,
+            self.cluster_timeout,
+        )
+
+    async def run_one(
+        self,
+        context: Context,
+        func: Callable[[AsyncClusterFacade], Awaitable[T]],
+        semaphore: asyncio.Semaphore,
+    ) -> ClusterResult[T]:
+        facade = AsyncClusterFacade(async_loop=self.async_loop, context=context)
+
+        async with semaphore:
+            # the timeout does not include the time spent waiting for our turn
+            start = time.monotonic()
+
+            try:
+                value = await asyncio.wait_for(func(facade), self.cluster_timeout)
+                result = ClusterResult(
+                    context=context, elapsed=time.monotonic() - start, value=value
+                )
+
+            except asyncio.TimeoutError:
+                error = ClusterTimeoutError(
+                    "No response within %ss" % self.cluster_timeout
+                )
+                result = ClusterResult(
+                    context=context, elapsed=time.monotonic() - start, error=error
+                )
+
+            except Exception as exc:
+                result = ClusterResult(
+                    context=context, elapsed=time.monotonic() - start, error=exc
+                )
+
+        if result.is_ok:
+            self.logger.info(
+                "Query on %s completed in %.2fs", context.short_name, result.elapsed
+            )
+        else:
+            self.logger.warn(
+                "Query on %s failed after %.2fs: %r",
+                context.short_name,
+                result.elapsed,
+                result.error,
+            )
+
+        return result
+
+    async def run(
+        self, func: Callable[[AsyncClusterFacade], Awaitable[T]]
+    ) -> AsyncIterator[ClusterResult[T]]:
+        "Calls func on every cluster, yields the results in order of completion"
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = self.async_loop.get_loop()
+
+        tasks = [
+            loop.create_task(self.run_one(context, func, semaphore))
+            for context in self.contexts
+        ]
+
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+
+        finally:
+            # the consumer stopped early
+            for task in tasks:
+                task.cancel()
+
+    async def list_objects(
+        self, *, selector: ObjectSelector, merge: bool = False
+    ) -> AsyncIterator[ObjectEvent]:
+        """
+        Yields the objects of every cluster as LISTED events, one cluster at a
+        time as they complete. With `merge` the objects of all the clusters are
+        yielded in order of creationTimestamp instead, which means waiting for
+        the slowest cluster first.
+
+        Failed clusters are reported as DEGRADED events carrying the error.
+        """
+
+        async def list_cluster(facade: AsyncClusterFacade) -> List[Any]:
+            return await facade.list_objects(selector=selector)
+
+        runs: List[List[ObjectEvent]] = []
+
+        async for result in self.run(list_cluster):
+            if not result.is_ok:
+                yield ObjectEvent(
+                    context=result.context, action=Action.DEGRADED, object=result.error
+                )
+                continue
+
+            assert result.value is not None  # help mypy
+            events = [
+                ObjectEvent(context=result.context, action=Action.LISTED, object=item)
+                for item in result.value
+            ]
+
+            if not merge:
+                for event in events:
+                    yield event
+                continue
+
+            events.sort(key=get_creation_timestamp)
+            runs.append(events)
+
+        for event in heapq.merge(*runs, key=get_creation_timestamp):
+            yield event
+
+    async def list_then_watch(
+        self,
+        *,
+        get_selectors: SelectorsFunc,
+        oev_sender: OEvSender,
+        emit_listed: bool = True,
+    ) -> List[ClusterResult]:
+        """
+        Lists and then watches the selectors returned by get_selectors on every
+        cluster, sending all the events to oev_sender. Each cluster's watches
+        start as soon as its lists complete. The timeout applies to
+        get_selectors and the lists, not to the watches.
+
+        With `emit_listed=False` the lists only serve to skip the watch past
+        existing objects. Failed clusters are reported as DEGRADED events
+        carrying the error, and in the results. They are queried again in the
+        background, backing off like a failed watch, and reported as RECOVERED
+        once their watches start. We return only once they have, so cancelling
+        the call also cancels the retries.
+        """
+
+        async def list_cluster(
+            facade: AsyncClusterFacade,
+        ) -> List[Tuple[ObjectSelector, List[Any]]]:
+            selectors = await get_selectors(facade)
+
+            coros = [facade.list_objects(selector=selector) for selector in selectors]
+            lists = await asyncio.gather(*coros)
+
+            return list(zip(selectors, lists))
+
+        results = []
+        loop = self.async_loop.get_loop()
+
+        try:
+            async for result in self.run(list_cluster):
+                results.append(result)
+
+                if not result.is_ok:
+                    event = ObjectEvent(
+                        context=result.context,
+                        action=Action.DEGRADED,
+                        object=result.error,
+                    )
+                    oev_sender.send(event)
+
+                    coro = self.retry_cluster(
+                        result.context, list_cluster, oev_sender, emit_listed
+                    )
+                    task = loop.create_task(coro)
+                    self.retry_tasks.add(task)
+                    task.add_done_callback(self.retry_tasks.discard)
+                    continue
+
+                await self.start_watches(result, oev_sender, emit_listed)
+
+            self.log_summary(results)
+
+            if self.retry_tasks:
+                await asyncio.gather(*self.retry_tasks)
+
+        finally:
+            # we were cancelled or failed, the retries must not outlive us and
+            # start watches nobody is waiting for
+            for task in list(self.retry_tasks):
+                task.cancel()
+
+        return results
+
+    async def start_watches(
+        self,
+        result: ClusterResult[List[Tuple[ObjectSelector, List[Any]]]],
+        oev_sender: OEvSender,
+        emit_listed: bool,
+    ) -> None:
+        assert result.value is not None  # help mypy
+        cluster_loop = await self.async_loop.get_cluster_loop(result.context)
+
+        for selector, items in result.value:
+            if emit_listed:
+                for item in items:
+                    event = ObjectEvent(
+                        context=result.context, action=Action.LISTED, object=item
+                    )
+                    oev_sender.send(event)
+
+            await cluster_loop.start_watch(selector, oev_sender)
+
+    async def retry_cluster(
+        self,
+        context: Context,
+        list_cluster: Callable[
+            [AsyncClusterFacade], Awaitable[List[Tuple[ObjectSelector, List[Any]]]]
+        ],
+        oev_sender: OEvSender,
+        emit_listed: bool,
+    ) -> None:
+        "Queries a failed cluster again until it succeeds, then watches it"
+
+        result = await self.retry_until_ok(context, list_cluster)
+        await self.start_watches(result, oev_sender, emit_listed)
+
+        event = ObjectEvent(context=context, action=Action.RECOVERED, object=None)
+        oev_sender.send(event)
+
+    async def retry_until_ok(
+        self, context: Context, func: Callable[[AsyncClusterFacade], Awaitable[T]]
+    ) -> ClusterResult[T]:
+        "Calls func on a failed cluster again, backing off, until it succeeds"
+
+        # the cluster is alone in its query now
+        semaphore = asyncio.Semaphore(1)
+        retries = 0
+
+        while True:
+            delay = min(
+                CLUSTER_RETRY_DELAY_MIN * 2 ** min(retries, 10),
+                CLUSTER_RETRY_DELAY_MAX,
+            )
+            retries += 1
+
+            self.logger.info("Querying %s again in %.0fs", context.short_name, delay)
+            await asyncio.sleep(delay)
+
+            result = await self.run_one(context, func, semaphore)
+            if result.is_ok:
+                return result
+
+    def log_summary(self, results: List[ClusterResult]) -> None:
+        failed = [result for result in results if not result.is_ok]
+        succeeded = [result for result in results if result.is_ok]
+
+        slowest = None
+        if succeeded:
+            slowest = max(succeeded, key=lambda result: result.elapsed)
+
+        self.logger.info(
+            "Queried %s clusters: %s succeeded, %s failed, slowest: %r",
+            len(results),
+            len(succeeded),
+            len(failed),
+            slowest,
+        )
@@ -0,0 +1,110 @@
+import enum
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+
+class WatchState(enum.Enum):
+    # waiting for the response to the first request
+    CONNECTING = "connecting"
+    # a request is streaming events
+    CONNECTED = "connected"
+    # a request ended and we are making the next one
+    RECONNECTING = "reconnecting"
+    # the watch gave up and is waiting to be restarted
+    FAILED = "failed"
+
+
+class WatchMetrics:
+    """Counters and state for a single watch, across all the requests made to
+    keep it running. Latencies are measured with the monotonic clock, state
+    changes are timestamped with the wall clock."""
+
+    def __init__(self, *, max_samples: int = 100) -> None:
+        # number of requests that got a response from the server
+        self.connects = 0
+        # number of requests we abandoned because no bytes arrived in time
+        self.stalls = 0
+
+        # when the last request ended, None while connected
+        self.time_disconnected: Optional[float] = None
+        # seconds from the end of one request to the response of the next one
+        self.reconnect_latencies: Deque[float] = deque(maxlen=max_samples)
+
+        # number of times the watch gave up, and why it did the last time
+        self.failures = 0
+        self.last_error: Optional[Exception] = None
+
+        self.state = WatchState.CONNECTING
+        self.time_state_changed = time.time()
+
+        # called with (metrics, previous state) on every state change
+        self.on_state_change: Optional[Callable[["WatchMetrics", WatchState], None]] = (
+            None
+        )
+
+    def __repr__(self) -> str:
+        return (
+            "<%s state=%r, connects=%r, stalls=%r, failures=%r, "
+            "reconnect_latency_last=%r, reconnect_latency_max=%r>"
+        ) % (
+            self.__class__.__name__,
+            self.state.value,
+            self.connects,
+            self.stalls,
+            self.failures,
+            self.reconnect_latency_last,
+            self.reconnect_latency_max,
+        )
+
+    @property
+    def reconnect_latency_last(self) -> Optional[float]:
+        if not self.reconnect_latencies:
+            return None
+
+        return self.reconnect_latencies[-1]
+
+    @property
+    def reconnect_latency_max(self) -> Optional[float]:
+        if not self.reconnect_latencies:
+            return None
+
+        return max(self.reconnect_latencies)
+
+    def set_state(self, state: WatchState) -> None:
+        if state is self.state:
+            return
+
+        previous = self.state
+        self.state = state
+        self.time_state_changed = time.time()
+
+        if self.on_state_change is not None:
+            self.on_state_change(self, previous)
+
+    def on_connected(self) -> None:
+        self.connects += 1
+
+        if self.time_disconnected is not None:
+            latency = time.monotonic() - self.time_disconnected
+            self.reconnect_latencies.append(latency)
+            self.time_disconnected = None
+
+        self.set_state(WatchState.CONNECTED)
+
+    def on_disconnected(self) -> None:
+        # if we were already disconnected then keep the original time, so that
+        # failed attempts to reconnect count towards the latency
+        if self.time_disconnected is None:
+            self.time_disconnected = time.monotonic()
+
+        self.set_state(WatchState.RECONNECTING)
+
+    def on_stalled(self) -> None:
+        self.stalls += 1
+
+    def on_failed(self, exc: Exception) -> None:
+        self.failures += 1
+        self.last_error = exc
+
+        self.set_state(WatchState.FAILED)
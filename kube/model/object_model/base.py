@@ -1,22 +1,41 @@
-from typing import Any, Dict, Optional, Type
+from typing import Optional, Type
 
+from kube.model.object_model.helpers import cached_slot
 from kube.model.object_model.meta import ObjectMeta
 from kube.model.object_model.status import ObjectStatus
 from kube.model.object_model.types import RawObject
 
 
 class ObjectWrapper:
+    """
+    Wraps a raw object without copying or parsing it. Fields are parsed on
+    first access and cached, so a wrapper is cheap to create and only pays for
+    the fields that are read.
+    """
+
+    __slots__ = ("_obj", "_meta", "_status")
+
     _meta_cls = ObjectMeta
     _status_cls: Optional[Type[ObjectStatus]] = None
 
     def __init__(self, obj: RawObject) -> None:
-        self.apiVersion: str = obj["apiVersion"]
-        self.kind: str = obj["kind"]
+        self._obj = obj
 
         # make sure we are wrapping what we think we're wrapping
-        assert self.kind == self.__class__.__name__
+        assert obj["kind"] == self.__class__.__name__
+
+    @property
+    def apiVersion(self) -> str:
+        return self._obj["apiVersion"]
+
+    @property
+    def kind(self) -> str:
+        return self._obj["kind"]
+
+    @cached_slot
+    def meta(self) -> ObjectMeta:
+        return self._meta_cls(self._obj)
 
-        self.meta: ObjectMeta = self._meta_cls(obj)
-        self.status: Optional[ObjectStatus] = (
-            self._status_cls(obj) if self._status_cls else None
-        )
+    @cached_slot
+    def status(self) -> Optional[ObjectStatus]:
+        return self._status_cls(self._obj) if self._status_cls else None
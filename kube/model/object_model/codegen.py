@@ -0,0 +1,523 @@
+"""
+Generates lazy wrappers from the OpenAPI v3 documents that the API server
+publishes under /openapi/v3.
+
+Every kind becomes an ObjectWrapper subclass and every object schema it refers
+to becomes a wrapper class of its own, with `__slots__` and fields that are
+only read (and for timestamps and nested objects, parsed and cached) on first
+access, like the hand-written wrappers of Pod and Namespace.
+
+Nesting is limited to `max_depth` levels below the kind, deeper objects are
+returned as raw dicts. Types that don't map onto a wrapper (IntOrString,
+Quantity, JSONSchemaProps and the like) are returned raw too.
+
+See bin/genwrappers.py.
+"""
+
+import keyword
+import re
+import textwrap
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+REF_PREFIX = "#/components/schemas/"
+
+META = "io.k8s.apimachinery.pkg.apis.meta.v1."
+APIEXTENSIONS = "io.k8s.apiextensions-apiserver.pkg.apis.apiextensions.v1."
+
+# kept in the raw because they are not objects, or not structured ones
+RAW_SCHEMAS = {
+    "io.k8s.apimachinery.pkg.util.intstr.IntOrString",
+    "io.k8s.apimachinery.pkg.api.resource.Quantity",
+    "io.k8s.apimachinery.pkg.runtime.RawExtension",
+    APIEXTENSIONS + "JSON",
+    APIEXTENSIONS + "JSONSchemaProps",
+    APIEXTENSIONS + "JSONSchemaPropsOrArray",
+    APIEXTENSIONS + "JSONSchemaPropsOrBool",
+    APIEXTENSIONS + "JSONSchemaPropsOrStringArray",
+    META + "FieldsV1",
+    # the metadata of a kind has its own wrapper, nested ones (in pod
+    # templates) are left alone
+    META + "ObjectMeta",
+}
+
+DATE_SCHEMAS = {META + "Time", META + "MicroTime"}
+
+# the fields that ObjectWrapper already covers
+KIND_FIELDS = {"apiVersion", "kind", "metadata"}
+
+SCALAR_TYPES = {
+    "string": "str",
+    "integer": "int",
+    "number": "float",
+    "boolean": "bool",
+}
+
+HEADER = """\
+# Generated by bin/genwrappers.py from the OpenAPI v3 schemas, do not edit.
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+
+from kube.model.object_model.base import ObjectWrapper
+from kube.model.object_model.helpers import cached_slot, maybe_parse_date
+from kube.model.object_model.meta import NamespacedMeta, ObjectMeta
+from kube.model.object_model.types import KindKey, RawObject
+"""
+
+
+class WrapperTarget:
+    "A kind to generate a wrapper for, by its schema name"
+
+    def __init__(self, schema_name: str, *, namespaced: bool) -> None:
+        self.schema_name = schema_name
+        self.namespaced = namespaced
+
+    def __repr__(self) -> str:
+        return "<%s schema_name=%r, namespaced=%r>" % (
+            self.__class__.__name__,
+            self.schema_name,
+            self.namespaced,
+        )
+
+
+DEFAULT_TARGETS = [
+    WrapperTarget("io.k8s.api.apps.v1.Deployment", namespaced=True),
+    WrapperTarget("io.k8s.api.apps.v1.ReplicaSet", namespaced=True),
+    WrapperTarget("io.k8s.api.core.v1.Event", namespaced=True),
+    WrapperTarget("io.k8s.api.core.v1.Node", namespaced=False),
+    WrapperTarget("io.k8s.api.core.v1.Service", namespaced=True),
+    WrapperTarget(APIEXTENSIONS + "CustomResourceDefinition", namespaced=False),
+]
+
+# the documents that DEFAULT_TARGETS are found in
+DEFAULT_GROUP_VERSIONS = ["api/v1", "apis/apps/v1", "apis/apiextensions.k8s.io/v1"]
+
+
+def load_schemas(documents: Iterable[Any]) -> Dict[str, Any]:
+    "Merges the schemas of several documents, eg. one per group version"
+
+    schemas: Dict[str, Any] = {}
+    for document in documents:
+        schemas.update(document.get("components", {}).get("schemas", {}))
+
+    return schemas
+
+
+def get_kind_keys(schema: Dict[str, Any]) -> List[Tuple[str, str]]:
+    "Returns the (apiVersion, kind) of the objects of a schema"
+
+    keys = []
+    for gvk in schema.get("x-kubernetes-group-version-kind", []):
+        group = gvk.get("group")
+        api_version = "%s/%s" % (group, gvk["version"]) if group else gvk["version"]
+        keys.append((api_version, gvk["kind"]))
+
+    return keys
+
+
+def get_ref(prop: Dict[str, Any]) -> Optional[str]:
+    "Returns the schema name a property refers to, directly or with allOf"
+
+    ref = prop.get("$ref")
+    if ref is None and len(prop.get("allOf", [])) == 1:
+        ref = prop["allOf"][0].get("$ref")
+
+    if ref is None:
+        return None
+
+    assert ref.startswith(REF_PREFIX), ref
+    return ref[len(REF_PREFIX) :]
+
+
+def to_identifier(name: str) -> str:
+    ident = re.sub(r"\W", "_", name.lstrip("$"))
+
+    if not ident or ident[0].isdigit():
+        ident = "_" + ident
+
+    if keyword.iskeyword(ident):
+        ident += "_"
+
+    return ident
+
+
+def first_sentence(description: str) -> str:
+    sentence = description.strip().split("\n")[0]
+
+    match = re.match(r"(.+?\.)(\s|$)", sentence)
+    if match:
+        sentence = match.group(1)
+
+    return sentence.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class Field:
+    """How a property is exposed on a wrapper. `shape` is one of scalar, date,
+    wrapper, wrapper_list, list, dict"""
+
+    def __init__(
+        self,
+        *,
+        key: str,
+        shape: str,
+        type: str,
+        required: bool,
+        schema_name: Optional[str] = None,
+    ) -> None:
+        self.key = key
+        self.attr = to_identifier(key)
+        self.shape = shape
+        self.type = type
+        self.required = required
+        self.schema_name = schema_name
+
+    def __repr__(self) -> str:
+        return "<%s key=%r, shape=%r, type=%r, required=%r>" % (
+            self.__class__.__name__,
+            self.key,
+            self.shape,
+            self.type,
+            self.required,
+        )
+
+    @property
+    def is_cached(self) -> bool:
+        return self.shape in ("date", "wrapper", "wrapper_list")
+
+
+class Generator:
+    def __init__(self, schemas: Dict[str, Any], *, max_depth: int = 5) -> None:
+        self.schemas = schemas
+        self.max_depth = max_depth
+
+        # the schemas we generate a class for, and their class names
+        self.class_names: Dict[str, str] = {}
+        # the shallowest depth each schema is reached at
+        self.depths: Dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        return "<%s schemas=%r, max_depth=%r>" % (
+            self.__class__.__name__,
+            len(self.schemas),
+            self.max_depth,
+        )
+
+    def is_wrappable(self, schema_name: str) -> bool:
+        if schema_name in RAW_SCHEMAS or schema_name in DATE_SCHEMAS:
+            return False
+
+        schema = self.schemas.get(schema_name)
+        return bool(schema and schema.get("properties"))
+
+    def scalar_type(self, prop: Dict[str, Any]) -> str:
+        schema_name = get_ref(prop)
+        if schema_name is not None:
+            if schema_name in DATE_SCHEMAS:
+                return "str"
+            prop = self.schemas.get(schema_name, {})
+
+        if prop.get("type") in SCALAR_TYPES and prop.get("format") != "int-or-string":
+            return SCALAR_TYPES[prop["type"]]
+
+        if prop.get("type") == "object":
+            return "Dict[str, Any]"
+
+        return "Any"
+
+    def classify(
+        self, key: str, prop: Dict[str, Any], depth: int, required: bool
+    ) -> Field:
+        schema_name = get_ref(prop)
+
+        if schema_name in DATE_SCHEMAS or prop.get("format") == "date-time":
+            return Field(key=key, shape="date", type="datetime", required=required)
+
+        if schema_name is not None:
+            if self.is_wrappable(schema_name) and depth <= self.max_depth:
+                return Field(
+                    key=key,
+                    shape="wrapper",
+                    type=schema_name,
+                    required=required,
+                    schema_name=schema_name,
+                )
+
+            return Field(
+                key=key, shape="scalar", type=self.scalar_type(prop), required=required
+            )
+
+        if prop.get("type") == "array":
+            items = prop.get("items", {})
+            item_schema = get_ref(items)
+
+            if (
+                item_schema is not None
+                and self.is_wrappable(item_schema)
+                and depth <= self.max_depth
+            ):
+                return Field(
+                    key=key,
+                    shape="wrapper_list",
+                    type=item_schema,
+                    required=required,
+                    schema_name=item_schema,
+                )
+
+            item_type = self.scalar_type(items)
+            return Field(
+                key=key, shape="list", type="List[%s]" % item_type, required=required
+            )
+
+        if prop.get("type") == "object" and "additionalProperties" in prop:
+            value_type = self.scalar_type(prop["additionalProperties"])
+            return Field(
+                key=key,
+                shape="dict",
+                type="Dict[str, %s]" % value_type,
+                required=required,
+            )
+
+        return Field(
+            key=key, shape="scalar", type=self.scalar_type(prop), required=required
+        )
+
+    def get_fields(self, schema_name: str, depth: int) -> List[Field]:
+        schema = self.schemas[schema_name]
+        required = set(schema.get("required", []))
+
+        return [
+            self.classify(key, prop, depth + 1, key in required)
+            for key, prop in sorted(schema.get("properties", {}).items())
+        ]
+
+    def assign_class_names(self, targets: List[WrapperTarget]) -> None:
+        # kinds keep their names, ObjectWrapper checks them against the kind
+        for target in targets:
+            self.class_names[target.schema_name] = target.schema_name.split(".")[-1]
+            self.depths[target.schema_name] = 0
+
+        # breadth first, so that each schema gets the shallowest depth
+        queue: Deque[Tuple[str, int]] = deque(
+            (target.schema_name, 0) for target in targets
+        )
+
+        while queue:
+            schema_name, depth = queue.popleft()
+
+            for field in self.get_fields(schema_name, depth):
+                if field.schema_name is None or field.schema_name in self.depths:
+                    continue
+
+                self.depths[field.schema_name] = depth + 1
+                self.class_names[field.schema_name] = self.unique_class_name(
+                    field.schema_name
+                )
+                queue.append((field.schema_name, depth + 1))
+
+    def unique_class_name(self, schema_name: str) -> str:
+        # eg. io.k8s.api.core.v1.EventSeries -> EventSeries, or V1EventSeries
+        # if that is taken
+        parts = [part for part in schema_name.split(".") if part]
+        taken = set(self.class_names.values())
+
+        for count in range(1, len(parts) + 1):
+            prefix = parts[-count:-1]
+            name = "".join(to_identifier(part).capitalize() for part in prefix)
+            name += parts[-1]
+            if name not in taken:
+                return name
+
+        raise ValueError("Cannot name a class for %r" % schema_name)
+
+    def annotation(self, field: Field, defined: Set[str]) -> str:
+        if field.schema_name is not None:
+            class_name = self.class_names[field.schema_name]
+            if field.schema_name not in defined:
+                class_name = '"%s"' % class_name
+
+            if field.shape == "wrapper_list":
+                return "List[%s]" % class_name
+            if field.required:
+                return class_name
+            return "Optional[%s]" % class_name
+
+        if field.shape in ("list", "dict") or field.required:
+            return field.type
+
+        return "Optional[%s]" % field.type
+
+    def render_field(self, field: Field, source: str, defined: Set[str]) -> List[str]:
+        annotation = self.annotation(field, defined)
+        decorator = "@cached_slot" if field.is_cached else "@property"
+        lines = [
+            "    %s" % decorator,
+            "    def %s(self) -> %s:" % (field.attr, annotation),
+        ]
+
+        get = "self.%s.get(%r)" % (source, field.key)
+        index = "self.%s[%r]" % (source, field.key)
+
+        if field.shape == "date":
+            lines.append("        return maybe_parse_date(%s)" % get)
+
+        elif field.shape == "wrapper":
+            class_name = self.class_names[field.schema_name or ""]
+            if field.required:
+                lines.append("        return %s(%s)" % (class_name, index))
+            else:
+                lines.append("        value = %s" % get)
+                lines.append(
+                    "        return %s(value) if value is not None else None"
+                    % class_name
+                )
+
+        elif field.shape == "wrapper_list":
+            class_name = self.class_names[field.schema_name or ""]
+            lines.append(
+                "        return [%s(item) for item in %s or []]" % (class_name, get)
+            )
+
+        elif field.shape == "list":
+            lines.append("        return %s or []" % get)
+
+        elif field.shape == "dict":
+            lines.append("        return %s or {}" % get)
+
+        elif field.required:
+            lines.append("        return %s" % index)
+
+        else:
+            lines.append("        return %s" % get)
+
+        return lines
+
+    def render_docstring(self, text: str) -> str:
+        line = '    "%s"' % text
+        if len(line) <= 88:
+            return line
+
+        text = textwrap.fill(
+            '"""%s"""' % text,
+            width=84,
+            initial_indent="    ",
+            subsequent_indent="    ",
+        )
+        return text
+
+    def render_slots(self, slots: List[str]) -> str:
+        if not slots:
+            return "    __slots__ = ()"
+
+        if len(slots) == 1:
+            return "    __slots__ = (%r,)" % slots[0]
+
+        line = "    __slots__ = (%s)" % ", ".join('"%s"' % slot for slot in slots)
+        if len(line) <= 88:
+            return line
+
+        inner = ["        %s," % ('"%s"' % slot) for slot in slots]
+        return "\n".join(["    __slots__ = ("] + inner + ["    )"])
+
+    def render_class(
+        self,
+        schema_name: str,
+        target: Optional[WrapperTarget],
+        defined: Set[str],
+    ) -> str:
+        schema = self.schemas[schema_name]
+        class_name = self.class_names[schema_name]
+        fields = self.get_fields(schema_name, self.depths[schema_name])
+
+        lines = []
+        if target is not None:
+            lines.append("class %s(ObjectWrapper):" % class_name)
+            fields = [field for field in fields if field.key not in KIND_FIELDS]
+        else:
+            lines.append("class %s:" % class_name)
+
+        description = first_sentence(schema.get("description", ""))
+        if description:
+            lines.append(self.render_docstring(description))
+            lines.append("")
+
+        slots = ["_" + field.attr for field in fields if field.is_cached]
+        if target is not None:
+            # ObjectWrapper declares these
+            slots = [slot for slot in slots if slot not in ("_obj", "_status")]
+        else:
+            slots.insert(0, "_obj")
+        lines.append(self.render_slots(slots))
+        lines.append("")
+
+        if target is not None:
+            meta_cls = "NamespacedMeta" if target.namespaced else "ObjectMeta"
+            lines.append("    _meta_cls = %s" % meta_cls)
+        else:
+            lines.append("    def __init__(self, obj: RawObject) -> None:")
+            lines.append("        self._obj = obj")
+
+        for field in fields:
+            lines.append("")
+            lines.extend(self.render_field(field, "_obj", defined))
+
+        return "\n".join(lines)
+
+    def emit_order(self, targets: List[WrapperTarget]) -> List[str]:
+        "Schema names in an order that defines classes before their users"
+
+        order: List[str] = []
+        visiting: Set[str] = set()
+
+        def visit(schema_name: str) -> None:
+            if schema_name in order or schema_name in visiting:
+                return
+
+            visiting.add(schema_name)
+            for field in self.get_fields(schema_name, self.depths[schema_name]):
+                if field.schema_name is not None:
+                    visit(field.schema_name)
+            visiting.discard(schema_name)
+
+            order.append(schema_name)
+
+        for target in targets:
+            visit(target.schema_name)
+
+        return order
+
+    def generate(self, targets: List[WrapperTarget]) -> str:
+        missing = [t.schema_name for t in targets if t.schema_name not in self.schemas]
+        if missing:
+            raise ValueError("No schemas for: %s" % ", ".join(missing))
+
+        # kinds of the same name in other groups are different objects
+        unversioned = [
+            t.schema_name
+            for t in targets
+            if not get_kind_keys(self.schemas[t.schema_name])
+        ]
+        if unversioned:
+            raise ValueError("No group version kind for: %s" % ", ".join(unversioned))
+
+        self.assign_class_names(targets)
+        targets_by_name = {target.schema_name: target for target in targets}
+
+        classes = []
+        defined: Set[str] = set()
+
+        for schema_name in self.emit_order(targets):
+            target = targets_by_name.get(schema_name)
+            classes.append(self.render_class(schema_name, target, defined))
+            defined.add(schema_name)
+
+        kinds = ["# the generated wrappers by apiVersion and kind"]
+        kinds.append("KINDS: Dict[KindKey, Type[ObjectWrapper]] = {")
+        for target in targets:
+            class_name = self.class_names[target.schema_name]
+            for api_version, kind in get_kind_keys(self.schemas[target.schema_name]):
+                kinds.append('    ("%s", "%s"): %s,' % (api_version, kind, class_name))
+        kinds.append("}")
+        classes.append("\n".join(kinds))
+
+        return HEADER + "".join("\n\n%s\n" % cls for cls in classes)
@@ -0,0 +1,1235 @@
+# Generated by bin/genwrappers.py from the OpenAPI v3 schemas, do not edit.
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+
+from kube.model.object_model.base import ObjectWrapper
+from kube.model.object_model.helpers import cached_slot, maybe_parse_date
+from kube.model.object_model.meta import NamespacedMeta, ObjectMeta
+from kube.model.object_model.types import KindKey, RawObject
+
+
+class LabelSelectorRequirement:
+    """A label selector requirement is a selector that contains values, a key, and
+    an operator that relates the key and values."""
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def key(self) -> str:
+        return self._obj["key"]
+
+    @property
+    def operator(self) -> str:
+        return self._obj["operator"]
+
+    @property
+    def values(self) -> List[str]:
+        return self._obj.get("values") or []
+
+
+class LabelSelector:
+    "A label selector is a label query over a set of resources."
+
+    __slots__ = ("_obj", "_matchExpressions")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def matchExpressions(self) -> List[LabelSelectorRequirement]:
+        return [
+            LabelSelectorRequirement(item)
+            for item in self._obj.get("matchExpressions") or []
+        ]
+
+    @property
+    def matchLabels(self) -> Dict[str, str]:
+        return self._obj.get("matchLabels") or {}
+
+
+class RollingUpdateDeployment:
+    "Spec to control the desired behavior of rolling update."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def maxSurge(self) -> Optional[Any]:
+        return self._obj.get("maxSurge")
+
+    @property
+    def maxUnavailable(self) -> Optional[Any]:
+        return self._obj.get("maxUnavailable")
+
+
+class DeploymentStrategy:
+    "DeploymentStrategy describes how to replace existing pods with new ones."
+
+    __slots__ = ("_obj", "_rollingUpdate")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def rollingUpdate(self) -> Optional[RollingUpdateDeployment]:
+        value = self._obj.get("rollingUpdate")
+        return RollingUpdateDeployment(value) if value is not None else None
+
+    @property
+    def type(self) -> Optional[str]:
+        return self._obj.get("type")
+
+
+class ContainerPort:
+    "ContainerPort represents a network port in a single container."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def containerPort(self) -> int:
+        return self._obj["containerPort"]
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._obj.get("name")
+
+    @property
+    def protocol(self) -> Optional[str]:
+        return self._obj.get("protocol")
+
+
+class ResourceRequirements:
+    "ResourceRequirements describes the compute resource requirements."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def limits(self) -> Dict[str, str]:
+        return self._obj.get("limits") or {}
+
+    @property
+    def requests(self) -> Dict[str, str]:
+        return self._obj.get("requests") or {}
+
+
+class Container:
+    "A single application container that you want to run within a pod."
+
+    __slots__ = ("_obj", "_ports", "_resources")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def args(self) -> List[str]:
+        return self._obj.get("args") or []
+
+    @property
+    def command(self) -> List[str]:
+        return self._obj.get("command") or []
+
+    @property
+    def image(self) -> Optional[str]:
+        return self._obj.get("image")
+
+    @property
+    def imagePullPolicy(self) -> Optional[str]:
+        return self._obj.get("imagePullPolicy")
+
+    @property
+    def name(self) -> str:
+        return self._obj["name"]
+
+    @cached_slot
+    def ports(self) -> List[ContainerPort]:
+        return [ContainerPort(item) for item in self._obj.get("ports") or []]
+
+    @cached_slot
+    def resources(self) -> Optional[ResourceRequirements]:
+        value = self._obj.get("resources")
+        return ResourceRequirements(value) if value is not None else None
+
+
+class PodSpec:
+    "PodSpec is a description of a pod."
+
+    __slots__ = ("_obj", "_containers", "_initContainers")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def containers(self) -> List[Container]:
+        return [Container(item) for item in self._obj.get("containers") or []]
+
+    @cached_slot
+    def initContainers(self) -> List[Container]:
+        return [Container(item) for item in self._obj.get("initContainers") or []]
+
+    @property
+    def nodeName(self) -> Optional[str]:
+        return self._obj.get("nodeName")
+
+    @property
+    def nodeSelector(self) -> Dict[str, str]:
+        return self._obj.get("nodeSelector") or {}
+
+    @property
+    def restartPolicy(self) -> Optional[str]:
+        return self._obj.get("restartPolicy")
+
+    @property
+    def serviceAccountName(self) -> Optional[str]:
+        return self._obj.get("serviceAccountName")
+
+
+class PodTemplateSpec:
+    "PodTemplateSpec describes the data a pod should have when created from a template"
+
+    __slots__ = ("_obj", "_spec")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        return self._obj.get("metadata")
+
+    @cached_slot
+    def spec(self) -> Optional[PodSpec]:
+        value = self._obj.get("spec")
+        return PodSpec(value) if value is not None else None
+
+
+class DeploymentSpec:
+    "DeploymentSpec is the specification of the desired behavior of the Deployment."
+
+    __slots__ = ("_obj", "_selector", "_strategy", "_template")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def minReadySeconds(self) -> Optional[int]:
+        return self._obj.get("minReadySeconds")
+
+    @property
+    def paused(self) -> Optional[bool]:
+        return self._obj.get("paused")
+
+    @property
+    def progressDeadlineSeconds(self) -> Optional[int]:
+        return self._obj.get("progressDeadlineSeconds")
+
+    @property
+    def replicas(self) -> Optional[int]:
+        return self._obj.get("replicas")
+
+    @property
+    def revisionHistoryLimit(self) -> Optional[int]:
+        return self._obj.get("revisionHistoryLimit")
+
+    @cached_slot
+    def selector(self) -> LabelSelector:
+        return LabelSelector(self._obj["selector"])
+
+    @cached_slot
+    def strategy(self) -> Optional[DeploymentStrategy]:
+        value = self._obj.get("strategy")
+        return DeploymentStrategy(value) if value is not None else None
+
+    @cached_slot
+    def template(self) -> PodTemplateSpec:
+        return PodTemplateSpec(self._obj["template"])
+
+
+class DeploymentCondition:
+    "DeploymentCondition describes the state of a deployment at a certain point."
+
+    __slots__ = ("_obj", "_lastTransitionTime", "_lastUpdateTime")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def lastTransitionTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastTransitionTime"))
+
+    @cached_slot
+    def lastUpdateTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastUpdateTime"))
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._obj.get("message")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._obj.get("reason")
+
+    @property
+    def status(self) -> str:
+        return self._obj["status"]
+
+    @property
+    def type(self) -> str:
+        return self._obj["type"]
+
+
+class DeploymentStatus:
+    "DeploymentStatus is the most recently observed status of the Deployment."
+
+    __slots__ = ("_obj", "_conditions")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def availableReplicas(self) -> Optional[int]:
+        return self._obj.get("availableReplicas")
+
+    @property
+    def collisionCount(self) -> Optional[int]:
+        return self._obj.get("collisionCount")
+
+    @cached_slot
+    def conditions(self) -> List[DeploymentCondition]:
+        return [DeploymentCondition(item) for item in self._obj.get("conditions") or []]
+
+    @property
+    def observedGeneration(self) -> Optional[int]:
+        return self._obj.get("observedGeneration")
+
+    @property
+    def readyReplicas(self) -> Optional[int]:
+        return self._obj.get("readyReplicas")
+
+    @property
+    def replicas(self) -> Optional[int]:
+        return self._obj.get("replicas")
+
+    @property
+    def unavailableReplicas(self) -> Optional[int]:
+        return self._obj.get("unavailableReplicas")
+
+    @property
+    def updatedReplicas(self) -> Optional[int]:
+        return self._obj.get("updatedReplicas")
+
+
+class Deployment(ObjectWrapper):
+    "Deployment enables declarative updates for Pods and ReplicaSets."
+
+    __slots__ = ("_spec",)
+
+    _meta_cls = NamespacedMeta
+
+    @cached_slot
+    def spec(self) -> Optional[DeploymentSpec]:
+        value = self._obj.get("spec")
+        return DeploymentSpec(value) if value is not None else None
+
+    @cached_slot
+    def status(self) -> Optional[DeploymentStatus]:
+        value = self._obj.get("status")
+        return DeploymentStatus(value) if value is not None else None
+
+
+class ReplicaSetSpec:
+    "ReplicaSetSpec is the specification of a ReplicaSet."
+
+    __slots__ = ("_obj", "_selector", "_template")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def minReadySeconds(self) -> Optional[int]:
+        return self._obj.get("minReadySeconds")
+
+    @property
+    def replicas(self) -> Optional[int]:
+        return self._obj.get("replicas")
+
+    @cached_slot
+    def selector(self) -> LabelSelector:
+        return LabelSelector(self._obj["selector"])
+
+    @cached_slot
+    def template(self) -> Optional[PodTemplateSpec]:
+        value = self._obj.get("template")
+        return PodTemplateSpec(value) if value is not None else None
+
+
+class ReplicaSetCondition:
+    "ReplicaSetCondition describes the state of a replica set at a certain point."
+
+    __slots__ = ("_obj", "_lastTransitionTime")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def lastTransitionTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastTransitionTime"))
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._obj.get("message")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._obj.get("reason")
+
+    @property
+    def status(self) -> str:
+        return self._obj["status"]
+
+    @property
+    def type(self) -> str:
+        return self._obj["type"]
+
+
+class ReplicaSetStatus:
+    "ReplicaSetStatus represents the current status of a ReplicaSet."
+
+    __slots__ = ("_obj", "_conditions")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def availableReplicas(self) -> Optional[int]:
+        return self._obj.get("availableReplicas")
+
+    @cached_slot
+    def conditions(self) -> List[ReplicaSetCondition]:
+        return [ReplicaSetCondition(item) for item in self._obj.get("conditions") or []]
+
+    @property
+    def fullyLabeledReplicas(self) -> Optional[int]:
+        return self._obj.get("fullyLabeledReplicas")
+
+    @property
+    def observedGeneration(self) -> Optional[int]:
+        return self._obj.get("observedGeneration")
+
+    @property
+    def readyReplicas(self) -> Optional[int]:
+        return self._obj.get("readyReplicas")
+
+    @property
+    def replicas(self) -> int:
+        return self._obj["replicas"]
+
+
+class ReplicaSet(ObjectWrapper):
+    """ReplicaSet ensures that a specified number of pod replicas are running at any
+    given time."""
+
+    __slots__ = ("_spec",)
+
+    _meta_cls = NamespacedMeta
+
+    @cached_slot
+    def spec(self) -> Optional[ReplicaSetSpec]:
+        value = self._obj.get("spec")
+        return ReplicaSetSpec(value) if value is not None else None
+
+    @cached_slot
+    def status(self) -> Optional[ReplicaSetStatus]:
+        value = self._obj.get("status")
+        return ReplicaSetStatus(value) if value is not None else None
+
+
+class ObjectReference:
+    """ObjectReference contains enough information to let you inspect or modify the
+    referred object."""
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def apiVersion(self) -> Optional[str]:
+        return self._obj.get("apiVersion")
+
+    @property
+    def fieldPath(self) -> Optional[str]:
+        return self._obj.get("fieldPath")
+
+    @property
+    def kind(self) -> Optional[str]:
+        return self._obj.get("kind")
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._obj.get("name")
+
+    @property
+    def namespace(self) -> Optional[str]:
+        return self._obj.get("namespace")
+
+    @property
+    def resourceVersion(self) -> Optional[str]:
+        return self._obj.get("resourceVersion")
+
+    @property
+    def uid(self) -> Optional[str]:
+        return self._obj.get("uid")
+
+
+class EventSeries:
+    "EventSeries contain information on series of events, i.e."
+
+    __slots__ = ("_obj", "_lastObservedTime")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def count(self) -> Optional[int]:
+        return self._obj.get("count")
+
+    @cached_slot
+    def lastObservedTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastObservedTime"))
+
+
+class EventSource:
+    "EventSource contains information for an event."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def component(self) -> Optional[str]:
+        return self._obj.get("component")
+
+    @property
+    def host(self) -> Optional[str]:
+        return self._obj.get("host")
+
+
+class Event(ObjectWrapper):
+    "Event is a report of an event somewhere in the cluster."
+
+    __slots__ = (
+        "_eventTime",
+        "_firstTimestamp",
+        "_involvedObject",
+        "_lastTimestamp",
+        "_related",
+        "_series",
+        "_source",
+    )
+
+    _meta_cls = NamespacedMeta
+
+    @property
+    def action(self) -> Optional[str]:
+        return self._obj.get("action")
+
+    @property
+    def count(self) -> Optional[int]:
+        return self._obj.get("count")
+
+    @cached_slot
+    def eventTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("eventTime"))
+
+    @cached_slot
+    def firstTimestamp(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("firstTimestamp"))
+
+    @cached_slot
+    def involvedObject(self) -> Optional[ObjectReference]:
+        value = self._obj.get("involvedObject")
+        return ObjectReference(value) if value is not None else None
+
+    @cached_slot
+    def lastTimestamp(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastTimestamp"))
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._obj.get("message")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._obj.get("reason")
+
+    @cached_slot
+    def related(self) -> Optional[ObjectReference]:
+        value = self._obj.get("related")
+        return ObjectReference(value) if value is not None else None
+
+    @property
+    def reportingComponent(self) -> Optional[str]:
+        return self._obj.get("reportingComponent")
+
+    @property
+    def reportingInstance(self) -> Optional[str]:
+        return self._obj.get("reportingInstance")
+
+    @cached_slot
+    def series(self) -> Optional[EventSeries]:
+        value = self._obj.get("series")
+        return EventSeries(value) if value is not None else None
+
+    @cached_slot
+    def source(self) -> Optional[EventSource]:
+        value = self._obj.get("source")
+        return EventSource(value) if value is not None else None
+
+    @property
+    def type(self) -> Optional[str]:
+        return self._obj.get("type")
+
+
+class Taint:
+    """The node this Taint is attached to has the \"effect\" on any pod that does
+    not tolerate the Taint."""
+
+    __slots__ = ("_obj", "_timeAdded")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def effect(self) -> str:
+        return self._obj["effect"]
+
+    @property
+    def key(self) -> str:
+        return self._obj["key"]
+
+    @cached_slot
+    def timeAdded(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("timeAdded"))
+
+    @property
+    def value(self) -> Optional[str]:
+        return self._obj.get("value")
+
+
+class NodeSpec:
+    "NodeSpec describes the attributes that a node is created with."
+
+    __slots__ = ("_obj", "_taints")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def podCIDR(self) -> Optional[str]:
+        return self._obj.get("podCIDR")
+
+    @property
+    def podCIDRs(self) -> List[str]:
+        return self._obj.get("podCIDRs") or []
+
+    @property
+    def providerID(self) -> Optional[str]:
+        return self._obj.get("providerID")
+
+    @cached_slot
+    def taints(self) -> List[Taint]:
+        return [Taint(item) for item in self._obj.get("taints") or []]
+
+    @property
+    def unschedulable(self) -> Optional[bool]:
+        return self._obj.get("unschedulable")
+
+
+class NodeAddress:
+    "NodeAddress contains information for the node's address."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def address(self) -> str:
+        return self._obj["address"]
+
+    @property
+    def type(self) -> str:
+        return self._obj["type"]
+
+
+class NodeCondition:
+    "NodeCondition contains condition information for a node."
+
+    __slots__ = ("_obj", "_lastHeartbeatTime", "_lastTransitionTime")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def lastHeartbeatTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastHeartbeatTime"))
+
+    @cached_slot
+    def lastTransitionTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastTransitionTime"))
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._obj.get("message")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._obj.get("reason")
+
+    @property
+    def status(self) -> str:
+        return self._obj["status"]
+
+    @property
+    def type(self) -> str:
+        return self._obj["type"]
+
+
+class NodeSystemInfo:
+    "NodeSystemInfo is a set of ids/uuids to uniquely identify the node."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def architecture(self) -> Optional[str]:
+        return self._obj.get("architecture")
+
+    @property
+    def bootID(self) -> Optional[str]:
+        return self._obj.get("bootID")
+
+    @property
+    def containerRuntimeVersion(self) -> Optional[str]:
+        return self._obj.get("containerRuntimeVersion")
+
+    @property
+    def kernelVersion(self) -> Optional[str]:
+        return self._obj.get("kernelVersion")
+
+    @property
+    def kubeProxyVersion(self) -> Optional[str]:
+        return self._obj.get("kubeProxyVersion")
+
+    @property
+    def kubeletVersion(self) -> Optional[str]:
+        return self._obj.get("kubeletVersion")
+
+    @property
+    def machineID(self) -> Optional[str]:
+        return self._obj.get("machineID")
+
+    @property
+    def operatingSystem(self) -> Optional[str]:
+        return self._obj.get("operatingSystem")
+
+    @property
+    def osImage(self) -> Optional[str]:
+        return self._obj.get("osImage")
+
+    @property
+    def systemUUID(self) -> Optional[str]:
+        return self._obj.get("systemUUID")
+
+
+class NodeStatus:
+    "NodeStatus is information about the current status of a node."
+
+    __slots__ = ("_obj", "_addresses", "_conditions", "_nodeInfo")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def addresses(self) -> List[NodeAddress]:
+        return [NodeAddress(item) for item in self._obj.get("addresses") or []]
+
+    @property
+    def allocatable(self) -> Dict[str, str]:
+        return self._obj.get("allocatable") or {}
+
+    @property
+    def capacity(self) -> Dict[str, str]:
+        return self._obj.get("capacity") or {}
+
+    @cached_slot
+    def conditions(self) -> List[NodeCondition]:
+        return [NodeCondition(item) for item in self._obj.get("conditions") or []]
+
+    @cached_slot
+    def nodeInfo(self) -> Optional[NodeSystemInfo]:
+        value = self._obj.get("nodeInfo")
+        return NodeSystemInfo(value) if value is not None else None
+
+    @property
+    def phase(self) -> Optional[str]:
+        return self._obj.get("phase")
+
+
+class Node(ObjectWrapper):
+    "Node is a worker node in Kubernetes."
+
+    __slots__ = ("_spec",)
+
+    _meta_cls = ObjectMeta
+
+    @cached_slot
+    def spec(self) -> Optional[NodeSpec]:
+        value = self._obj.get("spec")
+        return NodeSpec(value) if value is not None else None
+
+    @cached_slot
+    def status(self) -> Optional[NodeStatus]:
+        value = self._obj.get("status")
+        return NodeStatus(value) if value is not None else None
+
+
+class ServicePort:
+    "ServicePort contains information on service's port."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def appProtocol(self) -> Optional[str]:
+        return self._obj.get("appProtocol")
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._obj.get("name")
+
+    @property
+    def nodePort(self) -> Optional[int]:
+        return self._obj.get("nodePort")
+
+    @property
+    def port(self) -> int:
+        return self._obj["port"]
+
+    @property
+    def protocol(self) -> Optional[str]:
+        return self._obj.get("protocol")
+
+    @property
+    def targetPort(self) -> Optional[Any]:
+        return self._obj.get("targetPort")
+
+
+class ServiceSpec:
+    "ServiceSpec describes the attributes that a user creates on a service."
+
+    __slots__ = ("_obj", "_ports")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def clusterIP(self) -> Optional[str]:
+        return self._obj.get("clusterIP")
+
+    @property
+    def clusterIPs(self) -> List[str]:
+        return self._obj.get("clusterIPs") or []
+
+    @property
+    def externalIPs(self) -> List[str]:
+        return self._obj.get("externalIPs") or []
+
+    @property
+    def externalName(self) -> Optional[str]:
+        return self._obj.get("externalName")
+
+    @property
+    def externalTrafficPolicy(self) -> Optional[str]:
+        return self._obj.get("externalTrafficPolicy")
+
+    @property
+    def ipFamilies(self) -> List[str]:
+        return self._obj.get("ipFamilies") or []
+
+    @property
+    def loadBalancerIP(self) -> Optional[str]:
+        return self._obj.get("loadBalancerIP")
+
+    @cached_slot
+    def ports(self) -> List[ServicePort]:
+        return [ServicePort(item) for item in self._obj.get("ports") or []]
+
+    @property
+    def selector(self) -> Dict[str, str]:
+        return self._obj.get("selector") or {}
+
+    @property
+    def sessionAffinity(self) -> Optional[str]:
+        return self._obj.get("sessionAffinity")
+
+    @property
+    def type(self) -> Optional[str]:
+        return self._obj.get("type")
+
+
+class Condition:
+    """Condition contains details for one aspect of the current state of this API
+    Resource."""
+
+    __slots__ = ("_obj", "_lastTransitionTime")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def lastTransitionTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastTransitionTime"))
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._obj.get("message")
+
+    @property
+    def observedGeneration(self) -> Optional[int]:
+        return self._obj.get("observedGeneration")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._obj.get("reason")
+
+    @property
+    def status(self) -> str:
+        return self._obj["status"]
+
+    @property
+    def type(self) -> str:
+        return self._obj["type"]
+
+
+class LoadBalancerIngress:
+    "LoadBalancerIngress represents the status of a load-balancer ingress point."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def hostname(self) -> Optional[str]:
+        return self._obj.get("hostname")
+
+    @property
+    def ip(self) -> Optional[str]:
+        return self._obj.get("ip")
+
+
+class LoadBalancerStatus:
+    "LoadBalancerStatus represents the status of a load-balancer."
+
+    __slots__ = ("_obj", "_ingress")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def ingress(self) -> List[LoadBalancerIngress]:
+        return [LoadBalancerIngress(item) for item in self._obj.get("ingress") or []]
+
+
+class ServiceStatus:
+    "ServiceStatus represents the current status of a service."
+
+    __slots__ = ("_obj", "_conditions", "_loadBalancer")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def conditions(self) -> List[Condition]:
+        return [Condition(item) for item in self._obj.get("conditions") or []]
+
+    @cached_slot
+    def loadBalancer(self) -> Optional[LoadBalancerStatus]:
+        value = self._obj.get("loadBalancer")
+        return LoadBalancerStatus(value) if value is not None else None
+
+
+class Service(ObjectWrapper):
+    """Service is a named abstraction of software service (for example, mysql)
+    consisting of local port (for example 3306) that the proxy listens on, and the
+    selector that determines which pods will answer requests sent through the
+    proxy."""
+
+    __slots__ = ("_spec",)
+
+    _meta_cls = NamespacedMeta
+
+    @cached_slot
+    def spec(self) -> Optional[ServiceSpec]:
+        value = self._obj.get("spec")
+        return ServiceSpec(value) if value is not None else None
+
+    @cached_slot
+    def status(self) -> Optional[ServiceStatus]:
+        value = self._obj.get("status")
+        return ServiceStatus(value) if value is not None else None
+
+
+class CustomResourceDefinitionNames:
+    """CustomResourceDefinitionNames indicates the names to serve this
+    CustomResourceDefinition"""
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def categories(self) -> List[str]:
+        return self._obj.get("categories") or []
+
+    @property
+    def kind(self) -> str:
+        return self._obj["kind"]
+
+    @property
+    def listKind(self) -> Optional[str]:
+        return self._obj.get("listKind")
+
+    @property
+    def plural(self) -> str:
+        return self._obj["plural"]
+
+    @property
+    def shortNames(self) -> List[str]:
+        return self._obj.get("shortNames") or []
+
+    @property
+    def singular(self) -> Optional[str]:
+        return self._obj.get("singular")
+
+
+class CustomResourceColumnDefinition:
+    "CustomResourceColumnDefinition specifies a column for server side printing."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._obj.get("description")
+
+    @property
+    def format(self) -> Optional[str]:
+        return self._obj.get("format")
+
+    @property
+    def jsonPath(self) -> str:
+        return self._obj["jsonPath"]
+
+    @property
+    def name(self) -> str:
+        return self._obj["name"]
+
+    @property
+    def priority(self) -> Optional[int]:
+        return self._obj.get("priority")
+
+    @property
+    def type(self) -> str:
+        return self._obj["type"]
+
+
+class CustomResourceValidation:
+    "CustomResourceValidation is a list of validation methods for CustomResources."
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def openAPIV3Schema(self) -> Optional[Dict[str, Any]]:
+        return self._obj.get("openAPIV3Schema")
+
+
+class CustomResourceDefinitionVersion:
+    "CustomResourceDefinitionVersion describes a version for CRD."
+
+    __slots__ = ("_obj", "_additionalPrinterColumns", "_schema")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def additionalPrinterColumns(self) -> List[CustomResourceColumnDefinition]:
+        return [
+            CustomResourceColumnDefinition(item)
+            for item in self._obj.get("additionalPrinterColumns") or []
+        ]
+
+    @property
+    def deprecated(self) -> Optional[bool]:
+        return self._obj.get("deprecated")
+
+    @property
+    def deprecationWarning(self) -> Optional[str]:
+        return self._obj.get("deprecationWarning")
+
+    @property
+    def name(self) -> str:
+        return self._obj["name"]
+
+    @cached_slot
+    def schema(self) -> Optional[CustomResourceValidation]:
+        value = self._obj.get("schema")
+        return CustomResourceValidation(value) if value is not None else None
+
+    @property
+    def served(self) -> bool:
+        return self._obj["served"]
+
+    @property
+    def storage(self) -> bool:
+        return self._obj["storage"]
+
+
+class CustomResourceDefinitionSpec:
+    "CustomResourceDefinitionSpec describes how a user wants their resource to appear"
+
+    __slots__ = ("_obj", "_names", "_versions")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @property
+    def group(self) -> str:
+        return self._obj["group"]
+
+    @cached_slot
+    def names(self) -> CustomResourceDefinitionNames:
+        return CustomResourceDefinitionNames(self._obj["names"])
+
+    @property
+    def preserveUnknownFields(self) -> Optional[bool]:
+        return self._obj.get("preserveUnknownFields")
+
+    @property
+    def scope(self) -> str:
+        return self._obj["scope"]
+
+    @cached_slot
+    def versions(self) -> List[CustomResourceDefinitionVersion]:
+        return [
+            CustomResourceDefinitionVersion(item)
+            for item in self._obj.get("versions") or []
+        ]
+
+
+class CustomResourceDefinitionCondition:
+    """CustomResourceDefinitionCondition contains details for the current condition
+    of this pod."""
+
+    __slots__ = ("_obj", "_lastTransitionTime")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def lastTransitionTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("lastTransitionTime"))
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._obj.get("message")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._obj.get("reason")
+
+    @property
+    def status(self) -> str:
+        return self._obj["status"]
+
+    @property
+    def type(self) -> str:
+        return self._obj["type"]
+
+
+class CustomResourceDefinitionStatus:
+    "CustomResourceDefinitionStatus indicates the state of the CustomResourceDefinition"
+
+    __slots__ = ("_obj", "_acceptedNames", "_conditions")
+
+    def __init__(self, obj: RawObject) -> None:
+        self._obj = obj
+
+    @cached_slot
+    def acceptedNames(self) -> Optional[CustomResourceDefinitionNames]:
+        value = self._obj.get("acceptedNames")
+        return CustomResourceDefinitionNames(value) if value is not None else None
+
+    @cached_slot
+    def conditions(self) -> List[CustomResourceDefinitionCondition]:
+        return [
+            CustomResourceDefinitionCondition(item)
+            for item in self._obj.get("conditions") or []
+        ]
+
+    @property
+    def storedVersions(self) -> List[str]:
+        return self._obj.get("storedVersions") or []
+
+
+class CustomResourceDefinition(ObjectWrapper):
+    """CustomResourceDefinition represents a resource that should be exposed on the
+    API server."""
+
+    __slots__ = ("_spec",)
+
+    _meta_cls = ObjectMeta
+
+    @cached_slot
+    def spec(self) -> Optional[CustomResourceDefinitionSpec]:
+        value = self._obj.get("spec")
+        return CustomResourceDefinitionSpec(value) if value is not None else None
+
+    @cached_slot
+    def status(self) -> Optional[CustomResourceDefinitionStatus]:
+        value = self._obj.get("status")
+        return CustomResourceDefinitionStatus(value) if value is not None else None
+
+
+# the generated wrappers by apiVersion and kind
+KINDS: Dict[KindKey, Type[ObjectWrapper]] = {
+    ("apps/v1", "Deployment"): Deployment,
+    ("apps/v1", "ReplicaSet"): ReplicaSet,
+    ("v1", "Event"): Event,
+    ("v1", "Node"): Node,
+    ("v1", "Service"): Service,
+    ("apiextensions.k8s.io/v1", "CustomResourceDefinition"): CustomResourceDefinition,
+}
@@ -1,11 +1,46 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Optional
 
-from dateutil.parser import parse as parse_date
+from kube.tools.timekeeping import parse_timestamp
 
 
 def maybe_parse_date(dt: Optional[str]) -> Optional[datetime]:
     if dt:
-        return parse_date(dt)
+        return parse_timestamp(dt)
 
     return None
+
+
+class cached_slot:
+    """
+    Like functools.cached_property, but for classes with __slots__ (which have
+    no instance dict). The value is computed on first access and stored in the
+    slot named after the property with a leading underscore, which the class
+    must declare:
+
+        class Meta:
+            __slots__ = ("_meta", "_creationTimestamp")
+
+            @cached_slot
+            def creationTimestamp(self) -> datetime:
+                return parse_timestamp(self._meta["creationTimestamp"])
+    """
+
+    def __init__(self, func: Callable[[Any], Any]) -> None:
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        # the member descriptor that __slots__ created for the storage slot
+        self.slot = getattr(owner, "_" + name)
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
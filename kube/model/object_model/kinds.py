@@ -5,6 +5,8 @@ from kube.model.object_model.types import RawObject
 
 
 class Namespace(ObjectWrapper):
+    __slots__ = ()
+
     _meta_cls = ObjectMeta
     _status_cls = ObjectStatus
 
@@ -13,12 +15,14 @@ class Namespace(ObjectWrapper):
 
 
 class Pod(ObjectWrapper):
+    __slots__ = ()
+
     _meta_cls = NamespacedMeta
     _status_cls = PodStatus
 
+    # help mypy a bit here
+    meta: NamespacedMeta
+    status: PodStatus
+
     def __init__(self, obj: RawObject) -> None:
         super().__init__(obj)
-
-        # help mypy a bit here
-        self.meta: NamespacedMeta
-        self.status: PodStatus
@@ -1,29 +1,54 @@
 from datetime import datetime
 from typing import Dict, Optional
 
-from dateutil.parser import parse as parse_date
-
-from kube.model.object_model.helpers import maybe_parse_date
+from kube.model.object_model.helpers import cached_slot, maybe_parse_date
 from kube.model.object_model.types import RawObject
+from kube.tools.timekeeping import parse_timestamp
 
 
 class ObjectMeta:
+    __slots__ = (
+        "_meta",
+        "_creationTimestamp",
+        "_deletionTimestamp",
+        "_resourceVersion",
+    )
+
     def __init__(self, obj: RawObject) -> None:
         self._meta = obj["metadata"]
 
-        self.creationTimestamp: datetime = parse_date(self._meta["creationTimestamp"])
-        self.deletionTimestamp: Optional[datetime] = maybe_parse_date(
-            self._meta.get("deletionTimestamp")
-        )
-        self.name: str = self._meta["name"]
-        self.resourceVersion: int = int(self._meta["resourceVersion"])
-        self.uid: str = self._meta["uid"]
+    @cached_slot
+    def creationTimestamp(self) -> datetime:
+        return parse_timestamp(self._meta["creationTimestamp"])
+
+    @cached_slot
+    def deletionTimestamp(self) -> Optional[datetime]:
+        return maybe_parse_date(self._meta.get("deletionTimestamp"))
+
+    @property
+    def name(self) -> str:
+        return self._meta["name"]
+
+    @cached_slot
+    def resourceVersion(self) -> int:
+        return int(self._meta["resourceVersion"])
+
+    @property
+    def uid(self) -> str:
+        return self._meta["uid"]
 
 
 class NamespacedMeta(ObjectMeta):
-    def __init__(self, obj: RawObject) -> None:
-        super().__init__(obj)
+    __slots__ = ()
+
+    @property
+    def namespace(self) -> str:
+        return self._meta["namespace"]
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        return self._meta.get("labels") or {}
 
-        self.namespace: str = self._meta["namespace"]
-        self.labels: Dict[str, str] = self._meta.get("labels") or {}
-        self.annotations: Dict[str, str] = self._meta.get("annotations") or {}
+    @property
+    def annotations(self) -> Dict[str, str]:
+        return self._meta.get("annotations") or {}
@@ -2,37 +2,67 @@ import enum
 from datetime import datetime
 from typing import List, Optional
 
-from kube.model.object_model.helpers import maybe_parse_date
+from kube.model.object_model.helpers import cached_slot, maybe_parse_date
 from kube.model.object_model.types import RawObject
 
 
 class ContainerState:
+    __slots__ = ("_obj",)
+
+    key: str
+
     def __init__(self, obj: RawObject) -> None:
         self._obj = obj
-        self.key: str
 
 
 class ContainerStateRunning(ContainerState):
-    def __init__(self, obj: RawObject) -> None:
-        self.key = "running"
-        self.startedAt: Optional[datetime] = maybe_parse_date(obj.get("startedAt"))
+    __slots__ = ("_startedAt",)
+
+    key = "running"
+
+    @cached_slot
+    def startedAt(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("startedAt"))
 
 
 class ContainerStateTerminated(ContainerState):
-    def __init__(self, obj: RawObject) -> None:
-        self.key = "terminated"
-        self.startedAt: Optional[datetime] = maybe_parse_date(obj.get("startedAt"))
-        self.finishedAt: Optional[datetime] = maybe_parse_date(obj.get("finishedAt"))
-        self.exitCode: Optional[int] = obj.get("exitCode")
-        self.message: Optional[str] = obj.get("message")
-        self.reason: Optional[str] = obj.get("reason")
+    __slots__ = ("_startedAt", "_finishedAt")
+
+    key = "terminated"
+
+    @cached_slot
+    def startedAt(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("startedAt"))
+
+    @cached_slot
+    def finishedAt(self) -> Optional[datetime]:
+        return maybe_parse_date(self._obj.get("finishedAt"))
+
+    @property
+    def exitCode(self) -> Optional[int]:
+        return self._obj.get("exitCode")
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._obj.get("message")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._obj.get("reason")
 
 
 class ContainerStateWaiting(ContainerState):
-    def __init__(self, obj: RawObject) -> None:
-        self.key = "waiting"
-        self.message: Optional[str] = obj.get("message")
-        self.reason: Optional[str] = obj.get("reason")
+    __slots__ = ()
+
+    key = "waiting"
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._obj.get("message")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._obj.get("reason")
 
 
 def parse_container_state(obj: RawObject) -> Optional[ContainerState]:
@@ -54,53 +84,83 @@ class ContainerStatusVariant(enum.Enum):
 
 
 class ContainerStatus:
+    __slots__ = ("variant", "_obj", "_state", "_lastState")
+
     def __init__(self, variant: ContainerStatusVariant, obj: RawObject) -> None:
         self.variant = variant
+        self._obj = obj
+
+    @property
+    def name(self) -> str:
+        return self._obj["name"]
+
+    @property
+    def ready(self) -> bool:
+        return self._obj["ready"]
+
+    @property
+    def restartCount(self) -> int:
+        return self._obj["restartCount"]
+
+    @property
+    def image(self) -> str:
+        return self._obj["image"]
 
-        self.name: str = obj["name"]
-        self.ready: bool = obj["ready"]
-        self.restartCount: int = obj["restartCount"]
-        self.image: str = obj["image"]
-        self.imageID: str = obj["imageID"]
+    @property
+    def imageID(self) -> str:
+        return self._obj["imageID"]
 
-        self.started: Optional[bool] = obj.get("started")
-        self.state: Optional[ContainerState] = None
-        self.lastState: Optional[ContainerState] = None
+    @property
+    def started(self) -> Optional[bool]:
+        return self._obj.get("started")
 
-        state = obj.get("state")
-        if state:
-            self.state = parse_container_state(state)
+    @cached_slot
+    def state(self) -> Optional[ContainerState]:
+        state = self._obj.get("state")
+        return parse_container_state(state) if state else None
 
-        lastState = obj.get("lastState")
-        if lastState:
-            self.lastState = parse_container_state(lastState)
+    @cached_slot
+    def lastState(self) -> Optional[ContainerState]:
+        lastState = self._obj.get("lastState")
+        return parse_container_state(lastState) if lastState else None
 
 
 class ObjectStatus:
+    __slots__ = ("_status",)
+
     def __init__(self, obj: RawObject) -> None:
         self._status = obj["status"]
 
-        self.phase: Optional[str] = self._status["phase"]
+    @property
+    def phase(self) -> Optional[str]:
+        return self._status["phase"]
 
 
 class PodStatus(ObjectStatus):
-    def __init__(self, obj: RawObject) -> None:
-        super().__init__(obj)
-
-        self.startTime: Optional[datetime] = None
-        self.reason: Optional[str] = None
-        self.message: Optional[str] = None
-        self.containerStatuses: List[ContainerStatus] = []
-        self.initContainerStatuses: List[ContainerStatus] = []
-
-        self.startTime = maybe_parse_date(self._status.get("startTime"))
-        self.message = self._status.get("message")
-        self.reason = self._status.get("reason")
-        self.containerStatuses = [
+    __slots__ = ("_startTime", "_containerStatuses", "_initContainerStatuses")
+
+    @cached_slot
+    def startTime(self) -> Optional[datetime]:
+        return maybe_parse_date(self._status.get("startTime"))
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._status.get("message")
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._status.get("reason")
+
+    @cached_slot
+    def containerStatuses(self) -> List[ContainerStatus]:
+        return [
             ContainerStatus(ContainerStatusVariant.STANDARD_CONTAINER, cont)
             for cont in self._status.get("containerStatuses", [])
         ]
-        self.initContainerStatuses = [
+
+    @cached_slot
+    def initContainerStatuses(self) -> List[ContainerStatus]:
+        return [
             ContainerStatus(ContainerStatusVariant.INIT_CONTAINER, cont)
             for cont in self._status.get("initContainerStatuses", [])
         ]
@@ -1,3 +1,6 @@
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 RawObject = Dict[str, Any]
+
+# apiVersion, kind
+KindKey = Tuple[str, str]
@@ -0,0 +1,21 @@
+from typing import Dict, Optional, Type
+
+from kube.model.object_model import generated
+from kube.model.object_model.base import ObjectWrapper
+from kube.model.object_model.kinds import Namespace, Pod
+from kube.model.object_model.types import KindKey, RawObject
+
+# the hand-written wrappers take precedence over generated ones. By apiVersion
+# too, an events.k8s.io/v1 Event is not a core one
+WRAPPER_CLASSES: Dict[KindKey, Type[ObjectWrapper]] = {
+    **generated.KINDS,
+    ("v1", "Namespace"): Namespace,
+    ("v1", "Pod"): Pod,
+}
+
+
+def wrap_object(obj: RawObject) -> Optional[ObjectWrapper]:
+    "Returns None for kinds we have no wrapper for"
+
+    cls = WRAPPER_CLASSES.get((obj.get("apiVersion", ""), obj.get("kind", "")))
+    return cls(obj) if cls is not None else None
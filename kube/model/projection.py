@@ -0,0 +1,145 @@
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+# A path into an object, eg. ("metadata", "managedFields"). Paths can also be
+# given as dotted strings ("metadata.managedFields"), but keys that contain
+# dots themselves (like most annotations) need the tuple form.
+Path = Union[str, Sequence[str]]
+
+# A compiled set of paths: each key maps to the subtree below it, an empty
+# subtree means the path ends at this key.
+Trie = Dict[str, "Trie"]
+
+# Without these we cannot track resourceVersion or wrap the object
+ALWAYS_KEEP: Sequence[Path] = [
+    "apiVersion",
+    "kind",
+    "metadata.name",
+    "metadata.namespace",
+    "metadata.uid",
+    "metadata.resourceVersion",
+    "metadata.creationTimestamp",
+    "metadata.deletionTimestamp",
+]
+
+
+def split_path(path: Path) -> Tuple[str, ...]:
+    if isinstance(path, str):
+        return tuple(path.split("."))
+
+    return tuple(path)
+
+
+def compile_paths(paths: Iterable[Path]) -> Trie:
+    trie: Trie = {}
+
+    for path in paths:
+        keys = split_path(path)
+        node = trie
+
+        for i, key in enumerate(keys):
+            is_last = i == len(keys) - 1
+
+            # a shorter path already covers everything below it
+            if key in node and not node[key]:
+                break
+
+            if is_last:
+                node[key] = {}
+                break
+
+            node = node.setdefault(key, {})
+
+    return trie
+
+
+def keep_paths(value: Any, trie: Trie) -> Any:
+    # lists are transparent: the paths apply to each item
+    if isinstance(value, list):
+        return [keep_paths(item, trie) for item in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    dct = {}
+    for key, subtrie in trie.items():
+        if key not in value:
+            continue
+
+        if subtrie:
+            dct[key] = keep_paths(value[key], subtrie)
+        else:
+            dct[key] = value[key]
+
+    return dct
+
+
+def drop_paths(value: Any, trie: Trie) -> None:
+    # lists are transparent: the paths apply to each item
+    if isinstance(value, list):
+        for item in value:
+            drop_paths(item, trie)
+        return
+
+    if not isinstance(value, dict):
+        return
+
+    for key, subtrie in trie.items():
+        if subtrie:
+            child = value.get(key)
+            if child is not None:
+                drop_paths(child, subtrie)
+        else:
+            value.pop(key, None)
+
+
+class Projection:
+    """Trims decoded objects down to the fields a consumer needs, so that the
+    rest can be freed right away instead of being held in channels and stores.
+
+    `keep` lists the only paths to retain (plus ALWAYS_KEEP), `drop` lists
+    paths to remove. Both are compiled once and can be combined, in which case
+    keep is applied first."""
+
+    def __init__(
+        self,
+        *,
+        keep: Optional[Iterable[Path]] = None,
+        drop: Optional[Iterable[Path]] = None,
+    ) -> None:
+        self.keep: Optional[Trie] = None
+        if keep is not None:
+            self.keep = compile_paths(list(ALWAYS_KEEP) + list(keep))
+
+        self.drop: Optional[Trie] = None
+        if drop is not None:
+            self.drop = compile_paths(drop)
+
+    def __repr__(self) -> str:
+        return "<%s keep=%r, drop=%r>" % (
+            self.__class__.__name__,
+            self.keep,
+            self.drop,
+        )
+
+    def apply(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        "Returns the projected object, which may be obj modified in place"
+
+        if self.keep is not None:
+            obj = keep_paths(obj, self.keep)
+
+        if self.drop is not None:
+            drop_paths(obj, self.drop)
+
+        return obj
+
+
+# Bookkeeping fields that kubectl also hides by default
+DropManagedFields = Projection(drop=["metadata.managedFields"])
+
+# Bookkeeping fields that are often larger than the rest of the object
+DropNoisyFields = Projection(
+    drop=[
+        "metadata.managedFields",
+        ("metadata", "annotations", "kubectl.kubernetes.io/last-applied-configuration"),
+    ]
+)
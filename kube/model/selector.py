@@ -1,21 +1,35 @@
-from typing import Optional
+import fnmatch
+import functools
+import re
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from kube.model.api_resource import ApiResource
+from kube.model.projection import Projection
 
 
 class ObjectSelector:
-    def __init__(self, *, res: ApiResource, namespace: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        *,
+        res: ApiResource,
+        namespace: Optional[str] = None,
+        projection: Optional[Projection] = None,
+    ) -> None:
         if namespace and not res.namespaced:
             raise ValueError("Cannot search by namespace for %s" % res.kind)
 
         self.res = res
         self.namespace = namespace
 
+        # trims objects right after decoding, before they reach any consumer
+        self.projection = projection
+
     def __repr__(self) -> str:
-        return "<%s res=%r, namespace=%r>" % (
+        return "<%s res=%r, namespace=%r, projection=%r>" % (
             self.__class__.__name__,
             self.res,
             self.namespace,
+            self.projection,
         )
 
     def pretty(self):
@@ -27,3 +41,158 @@ class ObjectSelector:
         slug = f"{slug}{self.res.kind}"
 
         return slug
+
+
+# Client-side matching
+#
+# Globs and label selectors are compiled once into predicates that work on
+# plain strings and raw object dicts, so that filtering an event does not
+# involve wrapping the object or re-parsing the pattern. They are also what we
+# fall back on when the server cannot express a filter, like a glob.
+
+GLOB_CHARS = frozenset("*?[")
+
+
+class GlobMatcher:
+    "A shell-style wildcard pattern, matched case-sensitively like fnmatchcase"
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+
+        self.match: Callable[[str], bool]
+        if pattern == "*":
+            self.match = lambda value: True
+        elif not GLOB_CHARS.intersection(pattern):
+            self.match = pattern.__eq__
+        else:
+            regex = re.compile(fnmatch.translate(pattern))
+            self.match = lambda value: regex.match(value) is not None
+
+    def __repr__(self) -> str:
+        return "<%s pattern=%r>" % (self.__class__.__name__, self.pattern)
+
+    @property
+    def matches_everything(self) -> bool:
+        return self.pattern == "*"
+
+    @property
+    def is_literal(self) -> bool:
+        "True if the pattern only matches itself"
+        return not GLOB_CHARS.intersection(self.pattern)
+
+    def filter(self, values: Iterable[str]) -> List[str]:
+        match = self.match
+        return [value for value in values if match(value)]
+
+
+Labels = Dict[str, str]
+LabelPredicate = Callable[[Labels], bool]
+
+# key, operator, values - the operators are the ones of the set based syntax,
+# equality based requirements are compiled as `in` and `notin`
+Requirement = Tuple[str, str, FrozenSet[str]]
+
+rx_set_requirement = re.compile(r"^(\S+)\s+(in|notin)\s*\((.*)\)$")
+rx_equality_requirement = re.compile(r"^([^=!\s]+)\s*(==|=|!=)\s*(\S*)$")
+rx_label_key = re.compile(r"^([A-Za-z0-9][-A-Za-z0-9_./]*)?[A-Za-z0-9]$")
+
+
+def split_requirements(expr: str) -> List[str]:
+    "Splits on the commas that are not inside a set of values"
+
+    parts = []
+    depth = 0
+    start = 0
+
+    for i, char in enumerate(expr):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(expr[start:i])
+            start = i + 1
+
+    parts.append(expr[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_requirement(text: str) -> Requirement:
+    match = rx_set_requirement.match(text)
+    if match:
+        key, op, values = match.groups()
+        value_set = frozenset(val.strip() for val in values.split(",") if val.strip())
+        requirement = (key, op, value_set)
+
+    elif text.startswith("!"):
+        requirement = (text[1:].strip(), "!", frozenset())
+
+    else:
+        match = rx_equality_requirement.match(text)
+        if match:
+            key, op, value = match.groups()
+            requirement = (key, "notin" if op == "!=" else "in", frozenset([value]))
+        else:
+            requirement = (text, "exists", frozenset())
+
+    if not rx_label_key.match(requirement[0]):
+        raise ValueError("Invalid label selector requirement: %r" % text)
+
+    return requirement
+
+
+def compile_requirement(requirement: Requirement) -> LabelPredicate:
+    key, op, values = requirement
+
+    if op == "exists":
+        return lambda labels: key in labels
+
+    if op == "!":
+        return lambda labels: key not in labels
+
+    if op == "in":
+        # a missing label does not match
+        return lambda labels: labels.get(key) in values
+
+    # notin matches a missing label too, like on the server
+    return lambda labels: labels.get(key) not in values
+
+
+class LabelSelector:
+    """
+    A kubernetes label selector like `app in (web,api),tier!=db,!canary`,
+    supporting the equality based (`=`, `==`, `!=`) and set based (`in`,
+    `notin`, `key`, `!key`) requirements. All the requirements must match.
+    """
+
+    def __init__(self, expr: str) -> None:
+        self.expr = expr
+        self.requirements = [parse_requirement(req) for req in split_requirements(expr)]
+        self.predicates = [compile_requirement(req) for req in self.requirements]
+
+    def __repr__(self) -> str:
+        return "<%s expr=%r>" % (self.__class__.__name__, self.expr)
+
+    def matches_labels(self, labels: Optional[Labels]) -> bool:
+        labels = labels or {}
+
+        for predicate in self.predicates:
+            if not predicate(labels):
+                return False
+
+        return True
+
+    def matches(self, obj: Dict[str, Any]) -> bool:
+        "Matches the labels of a raw object dict"
+        return self.matches_labels(obj["metadata"].get("labels"))
+
+
+@functools.lru_cache(maxsize=256)
+def compile_glob(pattern: str) -> GlobMatcher:
+    return GlobMatcher(pattern)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_label_selector(expr: str) -> LabelSelector:
+    "Raises ValueError if the expression is invalid"
+    return LabelSelector(expr)
@@ -0,0 +1,155 @@
+"""
+A minimal inotify binding on top of ctypes, so that we can watch directories
+for changes without a third party package. Only available on Linux, see
+`is_supported()`.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+from typing import Any, Dict, List, Optional
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# a file was written, or appeared or disappeared (editors and tools that
+# write atomically rename a temporary file into place)
+DIR_CHANGES = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_ATTRIB
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+# struct inotify_event without the name that follows it
+EVENT_HEADER = struct.Struct("iIII")
+
+_libc: Optional[Any] = None
+
+
+def get_libc() -> Any:
+    global _libc
+
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+    return _libc
+
+
+def is_supported() -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+
+    try:
+        return hasattr(get_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+class InotifyEvent:
+    def __init__(self, *, path: str, name: str, mask: int) -> None:
+        self.path = path
+        self.name = name
+        self.mask = mask
+
+    def __repr__(self) -> str:
+        return "<%s path=%r, name=%r, mask=%s>" % (
+            self.__class__.__name__,
+            self.path,
+            self.name,
+            hex(self.mask),
+        )
+
+    @property
+    def filepath(self) -> str:
+        return os.path.join(self.path, self.name) if self.name else self.path
+
+
+class Inotify:
+    def __init__(self) -> None:
+        self.libc = get_libc()
+
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            self.raise_errno("inotify_init1")
+
+        # watch descriptor -> path
+        self.watches: Dict[int, str] = {}
+
+    def __repr__(self) -> str:
+        return "<%s fd=%r, watches=%r>" % (
+            self.__class__.__name__,
+            self.fd,
+            list(self.watches.values()),
+        )
+
+    def raise_errno(self, func: str) -> None:
+        code = ctypes.get_errno()
+        raise OSError(code, "%s: %s" % (func, os.strerror(code)))
+
+    def add_watch(self, path: str, mask: int = DIR_CHANGES) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            self.raise_errno("inotify_add_watch")
+
+        self.watches[wd] = path
+        return wd
+
+    def read_events(self, timeout: Optional[float] = None) -> List[InotifyEvent]:
+        "Waits up to timeout seconds, returns [] if nothing happened"
+
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        except OSError as exc:
+            if exc.errno == errno.EINTR:
+                return []
+            raise
+
+        events = []
+        offset = 0
+
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            path = self.watches.get(wd, "")
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+
+            events.append(InotifyEvent(path=path, name=os.fsdecode(name), mask=mask))
+
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
@@ -1,5 +1,33 @@
+import functools
 from datetime import datetime, timezone
 
+from dateutil.parser import parse as parse_date
+
+# the number of distinct timestamps to remember, the same ones keep coming back
+# in the MODIFIED events of an object
+TIMESTAMP_CACHE_SIZE = 4096
+
 
 def date_now() -> datetime:
     return datetime.now(timezone.utc)
+
+
+def parse_timestamp_uncached(value: str) -> datetime:
+    # the api server formats all timestamps as RFC3339 in UTC, eg.
+    # 2021-06-01T00:00:03Z, or with microseconds for MicroTime. fromisoformat
+    # handles those (but not the Z before python 3.11) and is much faster than
+    # dateutil
+    if value.endswith("Z"):
+        try:
+            return datetime.fromisoformat(value[:-1] + "+00:00")
+        except ValueError:
+            pass
+
+    # anything else, like nanoseconds or a different offset
+    return parse_date(value)
+
+
+@functools.lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_timestamp(value: str) -> datetime:
+    "Parses a kubernetes timestamp into a timezone aware datetime"
+    return parse_timestamp_uncached(value)
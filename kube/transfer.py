@@ -0,0 +1,139 @@
+"""
+Compressed transfers.
+
+We ask the API server to compress responses and decompress them ourselves, as
+they arrive, instead of letting aiohttp do it. That way we can count the bytes
+that went over the wire as well as the bytes they decoded to, and it keeps
+working for watches which are read one line (or frame) at a time.
+
+This requires a session created with `auto_decompress=False`, see
+`create_session()`.
+"""
+
+import time
+import zlib
+from typing import Any, Optional
+
+from aiohttp import ClientResponse, ClientSession
+from aiohttp.client_exceptions import ClientPayloadError
+
+# the encodings we know how to decode
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def create_session() -> ClientSession:
+    return ClientSession(auto_decompress=False)
+
+
+def create_decompressor(encoding: str) -> Optional[Any]:
+    if encoding in ("", "identity"):
+        return None
+
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    if encoding == "deflate":
+        return zlib.decompressobj()
+
+    raise ClientPayloadError("Unsupported content encoding: %r" % encoding)
+
+
+class TransferStats:
+    "Byte counts for a single request"
+
+    def __init__(self, *, url: str, encoding: str) -> None:
+        self.url = url
+        self.encoding = encoding or "identity"
+
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+        self.time_started = time.time()
+        self.time_finished: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return "<%s url=%r, encoding=%r, wire_bytes=%r, decoded_bytes=%r>" % (
+            self.__class__.__name__,
+            self.url,
+            self.encoding,
+            self.wire_bytes,
+            self.decoded_bytes,
+        )
+
+    @property
+    def ratio(self) -> float:
+        "Wire bytes per decoded byte, lower is better"
+
+        if not self.decoded_bytes:
+            return 1.0
+
+        return self.wire_bytes / self.decoded_bytes
+
+    def finish(self) -> None:
+        self.time_finished = time.time()
+
+    def pretty(self) -> str:
+        return "%s wire bytes -> %s decoded bytes (%s, ratio %.2f)" % (
+            self.wire_bytes,
+            self.decoded_bytes,
+            self.encoding,
+            self.ratio,
+        )
+
+
+class DecodingReader:
+    """Reads a response body incrementally, decompressing it as it arrives.
+    Offers the same read methods as the response's StreamReader."""
+
+    def __init__(self, response: ClientResponse, stats: TransferStats) -> None:
+        self.content = response.content
+        self.stats = stats
+        self.decompressor = create_decompressor(stats.encoding.lower())
+
+        self.buffer = bytearray()
+        self.eof = False
+
+    async def fill(self) -> None:
+        "Reads the next chunk off the wire into the buffer"
+
+        chunk = await self.content.readany()
+
+        if chunk:
+            self.stats.wire_bytes += len(chunk)
+            if self.decompressor is not None:
+                chunk = self.decompressor.decompress(chunk)
+
+        else:
+            self.eof = True
+            if self.decompressor is not None:
+                chunk = self.decompressor.flush()
+
+        self.stats.decoded_bytes += len(chunk)
+        self.buffer.extend(chunk)
+
+    def take(self, size: int) -> bytes:
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    async def readline(self) -> bytes:
+        "Returns b'' at the end of the body"
+
+        start = 0
+
+        while True:
+            pos = self.buffer.find(b"\n", start)
+            if pos >= 0:
+                return self.take(pos + 1)
+
+            if self.eof:
+                return self.take(len(self.buffer))
+
+            start = len(self.buffer)
+            await self.fill()
+
+    async def read(self) -> bytes:
+        while not self.eof:
+            await self.fill()
+
+        return self.take(len(self.buffer))
@@ -1,25 +1,29 @@
 import time
-from typing import List, Optional, Tuple
-
-import dateutil.parser
+from functools import partial
+from typing import Any, List, Optional, Tuple
 
 from kube.async_loop import get_loop
 from kube.cluster_facade import SyncClusterFacade
 from kube.config import Context
 from kube.model.api_resource import ApiResource, NamespaceKind
+from kube.model.projection import DropManagedFields, Projection
 from kube.model.selector import ObjectSelector
+from kube.tools.timekeeping import parse_timestamp
 from kubefs.fs_model import ONE_DAY, Directory, File, Payload
-from kubefs.text import to_json
+from kubefs.fs_watch import WATCH_SYNC_INTERVAL, ResourceWatch, ResourceWatches
+from kubefs.payload_store import PAYLOAD_STORE, get_payload_key
+from kubefs.prefetch import Prefetcher
+from kubefs.scheduler import ScheduledClusterFacade
 
 
 def mkpayload(*, obj):
-    block = to_json(obj)
+    "The data is left out, see ObjectFile"
 
     timestamp = None
 
     creationTimestamp = obj["metadata"].get("creationTimestamp")
     if creationTimestamp:
-        timestamp = dateutil.parser.parse(creationTimestamp).timestamp()
+        timestamp = parse_timestamp(creationTimestamp).timestamp()
 
     if timestamp is None:
         timestamp = time.time()
@@ -32,7 +36,6 @@ def mkpayload(*, obj):
 
     payload = Payload(
         name=fn,
-        data=block.encode(),
         ctime=timestamp,
         mtime=timestamp,
     )
@@ -40,6 +43,85 @@ def mkpayload(*, obj):
     return payload
 
 
+class ObjectSource:
+    "Fetches the objects of a resource again, see ObjectFile"
+
+    def __init__(self, *, facade: SyncClusterFacade, api_resource: ApiResource) -> None:
+        self.facade = facade
+        self.api_resource = api_resource
+
+    def fetch(self, *, namespace: Optional[str], name: str) -> Optional[Any]:
+        selector = ObjectSelector(
+            res=self.api_resource,
+            namespace=namespace,
+            projection=DropManagedFields,
+        )
+        return self.facade.get_object(selector=selector, name=name)
+
+
+class ObjectFile(File):
+    """The json of an object, rendered when the file is first read. Most of
+    the files in a listing never are.
+
+    Until then the size is that of an average object, so that `ls -l` renders
+    nothing. The file is opened with direct_io, a read past the end of the
+    json comes up short and is not padded.
+
+    The object is kept in the payload store, which may evict it. The file
+    keeps its size, and the object is fetched again only when the file is
+    read, in the version the cluster has now, which is then sized again."""
+
+    direct_io = True
+
+    def __init__(self, *, payload: Payload, obj, source: ObjectSource) -> None:
+        super().__init__(payload=payload)
+        self.atts["st_size"] = PAYLOAD_STORE.estimated_size
+        self.source = source
+        self.namespace = obj["metadata"].get("namespace")
+        self.object_name = obj["metadata"]["name"]
+        self.is_gone = False
+
+        # objects without a uid and resourceVersion cannot be stored
+        self.key = get_payload_key(obj)
+        self.obj = None if self.key else obj
+
+        if self.key:
+            PAYLOAD_STORE.add_object(self.key, obj)
+
+    def get_data(self) -> bytes:
+        if self.is_gone:
+            return b""
+
+        data = None
+        if self.key is not None:
+            data = PAYLOAD_STORE.get(self.key)
+
+        if data is None:
+            obj = self.obj
+            if obj is None:
+                obj = self.source.fetch(namespace=self.namespace, name=self.object_name)
+
+            # deleted since it was listed
+            if obj is None:
+                self.key = None
+                self.is_gone = True
+                self.atts["st_size"] = 0
+                return b""
+
+            # it may have changed since it was listed
+            self.key = get_payload_key(obj)
+            data = PAYLOAD_STORE.render(obj)
+
+        # kept when the store evicts the object, getattr never fetches it
+        self.atts["st_size"] = len(data)
+
+        return data
+
+
+def mkfile(obj, *, source: ObjectSource) -> File:
+    return ObjectFile(payload=mkpayload(obj=obj), obj=obj, source=source)
+
+
 def name_api_resources(
     api_resources: List[ApiResource], want_namespaced_only=False
 ) -> List[Tuple[str, ApiResource]]:
@@ -80,6 +162,8 @@ def name_api_resources(
 
 
 class KubeClusterGenericResourceDir(Directory):
+    source: ObjectSource
+
     @classmethod
     def create(
         cls,
@@ -93,23 +177,58 @@ class KubeClusterGenericResourceDir(Directory):
         self.context = context
         self.api_resource = api_resource
         self.namespace = namespace
-        self.facade = SyncClusterFacade(async_loop=get_loop(), context=self.context)
-        self.selector = ObjectSelector(res=self.api_resource, namespace=self.namespace)
+        self.facade = ScheduledClusterFacade(
+            async_loop=get_loop(), context=self.context
+        )
+        self.selector = ObjectSelector(
+            res=self.api_resource,
+            namespace=self.namespace,
+            projection=DropManagedFields,
+        )
+        self.source = ObjectSource(facade=self.facade, api_resource=self.api_resource)
         return self
 
+    def get_watch(self) -> Optional[ResourceWatch]:
+        "Returns None unless in watch mode"
+
+        assert self.context is not None  # help mypy
+        assert self.api_resource is not None  # help mypy
+
+        watches = ResourceWatches.get_instance()
+        if watches is None or "watch" not in self.api_resource.verbs:
+            return None
+
+        return watches.get_watch(
+            context=self.context,
+            api_resource=self.api_resource,
+            namespace=self.namespace,
+            make_entry=partial(mkfile, source=self.source),
+        )
+
     def get_entries(self):
-        if not self.lazy_entries:
-            items = self.facade.list_objects(selector=self.selector)
+        watch = self.get_watch()
+        if watch is not None:
+            entries = watch.get_entries()
+            if entries is not self._lazy_entries:
+                self.set_lazy_entries(entries, lifetime=ONE_DAY)
 
-            files = []
-            for item in items:
-                payload = mkpayload(obj=item)
-                files.append(File(payload=payload))
+            return entries
+
+        if self.lazy_entries is None:
+            items = self.facade.list_objects(selector=self.selector)
 
+            files = [mkfile(item, source=self.source) for item in items]
             self.set_lazy_entries(files)
 
         return self.lazy_entries
 
+    def get_entries_deadline(self) -> float:
+        # lookups are cached briefly, get_entries() applies the latest events
+        if self.get_watch() is not None:
+            return time.time() + WATCH_SYNC_INTERVAL
+
+        return super().get_entries_deadline()
+
 
 class KubeClusterNamespaceDir(Directory):
     @classmethod
@@ -117,11 +236,13 @@ class KubeClusterNamespaceDir(Directory):
         self = cls(payload=payload)
         self.context = context
         self.namespace = namespace
-        self.facade = SyncClusterFacade(async_loop=get_loop(), context=self.context)
+        self.facade = ScheduledClusterFacade(
+            async_loop=get_loop(), context=self.context
+        )
         return self
 
     def get_entries(self):
-        if not self.lazy_entries:
+        if self.lazy_entries is None:
             api_resources = self.facade.list_api_resources()
             pairs = name_api_resources(api_resources, want_namespaced_only=True)
 
@@ -140,6 +261,11 @@ class KubeClusterNamespaceDir(Directory):
             # api resources almost never change
             self.set_lazy_entries(dirs, lifetime=ONE_DAY)
 
+            # the resources in the namespace are likely to be read next
+            prefetcher = Prefetcher.get_instance()
+            if prefetcher is not None:
+                prefetcher.prefetch(dirs)
+
         return self.lazy_entries
 
 
@@ -148,12 +274,17 @@ class KubeClusterNamespacesDir(Directory):
     def create(cls, *, payload: Payload, context: Context):
         self = cls(payload=payload)
         self.context = context
-        self.facade = SyncClusterFacade(async_loop=get_loop(), context=self.context)
-        self.selector = ObjectSelector(res=NamespaceKind)
+        self.facade = ScheduledClusterFacade(
+            async_loop=get_loop(), context=self.context
+        )
+        # we only need the names
+        self.selector = ObjectSelector(
+            res=NamespaceKind, projection=Projection(keep=[])
+        )
         return self
 
     def get_entries(self):
-        if not self.lazy_entries:
+        if self.lazy_entries is None:
             items = self.facade.list_objects(selector=self.selector)
 
             dirs = []
@@ -1,5 +1,4 @@
 from kube.async_loop import get_loop
-from kube.cluster_facade import SyncClusterFacade
 from kube.config import Context, KubeConfigCollection
 from kubefs.fs_kubecluster import (
     KubeClusterGenericResourceDir,
@@ -7,6 +6,8 @@ from kubefs.fs_kubecluster import (
     name_api_resources,
 )
 from kubefs.fs_model import ONE_DAY, Directory, File, Payload
+from kubefs.prefetch import Prefetcher
+from kubefs.scheduler import ScheduledClusterFacade
 
 
 class KubeConfigClusterDir(Directory):
@@ -14,11 +15,18 @@ class KubeConfigClusterDir(Directory):
     def create(cls, *, payload: Payload, context: Context):
         self = cls(payload=payload)
         self.context = context
-        self.facade = SyncClusterFacade(async_loop=get_loop(), context=self.context)
+        # there is one of these per context at the root, only set up the ones
+        # that are used
+        self.facade = None
         return self
 
     def get_entries(self):
-        if not self.lazy_entries:
+        if self.lazy_entries is None:
+            if self.facade is None:
+                self.facade = ScheduledClusterFacade(
+                    async_loop=get_loop(), context=self.context
+                )
+
             # special handling for namespaces
             payload = Payload(name="namespaces")
             dir = KubeClusterNamespacesDir.create(
@@ -43,6 +51,11 @@ class KubeConfigClusterDir(Directory):
             # api resources almost never change
             self.set_lazy_entries(dirs, lifetime=ONE_DAY)
 
+            # the resources in the cluster are likely to be read next
+            prefetcher = Prefetcher.get_instance()
+            if prefetcher is not None:
+                prefetcher.prefetch(dirs)
+
         return self.lazy_entries
 
 
@@ -54,7 +67,7 @@ class KubeConfigClustersDir(Directory):
         return self
 
     def get_entries(self):
-        if not self.lazy_entries:
+        if self.lazy_entries is None:
             dirs = []
             for context in self.config.contexts.values():
                 payload = Payload(
@@ -79,7 +92,7 @@ class KubeConfigContextDir(Directory):
         return self
 
     def get_entries(self):
-        if not self.lazy_entries:
+        if self.lazy_entries is None:
             dirs = []
 
             cluster = self.context.cluster
@@ -107,7 +120,7 @@ class KubeConfigContextsDir(Directory):
         return self
 
     def get_entries(self):
-        if not self.lazy_entries:
+        if self.lazy_entries is None:
             dirs = []
             for context in self.config.contexts.values():
                 payload = Payload(
@@ -136,7 +149,7 @@ class KubeConfigUserDir(Directory):
         return self
 
     def get_entries(self):
-        if not self.lazy_entries:
+        if self.lazy_entries is None:
             files = []
 
             for attname in self.context.user.get_attribute_names():
@@ -169,7 +182,7 @@ class KubeConfigUsersDir(Directory):
         return self
 
     def get_entries(self):
-        if not self.lazy_entries:
+        if self.lazy_entries is None:
             dirs = []
             for context in self.config.contexts.values():
                 payload = Payload(
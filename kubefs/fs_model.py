@@ -1,19 +1,44 @@
+import itertools
 import logging
+import math
 import os
 import stat
+import threading
 import time
-from typing import Dict, Iterable, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from kube.cluster_facade import SyncClusterFacade
 from kube.config import Context, KubeConfigCollection
 from kube.model.api_resource import ApiResource
 from kube.model.selector import ObjectSelector
+from kubefs.scheduler import RequestClass, request_class
 
 logger = logging.getLogger("fs_model")
 
 
 ONE_DAY = 3600 * 24
 
+# every time a directory gets new entries they get a version of their own,
+# which invalidates the lookups through the directory cached in the PathCache
+_entries_versions = itertools.count(1)
+
+
+# how long after they expire entries are still returned while they are
+# refreshed in the background, 0 to always wait for the refresh
+DEFAULT_MAX_STALE = 300.0
+
+# how long to keep serving stale entries before retrying a failed refresh
+REFRESH_RETRY_DELAY = 10.0
+
+# the background refreshes, which block on the api server
+_refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="Refresh")
+
+# set on the thread of a background refresh, so that lazy_entries reports the
+# expired entries as missing and get_entries() loads them again. Holds the time
+# the refresh started
+_refreshing = threading.local()
+
 
 class Payload:
     """A simple wrapper type for all the attributes that a File / Directory
@@ -46,6 +71,11 @@ class Payload:
 
 
 class AbstractEntry:
+    # extended attributes, see get_xattrs()
+    XATTR_AGE = "user.kubefs.age"
+    XATTR_STALE = "user.kubefs.stale"
+    XATTR_REFRESH_ERROR = "user.kubefs.refresh_error"
+
     def __init__(self) -> None:
 
         self.name: str = ""
@@ -62,8 +92,13 @@ class AbstractEntry:
     def get_attributes(self) -> Dict[str, Union[int, float]]:
         raise NotImplemented
 
+    def get_xattrs(self) -> Dict[str, str]:
+        return {}
+
 
 class Directory(AbstractEntry):
+    max_stale: float = DEFAULT_MAX_STALE
+
     def __init__(
         self, *, payload: Payload, entries: Iterable[AbstractEntry] = None
     ) -> None:
@@ -74,6 +109,24 @@ class Directory(AbstractEntry):
         self._lazy_entries_loaded_time: float = 0
         self._lazy_entries_lifetime: int = 60  # in seconds
 
+        # changes whenever the directory gets new entries
+        self.entries_version = next(_entries_versions)
+
+        self._load_lock = threading.Lock()
+
+        # held only to replace the entries, never while they are loaded
+        self._swap_lock = threading.Lock()
+
+        # one background refresh at a time
+        self._refresh_lock = threading.Lock()
+        self._refresh_pending = False
+        self._refresh_error: Optional[Exception] = None
+        self._refresh_retry_time: float = 0
+
+        # the entries last indexed, and their index by name
+        self._index: Tuple[Optional[Iterable[AbstractEntry]], Dict[str, AbstractEntry]]
+        self._index = (None, {})
+
         self.atts = dict(
             st_mode=(stat.S_IFDIR | 0o755),
             st_nlink=2,
@@ -86,19 +139,34 @@ class Directory(AbstractEntry):
         )
 
     @property
-    def lazy_entries(self):
-        if not self._lazy_entries:
-            return []
+    def lazy_entries(self) -> Optional[List[AbstractEntry]]:
+        "Returns None if the entries have to be (re)loaded, they may be empty"
+
+        if not self._lazy_entries_loaded_time:
+            return None
 
         elapsed = time.time() - self._lazy_entries_loaded_time
         if elapsed > self._lazy_entries_lifetime:
+            if (
+                getattr(_refreshing, "started", None) is None
+                and elapsed < self._lazy_entries_lifetime + self.max_stale
+            ):
+                logger.debug(
+                    "dir %r returning stale entries (%ds elapsed > %ds lifetime)",
+                    self.name,
+                    elapsed,
+                    self._lazy_entries_lifetime,
+                )
+                self.refresh_in_background()
+                return self._lazy_entries
+
             logger.debug(
                 "dir %r cached entries expired (%ds elapsed > %ds lifetime)",
                 self.name,
                 elapsed,
                 self._lazy_entries_lifetime,
             )
-            return []
+            return None
 
         logger.debug(
             "dir %r returning cached entries (%ds since last load < %ds lifetime)",
@@ -109,29 +177,127 @@ class Directory(AbstractEntry):
         return self._lazy_entries
 
     def set_lazy_entries(self, entries, lifetime=60) -> None:
-        self._lazy_entries = entries
-        self._lazy_entries_loaded_time = time.time()
-        self._lazy_entries_lifetime = lifetime
+        with self._swap_lock:
+            # a fuse thread loaded the entries while the refresh was listing
+            # them, and its entries are the newer ones
+            started = getattr(_refreshing, "started", None)
+            if started is not None and self._lazy_entries_loaded_time > started:
+                return
+
+            self._lazy_entries = entries
+            self._lazy_entries_loaded_time = time.time()
+            self._lazy_entries_lifetime = lifetime
+            self.entries_version = next(_entries_versions)
+
+    def refresh_in_background(self) -> None:
+        with self._refresh_lock:
+            if self._refresh_pending or time.time() < self._refresh_retry_time:
+                return
+
+            self._refresh_pending = True
+
+        _refresher.submit(self.refresh)
+
+    def refresh(self) -> None:
+        _refreshing.started = time.time()
+
+        try:
+            # not through load_entries(), fuse threads that load the entries
+            # meanwhile get the stale ones instead of waiting for the refresh
+            with request_class(RequestClass.REVALIDATE):
+                self.get_entries()
+
+            self._refresh_error = None
+
+        # keep serving the stale entries, the age shows how old they are
+        except Exception as exc:
+            logger.warn("dir %r failed to refresh its entries: %r", self.name, exc)
+            self._refresh_error = exc
+            self._refresh_retry_time = time.time() + REFRESH_RETRY_DELAY
+
+        finally:
+            _refreshing.started = None
+            with self._refresh_lock:
+                self._refresh_pending = False
 
     def get_entries(self) -> Iterable[AbstractEntry]:
         return self._entries
 
+    def load_entries(self) -> Iterable[AbstractEntry]:
+        """get_entries(), except that a thread which finds the entries being
+        loaded waits for them instead of loading them again, and replacing the
+        dirs the other thread returned"""
+
+        with self._load_lock:
+            return self.get_entries()
+
+    def set_entries(self, entries: Iterable[AbstractEntry]) -> None:
+        self._entries = entries
+        self.entries_version = next(_entries_versions)
+
+    def get_entries_deadline(self) -> float:
+        """Returns the time until which get_entries() returns the same entries,
+        or 0 if it loads them on every call"""
+
+        if self._lazy_entries_loaded_time:
+            return self._lazy_entries_loaded_time + self._lazy_entries_lifetime
+
+        if self._entries:
+            return math.inf
+
+        return 0.0
+
+    def is_loaded(self) -> bool:
+        """Whether the entries are loaded and not expired. Unlike
+        get_entries_deadline() this never starts loading or watching them"""
+
+        if self._lazy_entries_loaded_time:
+            elapsed = time.time() - self._lazy_entries_loaded_time
+            return elapsed <= self._lazy_entries_lifetime
+
+        return bool(self._entries)
+
     def get_attributes(self):
         return self.atts
 
+    def get_xattrs(self) -> Dict[str, str]:
+        if not self._lazy_entries_loaded_time:
+            return {}
+
+        age = time.time() - self._lazy_entries_loaded_time
+        xattrs = {
+            self.XATTR_AGE: "%.0f" % age,
+            self.XATTR_STALE: "1" if age > self._lazy_entries_lifetime else "0",
+        }
+
+        if self._refresh_error is not None:
+            xattrs[self.XATTR_REFRESH_ERROR] = repr(self._refresh_error)
+
+        return xattrs
+
     def get_entry_names(self) -> List[str]:
-        names = [entry.name for entry in self.get_entries()]
+        names = [entry.name for entry in self.load_entries()]
         return names
 
     def get_entry_by_name(self, entry_name: str) -> Optional[AbstractEntry]:
-        for entry in self.get_entries():
-            if entry.name == entry_name:
-                return entry
+        entries = self.load_entries()
+
+        # index the entries once for every time they are (re)loaded
+        indexed, index = self._index
+        if indexed is not entries:
+            index = {}
+            for entry in entries:
+                index.setdefault(entry.name, entry)
+            self._index = (entries, index)
 
-        return None
+        return index.get(entry_name)
 
 
 class File(AbstractEntry):
+    # whether reads may come up short of st_size, the file is then opened with
+    # direct_io so that the kernel does not pad them with zeroes
+    direct_io: bool = False
+
     def __init__(self, *, payload: Payload) -> None:
         self.name = payload.name
         self.data = payload.data
@@ -150,5 +316,8 @@ class File(AbstractEntry):
     def get_attributes(self):
         return self.atts
 
+    def get_data(self) -> bytes:
+        return self.data
+
     def read(self, size: int, offset: int) -> bytes:
-        return self.data[offset : offset + size]
+        return self.get_data()[offset : offset + size]
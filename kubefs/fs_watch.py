@@ -0,0 +1,309 @@
+"""
+Resource directories kept up to date by watches.
+
+In this mode a resource directory lists its objects once, and from then on a
+watch applies the ADDED, MODIFIED and DELETED events to its entries, so that
+listing it again costs no requests. The events are applied by whoever reads
+the directory next, there is no thread per watch. The watches of directories
+that have not been read for a while are stopped.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kube.async_loop import get_loop
+from kube.channels.objects import OEvReceiver
+from kube.cluster_facade import SyncClusterFacade
+from kube.config import Context
+from kube.events.objects import Action, ObjectEvent
+from kube.model.api_resource import ApiResource
+from kube.model.projection import DropManagedFields
+from kube.model.selector import ObjectSelector
+from kubefs.fs_model import AbstractEntry
+from kubefs.scheduler import ScheduledClusterFacade
+
+# stop watching a directory not read for this long
+WATCH_MAX_IDLE = 120.0
+
+# how long a lookup under a watched directory may be cached, see PathCache
+WATCH_SYNC_INTERVAL = 1.0
+
+EntryFactory = Callable[[Any], AbstractEntry]
+
+# context, api group endpoint, resource name, namespace
+WatchKey = Tuple[Context, str, str, Optional[str]]
+
+
+def get_resource_version(obj: Any) -> int:
+    "Returns 0 if the object has no (numeric) resource version"
+
+    try:
+        return int(obj["metadata"].get("resourceVersion") or 0)
+    except ValueError:
+        return 0
+
+
+class ResourceWatch:
+    def __init__(
+        self,
+        *,
+        facade: SyncClusterFacade,
+        selector: ObjectSelector,
+        make_entry: EntryFactory,
+        logger=None,
+    ) -> None:
+        self.facade = facade
+        self.selector = selector
+        self.make_entry = make_entry
+        self.logger = logger or logging.getLogger("fs_watch")
+
+        self.lock = threading.Lock()
+        self.receiver: Optional[OEvReceiver] = None
+
+        # object name -> (resource version, entry)
+        self.entries: Dict[str, Tuple[int, AbstractEntry]] = {}
+        self.entry_list: List[AbstractEntry] = []
+
+        # the resourceVersion of the last list, the events up to it are in it
+        self.list_version = 0
+
+        self.needs_relist = True
+        self.is_stopped = False
+        self.last_used = time.monotonic()
+
+        self.lists = 0
+        self.events = 0
+
+    def __repr__(self) -> str:
+        return "<%s selector=%r, entries=%r, lists=%r, events=%r, is_stopped=%r>" % (
+            self.__class__.__name__,
+            self.selector.pretty(),
+            len(self.entries),
+            self.lists,
+            self.events,
+            self.is_stopped,
+        )
+
+    def get_entries(self) -> List[AbstractEntry]:
+        """Applies the events received since the last call. Returns the same
+        list for as long as nothing changed."""
+
+        with self.lock:
+            self.last_used = time.monotonic()
+
+            # a directory that was evicted while being read
+            if self.is_stopped:
+                return self.entry_list
+
+            changed = False
+
+            if self.needs_relist:
+                changed = self.relist()
+
+            # the client starts the watch from the version of the list
+            if self.receiver is None:
+                self.receiver = self.facade.start_watching(selector=self.selector)
+
+            while True:
+                event = self.receiver.recv_nowait()
+                if event is None:
+                    break
+
+                changed = self.apply_event(event) or changed
+
+            # the watch failed, it may have missed events while reconnecting
+            if self.needs_relist:
+                changed = self.relist() or changed
+
+            if changed:
+                self.entry_list = [entry for _, entry in self.entries.values()]
+
+            return self.entry_list
+
+    def relist(self) -> bool:
+        items, self.list_version = self.facade.list_objects_with_version(
+            selector=self.selector
+        )
+        self.lists += 1
+
+        self.entries = {
+            item["metadata"]["name"]: (
+                get_resource_version(item),
+                self.make_entry(item),
+            )
+            for item in items
+        }
+        self.needs_relist = False
+        return True
+
+    def apply_event(self, event: ObjectEvent) -> bool:
+        "Returns True if the entries changed"
+
+        if event.action is Action.DEGRADED:
+            self.needs_relist = True
+            return False
+
+        obj = event.object
+        if not isinstance(obj, dict):
+            return False
+
+        self.events += 1
+
+        name = obj["metadata"]["name"]
+        version = get_resource_version(obj)
+
+        # events queued before a relist are older than what it returned, even
+        # for objects that are no longer there
+        if version and version <= self.list_version:
+            return False
+
+        current = self.entries.get(name)
+        if current is not None and version and version < current[0]:
+            return False
+
+        if event.action is Action.DELETED:
+            return self.entries.pop(name, None) is not None
+
+        self.entries[name] = (version, self.make_entry(obj))
+        return True
+
+    def stop(self) -> None:
+        with self.lock:
+            self.is_stopped = True
+
+            if self.receiver is None:
+                return
+
+            # the cluster loop, and its watches, may be gone already
+            try:
+                self.facade.stop_watching(selector=self.selector)
+            except Exception as exc:
+                self.logger.warn("Failed to stop watch %r: %r", self, exc)
+
+            self.receiver = None
+
+    def abandon(self) -> None:
+        "Stops using the watch, which went with its cluster loop"
+
+        with self.lock:
+            self.is_stopped = True
+            self.receiver = None
+
+
+class ResourceWatches:
+    """The watches of the resource directories, by resource. Installed with
+    start() to turn watch mode on."""
+
+    _instance: Optional["ResourceWatches"] = None
+
+    def __init__(self, *, max_idle: float = WATCH_MAX_IDLE, logger=None) -> None:
+        self.max_idle = max_idle
+        self.logger = logger or logging.getLogger("fs_watch")
+
+        self.watches: Dict[WatchKey, ResourceWatch] = {}
+        self.lock = threading.Lock()
+
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return "<%s watches=%r, max_idle=%r>" % (
+            self.__class__.__name__,
+            len(self.watches),
+            self.max_idle,
+        )
+
+    @classmethod
+    def get_instance(cls) -> Optional["ResourceWatches"]:
+        "Returns None unless watch mode is on"
+        return cls._instance
+
+    def start(self) -> None:
+        self.__class__._instance = self
+
+        self.thread = threading.Thread(
+            target=self.run, name="WatchEvictor", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.__class__._instance = None
+        self.stopped.set()
+
+        with self.lock:
+            watches = list(self.watches.values())
+            self.watches.clear()
+
+        for watch in watches:
+            watch.stop()
+
+    def get_watch(
+        self,
+        *,
+        context: Context,
+        api_resource: ApiResource,
+        namespace: Optional[str],
+        make_entry: EntryFactory,
+    ) -> ResourceWatch:
+        # shared by all the directory objects for the same resource, which
+        # are recreated when their parent reloads
+        key = (context, api_resource.group.endpoint, api_resource.name, namespace)
+
+        with self.lock:
+            watch = self.watches.get(key)
+
+            if watch is None:
+                watch = ResourceWatch(
+                    facade=ScheduledClusterFacade(
+                        async_loop=get_loop(), context=context
+                    ),
+                    selector=ObjectSelector(
+                        res=api_resource,
+                        namespace=namespace,
+                        projection=DropManagedFields,
+                    ),
+                    make_entry=make_entry,
+                    logger=self.logger,
+                )
+                self.watches[key] = watch
+
+        return watch
+
+    def evict_idle(self) -> List[ResourceWatch]:
+        now = time.monotonic()
+
+        with self.lock:
+            keys = [
+                key
+                for key, watch in self.watches.items()
+                if now - watch.last_used > self.max_idle
+            ]
+            evicted = [self.watches.pop(key) for key in keys]
+
+        for watch in evicted:
+            watch.stop()
+
+        return evicted
+
+    def forget(self, context: Context) -> None:
+        """Drops the watches of a context removed from the kube config. They
+        are stopped with its cluster loop, not one by one."""
+
+        with self.lock:
+            keys = [key for key in self.watches if key[0] == context]
+            forgotten = [self.watches.pop(key) for key in keys]
+
+        for watch in forgotten:
+            watch.abandon()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.max_idle / 4):
+            evicted = self.evict_idle()
+            if evicted:
+                self.logger.info(
+                    "Stopped watches idle for %ss: %s",
+                    self.max_idle,
+                    ", ".join(watch.selector.pretty() for watch in evicted),
+                )
@@ -1,18 +1,48 @@
 #!/usr/bin/env python
 
 import errno
+import math
 import os
+from threading import Lock
+from typing import Optional, Tuple
 
 import fuse
 
-from kube.config import KubeConfigLoader
+from kube.async_loop import get_loop
+from kube.config import Context, get_selector
+from kube.config_watch import ConfigChange, KubeConfigWatcher, watch_configs
 from kubefs.fs_kubeconfig import (
     KubeConfigClusterDir,
     KubeConfigClustersDir,
     KubeConfigContextsDir,
     KubeConfigUsersDir,
 )
-from kubefs.fs_model import Directory, Payload
+from kubefs.fs_model import (
+    DEFAULT_MAX_STALE,
+    AbstractEntry,
+    Directory,
+    File,
+    Payload,
+)
+from kubefs.fs_watch import WATCH_MAX_IDLE, ResourceWatches
+from kubefs.path_cache import DirVersions, PathCache
+from kubefs.payload_store import PAYLOAD_BUDGET, PAYLOAD_STORE
+from kubefs.prefetch import PRIORITY_WARM, Prefetcher
+from kubefs.scheduler import SCHEDULER, RequestCancelled, RequestClass, request_class
+
+# stop the cluster loop (session, watches) of a cluster not used for this long
+MAX_IDLE = 300.0
+
+
+def fuse_interrupted() -> bool:
+    "Whether the kernel gave up on the fuse request handled on this thread"
+
+    # mounted with -o intr, fusepy has no wrapper for it
+    libfuse = getattr(fuse, "_libfuse", None)
+    if libfuse is None:
+        return False
+
+    return bool(libfuse.fuse_interrupted())
 
 
 class kubefs(fuse.LoggingMixIn, fuse.Operations):
@@ -21,46 +51,170 @@ class kubefs(fuse.LoggingMixIn, fuse.Operations):
         "..",
     ]
 
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        max_idle: float = MAX_IDLE,
+        max_stale: float = DEFAULT_MAX_STALE,
+        payload_budget: int = PAYLOAD_BUDGET,
+        watch: bool = False,
+        watch_max_idle: float = WATCH_MAX_IDLE,
+        prefetch: bool = False,
+        warm: bool = False,
+    ):
         self.basepath = os.sep
 
-        loader = KubeConfigLoader()
-        config = loader.create_collection()
+        # the kube configs are loaded on first access, so that mounting is
+        # quick however many contexts there are
+        self.tree = Directory(payload=Payload(name=""))
+        self.tree_lock = Lock()
+        self.config_watcher: Optional[KubeConfigWatcher] = None
+
+        self.path_cache = PathCache()
+
+        # serve expired listings while they are refreshed in the background
+        Directory.max_stale = max_stale
+
+        PAYLOAD_STORE.set_budget(payload_budget)
+
+        async_loop = get_loop()
+        async_loop.launch_coro(async_loop.reap_idle_cluster_loops(max_idle=max_idle))
+
+        # keep resource directories up to date with watches instead of
+        # listing them again when they expire
+        if watch:
+            ResourceWatches(max_idle=watch_max_idle).start()
+
+        # list the resources of the clusters and namespaces that are opened in
+        # the background, and with warm crawl whole clusters right away
+        if prefetch or warm:
+            prefetcher = Prefetcher()
+            prefetcher.start()
+
+            if warm:
+                entries = self.get_tree().get_entries()
+                prefetcher.prefetch(entries, priority=PRIORITY_WARM, recursive=True)
+
+    def __call__(self, op, *args):
+        # the requests made for a fuse operation go ahead of the others, and
+        # stop waiting if the kernel gives up on it
+        with request_class(RequestClass.INTERACTIVE, is_abandoned=fuse_interrupted):
+            try:
+                return super().__call__(op, *args)
+            except RequestCancelled:
+                raise fuse.FuseOSError(errno.EINTR)
+
+    def get_tree(self) -> Directory:
+        if self.config_watcher is None:
+            with self.tree_lock:
+                if self.config_watcher is None:
+                    self.load_tree()
+
+        return self.tree
+
+    def load_tree(self) -> None:
+        selector = get_selector()
 
         # show all the clusters as dirs at the root of the filesystem
-        dirs = []
-        for context in config.contexts.values():
-            payload = Payload(
-                name=context.short_name,
-                ctime=context.file.ctime,
-                mtime=context.file.mtime,
-                atime=context.file.atime,
-            )
-            dir = KubeConfigClusterDir.create(payload=payload, context=context)
-            dirs.append(dir)
-
-        self.tree = Directory(
-            payload=Payload(name=""),
-            entries=dirs,
+        dirs = [
+            self.create_cluster_dir(context)
+            for context in selector.collection.contexts.values()
+        ]
+        self.tree.set_entries(dirs)
+
+        # add and remove dirs as contexts are added to and removed from the
+        # kube config
+        self.config_watcher = watch_configs(
+            selector=selector, on_change=self.apply_config_change
         )
 
+    def create_cluster_dir(self, context: Context) -> Directory:
+        payload = Payload(
+            name=context.short_name,
+            ctime=context.file.ctime,
+            mtime=context.file.mtime,
+            atime=context.file.atime,
+        )
+        return KubeConfigClusterDir.create(payload=payload, context=context)
+
+    def apply_config_change(self, change: ConfigChange) -> None:
+        "Called on the config watcher thread"
+
+        removed = set(change.removed)
+        entries = [
+            entry for entry in self.tree.get_entries() if entry.context not in removed
+        ]
+        entries.extend(self.create_cluster_dir(context) for context in change.added)
+
+        # replaced in one go, fuse threads see either the old or the new list
+        self.tree.set_entries(entries)
+
+        prefetcher = Prefetcher.get_instance()
+        if prefetcher is not None:
+            for context in change.removed:
+                prefetcher.forget(context)
+
+        watches = ResourceWatches.get_instance()
+        if watches is not None:
+            for context in change.removed:
+                watches.forget(context)
+
+        for context in change.removed:
+            SCHEDULER.forget(context)
+
+        async_loop = get_loop()
+        for context in change.removed:
+            async_loop.launch_coro(async_loop.stop_cluster_loop(context))
+
     def find_matching_entry(self, path):
+        tree = self.get_tree()
         if path == os.sep:
-            return self.tree
+            return tree
+
+        found, entry = self.path_cache.get(path)
+        if found:
+            return entry
+
+        entry, deadline, versions = self.walk_tree(tree, path)
+        self.path_cache.put(path, entry, versions=versions, deadline=deadline)
+
+        return entry
+
+    def walk_tree(
+        self, tree: Directory, path: str
+    ) -> Tuple[Optional[AbstractEntry], float, DirVersions]:
+        """Returns the entry, the time until which the dirs on its path are
+        valid, and the versions of their entries"""
 
         # /clusters/cluster-1/pods/fst -> clusters/cluster-1/pods/fst
         _, relpath = path.split(self.basepath, 1)
-        containing = self.tree
+        containing: Optional[AbstractEntry] = tree
+        deadline = math.inf
+
+        # taken before looking in a dir, if the lookup reloads it the result
+        # is cached the next time
+        versions: DirVersions = []
 
         # recurse up the tree until we find the entry in its containing dir
         while os.sep in relpath:
             # clusters/cluster-1/pods/fst -> (clusters, cluster-1/pods/fst)
             topdir, relpath = relpath.split(os.sep, 1)
-            containing = containing.get_entry_by_name(topdir)
 
-        if containing:
-            entry = containing.get_entry_by_name(relpath)
-            return entry
+            if not isinstance(containing, Directory):
+                return None, deadline, versions
+
+            versions.append((containing, containing.entries_version))
+            entry = containing.get_entry_by_name(topdir)
+            deadline = min(deadline, containing.get_entries_deadline())
+            containing = entry
+
+        if not isinstance(containing, Directory):
+            return None, deadline, versions
+
+        versions.append((containing, containing.entries_version))
+        entry = containing.get_entry_by_name(relpath)
+        deadline = min(deadline, containing.get_entries_deadline())
+        return entry, deadline, versions
 
     def readdir(self, path, fh):
         entry = self.find_matching_entry(path)
@@ -78,6 +232,36 @@ class kubefs(fuse.LoggingMixIn, fuse.Operations):
 
         return entry.get_attributes()
 
+    def getxattr(self, path, name, position=0):
+        entry = self.find_matching_entry(path)
+        if not entry:
+            raise fuse.FuseOSError(errno.ENOENT)
+
+        value = entry.get_xattrs().get(name)
+        if value is None:
+            raise fuse.FuseOSError(errno.ENODATA)
+
+        return value.encode()
+
+    def listxattr(self, path):
+        entry = self.find_matching_entry(path)
+        if not entry:
+            raise fuse.FuseOSError(errno.ENOENT)
+
+        return list(entry.get_xattrs().keys())
+
+    def open(self, path, fi):
+        "Mounted with raw_fi, fi is the fuse_file_info"
+
+        entry = self.find_matching_entry(path)
+        if not entry:
+            raise fuse.FuseOSError(errno.ENOENT)
+
+        if isinstance(entry, File) and entry.direct_io:
+            fi.direct_io = True
+
+        return 0
+
     def read(self, path, size, offset, fh):
         entry = self.find_matching_entry(path)
         if not entry:
@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from kubefs.fs_model import AbstractEntry, Directory
+
+# enough for an `ls -l` of a directory with tens of thousands of objects
+PATH_CACHE_SIZE = 65536
+
+# the directories on the path of a lookup, and the versions of their entries
+# when they were looked in
+DirVersions = List[Tuple[Directory, int]]
+
+
+class PathCacheEntry:
+    __slots__ = ("entry", "versions", "deadline")
+
+    def __init__(
+        self,
+        *,
+        entry: Optional[AbstractEntry],
+        versions: DirVersions,
+        deadline: float,
+    ) -> None:
+        self.entry = entry
+        self.versions = versions
+        self.deadline = deadline
+
+    def is_current(self) -> bool:
+        for dir, version in self.versions:
+            if dir.entries_version != version:
+                return False
+
+        return True
+
+
+class PathCache:
+    """The entries found for paths, and the paths that were not found, so
+    that `ls -l` and the probes shells and editors make for files like .git
+    do not walk the tree for every call.
+
+    A lookup is valid until one of the directories on its path gets new
+    entries (see Directory.entries_version), or would reload them."""
+
+    def __init__(self, *, maxsize: int = PATH_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[str, PathCacheEntry]" = OrderedDict()
+        self.lock = Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return "<%s entries=%r, hits=%r, negative_hits=%r, misses=%r>" % (
+            self.__class__.__name__,
+            len(self.entries),
+            self.hits,
+            self.negative_hits,
+            self.misses,
+        )
+
+    def get(self, path: str) -> Tuple[bool, Optional[AbstractEntry]]:
+        "Returns (found, entry), where entry is None if the path does not exist"
+
+        with self.lock:
+            cached = self.entries.get(path)
+
+            if (
+                cached is None
+                or cached.deadline <= time.time()
+                or not cached.is_current()
+            ):
+                self.misses += 1
+                return False, None
+
+            self.entries.move_to_end(path)
+
+            if cached.entry is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+
+            return True, cached.entry
+
+    def put(
+        self,
+        path: str,
+        entry: Optional[AbstractEntry],
+        *,
+        versions: DirVersions,
+        deadline: float,
+    ) -> None:
+        if deadline <= time.time():
+            return
+
+        with self.lock:
+            self.entries[path] = PathCacheEntry(
+                entry=entry, versions=versions, deadline=deadline
+            )
+            self.entries.move_to_end(path)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
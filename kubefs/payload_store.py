@@ -0,0 +1,236 @@
+"""
+A memory budget for the contents of kubefs files.
+
+The objects of the files are kept here rather than in the files, by their
+(uid, resourceVersion), in two LRUs that each get half the budget:
+
+- hot: objects as they were listed, and the json rendered for the files
+  that were read
+- cold: the rendered json of files pushed out of hot, compressed
+
+Objects pushed out of hot before their file was read are dropped rather than
+rendered, most never are. What is dropped, from hot or from cold, is fetched
+from the api server again if its file is read.
+"""
+
+import zlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, List, Optional, Tuple
+
+from kubefs.text import to_json
+
+# in bytes, split between hot and cold
+PAYLOAD_BUDGET = 256 * 1024 * 1024
+
+# the size we assume for an object not rendered yet, until we have rendered a
+# few and know better
+ESTIMATED_SIZE = 4096
+
+# the memory a parsed object takes, as a multiple of the size of its json
+RAW_OBJECT_FACTOR = 3
+
+COMPRESS_LEVEL = 6
+
+# uid, resourceVersion
+PayloadKey = Tuple[str, str]
+
+
+def get_payload_key(obj: Any) -> Optional[PayloadKey]:
+    "An object does not change for as long as its resourceVersion does not"
+
+    metadata = obj.get("metadata") or {}
+    uid = metadata.get("uid")
+    version = metadata.get("resourceVersion")
+
+    if uid and version:
+        return uid, version
+
+    return None
+
+
+class HotPayload:
+    "An object, and its json once rendered"
+
+    __slots__ = ("obj", "data", "cost")
+
+    def __init__(self, *, obj: Any, data: Optional[bytes], cost: int) -> None:
+        self.obj = obj
+        self.data = data
+        self.cost = cost
+
+
+class PayloadStore:
+    def __init__(self, *, max_bytes: int = PAYLOAD_BUDGET) -> None:
+        self.lock = Lock()
+
+        self.hot: "OrderedDict[PayloadKey, HotPayload]" = OrderedDict()
+        self.cold: "OrderedDict[PayloadKey, bytes]" = OrderedDict()
+        self.hot_bytes = 0
+        self.cold_bytes = 0
+
+        self.hot_budget = 0
+        self.cold_budget = 0
+        self.set_budget(max_bytes)
+
+        # a running average of rendered sizes
+        self.estimated_size = ESTIMATED_SIZE
+
+        self.hits = 0
+        self.renders = 0
+        self.decompressions = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        return (
+            "<%s hot=%r, hot_bytes=%r, cold=%r, cold_bytes=%r, "
+            "hits=%r, renders=%r, decompressions=%r, evictions=%r>"
+        ) % (
+            self.__class__.__name__,
+            len(self.hot),
+            self.hot_bytes,
+            len(self.cold),
+            self.cold_bytes,
+            self.hits,
+            self.renders,
+            self.decompressions,
+            self.evictions,
+        )
+
+    def set_budget(self, max_bytes: int) -> None:
+        with self.lock:
+            self.hot_budget = max_bytes // 2
+            self.cold_budget = max_bytes - self.hot_budget
+            pushed_out = self.shrink_hot()
+            self.shrink_cold()
+
+        self.push_cold(pushed_out)
+
+    def add_object(self, key: PayloadKey, obj: Any) -> None:
+        "Keeps an object until its file is read"
+
+        with self.lock:
+            # the same version of the object, listed again
+            if key in self.hot or key in self.cold:
+                return
+
+            cost = self.estimated_size * RAW_OBJECT_FACTOR
+            self.hot[key] = HotPayload(obj=obj, data=None, cost=cost)
+            self.hot_bytes += cost
+            pushed_out = self.shrink_hot()
+
+        self.push_cold(pushed_out)
+
+    def get(self, key: PayloadKey) -> Optional[bytes]:
+        "Returns None if the payload was evicted"
+
+        with self.lock:
+            payload = self.hot.get(key)
+            if payload is not None:
+                self.hot.move_to_end(key)
+                if payload.data is not None:
+                    self.hits += 1
+                    return payload.data
+
+            compressed = None
+            if payload is None:
+                compressed = self.cold.pop(key, None)
+                if compressed is None:
+                    return None
+
+                self.cold_bytes -= len(compressed)
+
+        if compressed is not None:
+            data = zlib.decompress(compressed)
+            self.decompressions += 1
+        else:
+            assert payload is not None  # help mypy
+            data = self.render_object(payload.obj)
+
+        self.put_data(key, data)
+        return data
+
+    def render(self, obj: Any) -> bytes:
+        "Renders an object that was fetched rather than listed"
+
+        data = self.render_object(obj)
+
+        key = get_payload_key(obj)
+        if key is not None:
+            self.put_data(key, data)
+
+        return data
+
+    def render_object(self, obj: Any) -> bytes:
+        data = to_json(obj).encode()
+
+        self.renders += 1
+        self.estimated_size = (self.estimated_size * 15 + len(data)) // 16
+
+        return data
+
+    def put_data(self, key: PayloadKey, data: bytes) -> None:
+        with self.lock:
+            previous = self.hot.pop(key, None)
+            if previous is not None:
+                self.hot_bytes -= previous.cost
+
+            compressed = self.cold.pop(key, None)
+            if compressed is not None:
+                self.cold_bytes -= len(compressed)
+
+            # the object is not needed once rendered
+            self.hot[key] = HotPayload(obj=None, data=data, cost=len(data))
+            self.hot_bytes += len(data)
+            pushed_out = self.shrink_hot()
+
+        self.push_cold(pushed_out)
+
+    def shrink_hot(self) -> List[Tuple[PayloadKey, bytes]]:
+        """Called with the lock held. Returns the rendered json pushed out, to
+        be compressed into cold once the lock is released."""
+
+        pushed_out = []
+
+        while self.hot_bytes > self.hot_budget and self.hot:
+            key, payload = self.hot.popitem(last=False)
+            self.hot_bytes -= payload.cost
+
+            # never read, and most never will be
+            if payload.data is None:
+                self.evictions += 1
+                continue
+
+            pushed_out.append((key, payload.data))
+
+        return pushed_out
+
+    def push_cold(self, pushed_out: List[Tuple[PayloadKey, bytes]]) -> None:
+        if not pushed_out:
+            return
+
+        compressed = [
+            (key, zlib.compress(data, COMPRESS_LEVEL)) for key, data in pushed_out
+        ]
+
+        with self.lock:
+            for key, data in compressed:
+                # read again meanwhile
+                if key in self.hot or key in self.cold:
+                    continue
+
+                self.cold[key] = data
+                self.cold_bytes += len(data)
+
+            self.shrink_cold()
+
+    def shrink_cold(self) -> None:
+        "Called with the lock held"
+
+        while self.cold_bytes > self.cold_budget and self.cold:
+            _, compressed = self.cold.popitem(last=False)
+            self.cold_bytes -= len(compressed)
+            self.evictions += 1
+
+
+PAYLOAD_STORE = PayloadStore()
@@ -0,0 +1,230 @@
+"""
+Listing directories in the background before they are read.
+
+When a cluster or namespace directory is loaded its resource directories are
+queued to be listed, so that a `grep -r` or an `ls` of the next directory does
+not wait for one request after the other. In warm mode whole clusters are
+crawled at mount time.
+
+Prefetching stays out of the way of the fuse operations: its requests are of
+the lowest class in the scheduler, and each cluster gets no more jobs at a time
+than the slots prefetching has there. Directories opened by the user are
+listed ahead of the ones queued by a crawl.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kube.config import Context
+from kubefs.fs_model import AbstractEntry, Directory
+from kubefs.scheduler import DEFAULT_SHARES, SCHEDULER, RequestClass, request_class
+
+# the jobs in flight per cluster
+PREFETCH_CONCURRENCY = DEFAULT_SHARES[RequestClass.PREFETCH]
+
+# the threads that do the lists, for all clusters
+PREFETCH_WORKERS = 8
+
+# the directories under one the user opened
+PRIORITY_OPENED = 0
+# the directories of a crawl
+PRIORITY_WARM = 1
+
+# set on the prefetch threads, so that the directories a prefetch loads queue
+# their own at the priority of the job
+_prefetching = threading.local()
+
+
+class PrefetchJob:
+    def __init__(self, *, dir: Directory, priority: int, recursive: bool) -> None:
+        self.dir = dir
+        self.priority = priority
+        self.recursive = recursive
+
+    def __repr__(self) -> str:
+        return "<%s dir=%r, priority=%r, recursive=%r>" % (
+            self.__class__.__name__,
+            self.dir.name,
+            self.priority,
+            self.recursive,
+        )
+
+
+class Prefetcher:
+    """The queue of directories to list, by cluster. Installed with start() to
+    turn prefetching on."""
+
+    _instance: Optional["Prefetcher"] = None
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = PREFETCH_CONCURRENCY,
+        workers: int = PREFETCH_WORKERS,
+        logger=None,
+    ) -> None:
+        self.concurrency = concurrency
+        self.num_workers = workers
+        self.logger = logger or logging.getLogger("prefetch")
+
+        self.cond = threading.Condition()
+        self.is_stopped = False
+
+        # priority, sequence number, job
+        self.queues: Dict[Context, List[Tuple[int, int, PrefetchJob]]] = {}
+        self.queued: Dict[Directory, PrefetchJob] = {}
+        self.sequence = itertools.count()
+
+        self.running: Dict[Context, int] = {}
+
+        self.threads: List[threading.Thread] = []
+
+        self.prefetched = 0
+        self.failed = 0
+
+    def __repr__(self) -> str:
+        return "<%s queued=%r, prefetched=%r, failed=%r>" % (
+            self.__class__.__name__,
+            len(self.queued),
+            self.prefetched,
+            self.failed,
+        )
+
+    @classmethod
+    def get_instance(cls) -> Optional["Prefetcher"]:
+        "Returns None unless prefetching is on"
+        return cls._instance
+
+    def start(self) -> None:
+        self.__class__._instance = self
+
+        for i in range(self.num_workers):
+            thread = threading.Thread(
+                target=self.run, name="Prefetch-%d" % i, daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self) -> None:
+        self.__class__._instance = None
+
+        with self.cond:
+            self.is_stopped = True
+            self.queues.clear()
+            self.queued.clear()
+            self.cond.notify_all()
+
+    def prefetch(
+        self,
+        entries: Iterable[AbstractEntry],
+        *,
+        priority: int = PRIORITY_OPENED,
+        recursive: bool = False,
+    ) -> None:
+        """Queues the directories among the entries. Those loaded by a prefetch
+        get its priority, recursive jobs queue the directories they list."""
+
+        job: Optional[PrefetchJob] = getattr(_prefetching, "job", None)
+        if job is not None:
+            priority = max(priority, job.priority)
+
+        with self.cond:
+            if self.is_stopped:
+                return
+
+            for entry in entries:
+                if not isinstance(entry, Directory) or entry.context is None:
+                    continue
+
+                queued = self.queued.get(entry)
+                if queued is not None:
+                    queued.recursive = queued.recursive or recursive
+                    continue
+
+                # loaded already, and there is nothing under it to crawl
+                if not recursive and entry.is_loaded():
+                    continue
+
+                job = PrefetchJob(dir=entry, priority=priority, recursive=recursive)
+                item = (priority, next(self.sequence), job)
+                heapq.heappush(self.queues.setdefault(entry.context, []), item)
+                self.queued[entry] = job
+
+            self.cond.notify_all()
+
+    def forget(self, context: Context) -> None:
+        "Drops the jobs of a context removed from the kube config"
+
+        with self.cond:
+            for _, _, job in self.queues.pop(context, []):
+                self.queued.pop(job.dir, None)
+
+    def next_job(self) -> Optional[PrefetchJob]:
+        "Called with the lock held"
+
+        best: Optional[Tuple[int, int, PrefetchJob]] = None
+        for context, queue in self.queues.items():
+            if queue and self.running.get(context, 0) < self.concurrency:
+                if best is None or queue[0] < best:
+                    best = queue[0]
+
+        if best is None:
+            return None
+
+        job = best[2]
+        assert job.dir.context is not None  # help mypy
+        heapq.heappop(self.queues[job.dir.context])
+        return job
+
+    def run(self) -> None:
+        while True:
+            with self.cond:
+                job = self.next_job()
+                while job is None and not self.is_stopped:
+                    self.cond.wait()
+                    job = self.next_job()
+
+                if job is None:
+                    return
+
+                context = job.dir.context
+                assert context is not None  # help mypy
+                self.running[context] = self.running.get(context, 0) + 1
+
+            try:
+                self.run_job(job)
+
+            finally:
+                with self.cond:
+                    self.running[context] -= 1
+                    self.queued.pop(job.dir, None)
+                    self.cond.notify_all()
+
+    def run_job(self, job: PrefetchJob) -> None:
+        assert job.dir.context is not None  # help mypy
+
+        _prefetching.job = job
+
+        try:
+            # the slot is taken before the directory is locked, lookups that
+            # wait for the directory must not wait for prefetching too
+            with request_class(RequestClass.PREFETCH):
+                with SCHEDULER.slot(job.dir.context):
+                    entries = job.dir.load_entries()
+
+            self.prefetched += 1
+
+        # the directory is listed again when it is read
+        except Exception as exc:
+            self.logger.debug("Failed to prefetch %r: %r", job.dir.name, exc)
+            self.failed += 1
+            return
+
+        finally:
+            _prefetching.job = None
+
+        if job.recursive:
+            self.prefetch(entries, priority=job.priority, recursive=True)
@@ -0,0 +1,234 @@
+"""
+The order in which kubefs makes its requests to a cluster.
+
+The requests kubefs makes are of three classes: those a fuse operation waits
+for, the refreshes of expired listings that are served stale meanwhile, and
+prefetching. Each class gets its own number of requests in flight per cluster,
+so that a crawl cannot take the slots a `readdir` needs, and a class waits
+while a class ahead of it is queued on the same cluster.
+
+The class of a request is that of the thread making it, see request_class().
+A thread that holds a slot makes all its requests to the cluster in it, so
+that work done under a lock other threads wait for is not queued again.
+A fuse operation that the kernel gave up on (the user pressed Ctrl+C) stops
+waiting for a slot and fails with RequestCancelled.
+"""
+
+import enum
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from kube.async_loop import AsyncLoop
+from kube.cluster_facade import SyncClusterFacade
+from kube.config import Context
+from kube.model.api_resource import ApiResource
+from kube.model.selector import ObjectSelector
+
+
+class RequestClass(enum.Enum):
+    # in order of priority
+    INTERACTIVE = 0
+    REVALIDATE = 1
+    PREFETCH = 2
+
+
+# the requests in flight per cluster, by class
+DEFAULT_SHARES = {
+    RequestClass.INTERACTIVE: 8,
+    RequestClass.REVALIDATE: 2,
+    RequestClass.PREFETCH: 4,
+}
+
+# how often a queued request checks whether it was abandoned
+ABANDON_POLL_INTERVAL = 0.1
+
+AbandonCheck = Callable[[], bool]
+
+# the class of the requests made on this thread, the check for whether the
+# fuse operation they are made for was abandoned, and the slots it holds
+_current = threading.local()
+
+
+@contextmanager
+def request_class(
+    cls: RequestClass, *, is_abandoned: Optional[AbandonCheck] = None
+) -> Iterator[None]:
+    previous = getattr(_current, "state", None)
+    _current.state = (cls, is_abandoned)
+
+    try:
+        yield
+
+    finally:
+        _current.state = previous
+
+
+def get_current() -> Tuple[RequestClass, Optional[AbandonCheck]]:
+    "Threads that did not say are interactive"
+
+    state = getattr(_current, "state", None)
+    if state is None:
+        return RequestClass.INTERACTIVE, None
+
+    return state
+
+
+class RequestCancelled(Exception):
+    pass
+
+
+class ClusterScheduler:
+    def __init__(self, *, context: Context, shares: Dict[RequestClass, int]) -> None:
+        self.context = context
+        self.shares = shares
+
+        self.cond = threading.Condition()
+        self.running = {cls: 0 for cls in RequestClass}
+        self.waiting = {cls: 0 for cls in RequestClass}
+
+        self.requests = {cls: 0 for cls in RequestClass}
+        self.queued = {cls: 0 for cls in RequestClass}
+        self.cancelled = 0
+
+    def __repr__(self) -> str:
+        return "<%s context=%r, running=%r, waiting=%r, queued=%r, cancelled=%r>" % (
+            self.__class__.__name__,
+            self.context.name,
+            [self.running[cls] for cls in RequestClass],
+            [self.waiting[cls] for cls in RequestClass],
+            [self.queued[cls] for cls in RequestClass],
+            self.cancelled,
+        )
+
+    def can_start(self, cls: RequestClass) -> bool:
+        "Called with the lock held"
+
+        if self.running[cls] >= self.shares[cls]:
+            return False
+
+        return not any(
+            self.waiting[ahead] for ahead in RequestClass if ahead.value < cls.value
+        )
+
+    def acquire(self, cls: RequestClass, is_abandoned: Optional[AbandonCheck]) -> None:
+        with self.cond:
+            self.requests[cls] += 1
+
+            if not self.can_start(cls):
+                self.queued[cls] += 1
+                self.waiting[cls] += 1
+
+                try:
+                    while not self.can_start(cls):
+                        if is_abandoned is not None and is_abandoned():
+                            self.cancelled += 1
+                            raise RequestCancelled()
+
+                        timeout = ABANDON_POLL_INTERVAL if is_abandoned else None
+                        self.cond.wait(timeout)
+
+                finally:
+                    self.waiting[cls] -= 1
+                    # a class behind this one may be able to start now
+                    self.cond.notify_all()
+
+            self.running[cls] += 1
+
+    def release(self, cls: RequestClass) -> None:
+        with self.cond:
+            self.running[cls] -= 1
+            self.cond.notify_all()
+
+
+class RequestScheduler:
+    def __init__(self, *, shares: Dict[RequestClass, int] = DEFAULT_SHARES) -> None:
+        self.shares = dict(shares)
+
+        self.clusters: Dict[Context, ClusterScheduler] = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return "<%s clusters=%r>" % (
+            self.__class__.__name__,
+            list(self.clusters.values()),
+        )
+
+    def get_cluster(self, context: Context) -> ClusterScheduler:
+        with self.lock:
+            cluster = self.clusters.get(context)
+            if cluster is None:
+                cluster = ClusterScheduler(context=context, shares=self.shares)
+                self.clusters[context] = cluster
+
+            return cluster
+
+    def forget(self, context: Context) -> None:
+        "Drops a context removed from the kube config"
+
+        with self.lock:
+            self.clusters.pop(context, None)
+
+    @contextmanager
+    def slot(self, context: Context) -> Iterator[None]:
+        "Waits for the requests that follow to be the next ones to make"
+
+        held: Optional[Set[Context]] = getattr(_current, "held", None)
+        if held is None:
+            held = _current.held = set()
+
+        if context in held:
+            yield
+            return
+
+        cls, is_abandoned = get_current()
+        cluster = self.get_cluster(context)
+        cluster.acquire(cls, is_abandoned)
+        held.add(context)
+
+        try:
+            yield
+
+        finally:
+            held.discard(context)
+            cluster.release(cls)
+
+
+SCHEDULER = RequestScheduler()
+
+
+class ScheduledClusterFacade(SyncClusterFacade):
+    "The requests kubefs makes go through the scheduler, watches do not"
+
+    def __init__(
+        self,
+        *,
+        async_loop: AsyncLoop,
+        context: Context,
+        scheduler: RequestScheduler = SCHEDULER,
+        logger=None,
+    ) -> None:
+        super().__init__(async_loop=async_loop, context=context, logger=logger)
+        self.scheduler = scheduler
+
+    def list_api_resources(self) -> List[ApiResource]:
+        with self.scheduler.slot(self.context):
+            return super().list_api_resources()
+
+    def get_openapi_documents(self, *, group_versions: List[str]) -> List[Any]:
+        with self.scheduler.slot(self.context):
+            return super().get_openapi_documents(group_versions=group_versions)
+
+    def list_objects(self, *, selector: ObjectSelector) -> List[Any]:
+        with self.scheduler.slot(self.context):
+            return super().list_objects(selector=selector)
+
+    def list_objects_with_version(
+        self, *, selector: ObjectSelector
+    ) -> Tuple[List[Any], int]:
+        with self.scheduler.slot(self.context):
+            return super().list_objects_with_version(selector=selector)
+
+    def get_object(self, *, selector: ObjectSelector, name: str) -> Optional[Any]:
+        with self.scheduler.slot(self.context):
+            return super().get_object(selector=selector, name=name)
@@ -1,12 +1,8 @@
-import datetime
-import json
 from typing import Any
 
+from kube.codec import get_codec
 
-def to_json(obj: Any) -> str:
-    def default(obj):
-        if isinstance(obj, (datetime.date, datetime.date)):
-            return obj.isoformat()
 
-    block = json.dumps(obj, sort_keys=True, indent=2, default=default)
+def to_json(obj: Any) -> str:
+    block = get_codec().dumps_pretty(obj)
     return block + "\n"
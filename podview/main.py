@@ -1,19 +1,27 @@
 import argparse
-import fnmatch
+import asyncio
 import logging
+from queue import Empty, Queue
 from threading import current_thread
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from kube.async_loop import AsyncLoop, launch_in_background_thread
-from kube.channels.objects import OEvReceiver
-from kube.cluster_facade import SyncClusterFacade
+from kube.channels.objects import (
+    OEvChan,
+    OEvSender,
+    PipelineOEvSender,
+    create_oev_chan,
+)
+from kube.cluster_facade import AsyncClusterFacade
 from kube.config import Context, get_selector
-from kube.model.api_resource import NamespaceKind, PodKind
-from kube.model.object_model.kinds import Namespace
-from kube.model.selector import ObjectSelector
+from kube.config_watch import ConfigChange, KubeConfigWatcher, watch_configs
+from kube.events.objects import Action, ObjectEvent
+from kube.fanout import FanOutQuery
+from kube.model.selector import compile_glob
 from kube.tools.logs import configure_logging
 from podview.model.model import ScreenModel
 from podview.model.updater import ModelUpdater
+from podview.tracker import NamespaceTracker
 from podview.view.display import CursesDisplay, CursesDisplayError
 from podview.view.renderer import BufferRenderer
 
@@ -28,39 +36,127 @@ class Program:
         self.display = CursesDisplay()
 
         self.async_loop: Optional[AsyncLoop] = None
-        self.updater = None
+        self.oev_chan: Optional[OEvChan] = None
+        self.oev_sender: Optional[OEvSender] = None
+        self.trackers: List[NamespaceTracker] = []
+        # the clusters whose tracker failed to prepare, being tried again
+        self.retry_tasks: Dict[Context, asyncio.Task] = {}
+        self.updater: Optional[ModelUpdater] = None
+
+        # contexts removed from the kube config, to drop from the model on the
+        # ui thread, and those of them that have stopped sending events
+        self.config_watcher: Optional[KubeConfigWatcher] = None
+        self.removed_contexts: Queue = Queue()
+        self.stopped_contexts: Queue = Queue()
+
+    async def create_tracker(self, facade: AsyncClusterFacade) -> NamespaceTracker:
+        assert self.oev_sender is not None  # help mypy
+
+        tracker = NamespaceTracker(
+            facade=facade,
+            pattern=self.args.namespace or "*",
+            oev_sender=self.oev_sender,
+            max_watches=self.args.max_namespace_watches,
+        )
+        await tracker.prepare()
+        return tracker
 
-    def find_matching_namespaces(
-        self, namespace_pat: str, context: Context
-    ) -> List[str]:
+    async def start_trackers(self, query: FanOutQuery) -> None:
         assert self.async_loop is not None  # help mypy
+        assert self.oev_sender is not None  # help mypy
+
+        loop = self.async_loop.get_loop()
+
+        async for result in query.run(self.create_tracker):
+            if not result.is_ok:
+                event = ObjectEvent(
+                    context=result.context, action=Action.DEGRADED, object=result.error
+                )
+                self.oev_sender.send(event)
+
+                coro = self.retry_tracker(query, result.context)
+                self.retry_tasks[result.context] = loop.create_task(coro)
+                continue
+
+            assert result.value is not None  # help mypy
+            await result.value.start()
+            self.trackers.append(result.value)
+
+    async def retry_tracker(self, query: FanOutQuery, context: Context) -> None:
+        "Prepares the tracker of a failed cluster again until it succeeds"
+
+        assert self.oev_sender is not None  # help mypy
+
+        result = await query.retry_until_ok(context, self.create_tracker)
+
+        assert result.value is not None  # help mypy
+        await result.value.start()
+        self.trackers.append(result.value)
+        self.retry_tasks.pop(context, None)
+
+        event = ObjectEvent(context=context, action=Action.RECOVERED, object=None)
+        self.oev_sender.send(event)
 
-        facade = SyncClusterFacade(async_loop=self.async_loop, context=context)
-        selector = ObjectSelector(res=NamespaceKind)
-        namespace_objs = facade.list_objects(selector=selector)
-        namespaces = [Namespace(namespace).meta.name for namespace in namespace_objs]
+    async def stop_trackers(self, contexts: List[Context]) -> None:
+        for context in contexts:
+            task = self.retry_tasks.pop(context, None)
+            if task is not None:
+                task.cancel()
 
-        return fnmatch.filter(namespaces, namespace_pat)
+        for tracker in list(self.trackers):
+            if tracker.facade.context in contexts:
+                self.trackers.remove(tracker)
+                await tracker.stop()
 
-    def launch_watcher(self, context: Context) -> List[OEvReceiver]:
+    async def stop_contexts(self, contexts: List[Context]) -> None:
         assert self.async_loop is not None  # help mypy
 
-        facade = SyncClusterFacade(async_loop=self.async_loop, context=context)
+        await self.stop_trackers(contexts)
 
-        oev_receivers = []
-        if self.args.namespace not in (None, "", "*"):
-            namespaces = self.find_matching_namespaces(self.args.namespace, context)
-            for namespace in namespaces:
-                selector = ObjectSelector(res=PodKind, namespace=namespace)
-                oev_receiver = facade.list_then_watch(selector=selector)
-                oev_receivers.append(oev_receiver)
+        for context in contexts:
+            await self.async_loop.stop_cluster_loop(context)
+            self.stopped_contexts.put(context)
 
-        else:
-            selector = ObjectSelector(res=PodKind, namespace=None)
-            oev_receiver = facade.list_then_watch(selector=selector)
-            oev_receivers.append(oev_receiver)
+    def apply_config_change(self, change: ConfigChange) -> None:
+        "Called on the config watcher thread"
 
-        return oev_receivers
+        assert self.async_loop is not None  # help mypy
+
+        # a context whose file changed is both removed and added, which
+        # restarts its trackers with the new settings
+        if change.removed:
+            for context in change.removed:
+                self.removed_contexts.put(context)
+            self.async_loop.launch_coro(self.stop_contexts(change.removed))
+
+        matcher = compile_glob(self.args.cluster_context)
+        added = [context for context in change.added if matcher.match(context.name)]
+        if added:
+            query = FanOutQuery(async_loop=self.async_loop, contexts=added)
+            self.async_loop.launch_coro(self.start_trackers(query))
+
+    def drop_removed_contexts(self) -> None:
+        assert self.updater is not None  # help mypy
+
+        # read first, a context is queued as removed before it is stopped
+        stopped = []
+        while True:
+            try:
+                stopped.append(self.stopped_contexts.get_nowait())
+            except Empty:
+                break
+
+        while True:
+            try:
+                context = self.removed_contexts.get_nowait()
+            except Empty:
+                break
+
+            self.updater.removed_contexts.add(context)
+            self.model.clusters.pop(context, None)
+
+        for context in stopped:
+            self.updater.stopped_contexts.add(context)
 
     def initialize(self):
         main_thread = current_thread()
@@ -72,11 +168,26 @@ class Program:
         selector = get_selector()
         contexts = selector.fnmatch_context(self.args.cluster_context)
 
-        oev_receivers_lists = [self.launch_watcher(ctx) for ctx in contexts]
-        oev_receivers = [recv for lst in oev_receivers_lists for recv in lst]
-
+        self.oev_chan = create_oev_chan()
         self.updater = ModelUpdater(
-            contexts=contexts, receivers=oev_receivers, args=self.args
+            contexts=contexts, receivers=[self.oev_chan.receiver], args=self.args
+        )
+
+        # events are filtered and parsed on the way into the channel, on the
+        # event loop thread, so the ui thread only applies them to the model
+        self.oev_sender = PipelineOEvSender(
+            self.oev_chan.sender, self.updater.create_pipeline()
+        )
+
+        # all the clusters are queried at once and their pods show up as they
+        # are listed, so the ui does not wait for the slowest cluster
+        query = FanOutQuery(async_loop=self.async_loop, contexts=contexts)
+        self.async_loop.launch_coro(self.start_trackers(query))
+
+        # pick up contexts that are added to or changed in the kube config
+        # while we are running
+        self.config_watcher = watch_configs(
+            selector=selector, on_change=self.apply_config_change
         )
 
     def run_ui_loop(self):
@@ -84,6 +195,9 @@ class Program:
 
         try:
             while True:
+                self.drop_removed_contexts()
+
+                assert self.updater is not None  # help mypy
                 # self.updater.run(model=self.model, timeout=0.5)
                 self.updater.run(model=self.model, timeout=0.01)
 
@@ -88,6 +88,14 @@ class ClusterModel:
         self.name: Value[str] = Value()
         self.pods: Dict[str, PodModel] = {}
 
+        # the watches that failed and are being restarted, while there are any
+        # the pods shown may be out of date
+        self.degraded_watches = 0
+
+    @property
+    def is_degraded(self) -> bool:
+        return self.degraded_watches > 0
+
     def get_pod(self, name: str) -> PodModel:
         pod = self.pods.get(name)
 
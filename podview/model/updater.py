@@ -1,15 +1,15 @@
 import argparse
-import fnmatch
 import logging
 import os
 import time
 from datetime import timedelta
-from typing import List, Tuple
+from typing import List, Set, Tuple
 from urllib.parse import urlparse
 
 from kube.channels.objects import OEvReceiver
 from kube.config import Context
 from kube.events.objects import Action, ObjectEvent
+from kube.events.pipeline import EventPipeline, create_pipeline
 from kube.model.object_model.kinds import Pod
 from kube.model.object_model.status import (
     ContainerStateRunning,
@@ -18,6 +18,7 @@ from kube.model.object_model.status import (
     ContainerStatus,
     ContainerStatusVariant,
 )
+from kube.model.selector import compile_glob, compile_label_selector
 from kube.tools.timekeeping import date_now
 from podview.model.colors import ColorPicker
 from podview.model.model import ContainerModel, PodModel, ScreenModel
@@ -37,6 +38,16 @@ class ModelUpdater:
         self.logger = logger or logging.getLogger(__name__)
 
         self.color_picker = ColorPicker.get_instance()
+        self.pod_matcher = compile_glob(args.pod)
+        self.label_selector = None
+        if args.label_selector:
+            self.label_selector = compile_label_selector(args.label_selector)
+
+        # contexts that are gone from the kube config, whose watches may still
+        # have events in flight, and those of them that have stopped sending
+        # events, which are forgotten once the events sent are all received
+        self.removed_contexts: Set[Context] = set()
+        self.stopped_contexts: Set[Context] = set()
 
     # Model updates
 
@@ -150,7 +161,8 @@ class ModelUpdater:
 
     def update_model(self, model: ScreenModel, event: ObjectEvent) -> None:
         context = event.context
-        pod = Pod(event.object)
+        pod = event.wrapper
+        assert isinstance(pod, Pod)  # help mypy
         ts = event.time_created
 
         pod_app_name = pod.meta.labels.get("app")
@@ -188,6 +200,26 @@ class ModelUpdater:
             elif cont.name.startswith(pod.meta.name):
                 pod_model.image_hash.set(value=cont_image_hash, ts=ts)
 
+    def update_watch_status(self, model: ScreenModel, event: ObjectEvent) -> None:
+        context = event.context
+
+        cluster_model = model.get_cluster(context)
+        cluster_model.name.set(
+            value=context.short_name,
+            ts=event.time_created,
+            color=self.color_picker.get_for_context(context),
+        )
+
+        if event.action is Action.DEGRADED:
+            self.logger.warn(
+                "Watch on %s degraded: %r", event.context.short_name, event.object
+            )
+            cluster_model.degraded_watches += 1
+
+        elif event.action is Action.RECOVERED:
+            self.logger.info("Watch on %s recovered", event.context.short_name)
+            cluster_model.degraded_watches = max(cluster_model.degraded_watches - 1, 0)
+
     # Garbage collection
 
     def init_container_terminated_long_ago(self, cont: ContainerModel) -> bool:
@@ -225,23 +257,60 @@ class ModelUpdater:
                         cont.is_visible = False
 
     # Event processing
+    #
+    # filter_event() and prepare_event() run in the event pipeline, on the
+    # event loop thread, so they must only read what does not change after
+    # __init__.
 
     def filter_event(self, event: ObjectEvent) -> bool:
-        if isinstance(event.object, Exception):
-            raise event.object  # re-raise as uncaught exception
+        pod = event.wrapper
+        if not isinstance(pod, Pod):
+            return False
 
-        pod = Pod(event.object)
-        app_name = pod.meta.labels.get("app")
+        if self.label_selector is not None:
+            if not self.label_selector.matches_labels(pod.meta.labels):
+                return False
 
-        matches_name = fnmatch.fnmatch(pod.meta.name, self.args.pod)
-        matches_app_name = False
+        if self.pod_matcher.match(pod.meta.name):
+            return True
 
+        app_name = pod.meta.labels.get("app")
         if app_name:
-            matches_app_name = fnmatch.fnmatch(app_name, self.args.pod)
+            return self.pod_matcher.match(app_name)
+
+        return False
+
+    def prepare_event(self, event: ObjectEvent) -> None:
+        "Parses the fields that update_model() reads, they are cached"
+
+        pod = event.wrapper
+        assert isinstance(pod, Pod)  # help mypy
 
-        return matches_name or matches_app_name
+        pod.meta.creationTimestamp
+        pod.meta.deletionTimestamp
+        pod.status.startTime
+
+        for cont in pod.status.initContainerStatuses + pod.status.containerStatuses:
+            for state in (cont.state, cont.lastState):
+                if isinstance(state, (ContainerStateRunning, ContainerStateTerminated)):
+                    state.startedAt
+                if isinstance(state, ContainerStateTerminated):
+                    state.finishedAt
+
+    def create_pipeline(self) -> EventPipeline:
+        return create_pipeline(predicate=self.filter_event, enricher=self.prepare_event)
+
+    def forget_stopped_contexts(self) -> None:
+        if not self.stopped_contexts:
+            return
+
+        if all(receiver.queue.empty() for receiver in self.receivers):
+            self.removed_contexts -= self.stopped_contexts
+            self.stopped_contexts.clear()
 
     def run(self, model: ScreenModel, timeout: float):
+        self.forget_stopped_contexts()
+
         start_time = time.time()
         pause = max(timeout / 10, 0.001)
 
@@ -251,7 +320,13 @@ class ModelUpdater:
 
             for receiver in self.receivers:
                 event = receiver.recv_nowait()
-                if event and self.filter_event(event):
+                if event and event.context in self.removed_contexts:
+                    continue
+
+                # events were filtered and prepared by the pipeline
+                if event and event.action in (Action.DEGRADED, Action.RECOVERED):
+                    self.update_watch_status(model, event)
+                elif event:
                     self.update_model(model, event)
 
             time.sleep(pause)
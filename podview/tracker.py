@@ -0,0 +1,270 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from kube.channels.objects import AsyncOEvReceiver, FilteredOEvSender, OEvSender
+from kube.cluster_facade import AsyncClusterFacade
+from kube.events.objects import Action, ObjectEvent
+from kube.model.api_resource import NamespaceKind, PodKind
+from kube.model.projection import Projection
+from kube.model.selector import ObjectSelector, compile_glob
+
+# the only fields of the objects that podview reads
+NamespaceFields = Projection(keep=["status.phase"])
+PodFields = Projection(
+    keep=[
+        "metadata.labels",
+        "status.phase",
+        "status.startTime",
+        "status.message",
+        "status.reason",
+        "status.containerStatuses",
+        "status.initContainerStatuses",
+    ]
+)
+
+# beyond this many matching namespaces we watch all the pods in the cluster
+MAX_NAMESPACE_WATCHES = 20
+
+
+class NamespaceTracker:
+    """
+    Watches the pods in the namespaces of one cluster that match a pattern,
+    following namespaces as they are created and deleted.
+
+    There is one pod watch per matching namespace, until there are more than
+    `max_watches` of them. Then we switch to a single cluster-wide pod watch
+    and drop the pods of other namespaces on our side, so the number of
+    connections stays bounded. The namespaces are not followed from then on,
+    the pattern alone decides which pods we keep.
+    """
+
+    def __init__(
+        self,
+        *,
+        facade: AsyncClusterFacade,
+        pattern: str,
+        oev_sender: OEvSender,
+        max_watches: int = MAX_NAMESPACE_WATCHES,
+        logger=None,
+    ) -> None:
+        self.facade = facade
+        self.pattern = pattern
+        self.matcher = compile_glob(pattern)
+        self.oev_sender = oev_sender
+        self.max_watches = max_watches
+        self.logger = logger or logging.getLogger("tracker")
+
+        self.namespace_selector = ObjectSelector(
+            res=NamespaceKind, projection=NamespaceFields
+        )
+
+        # the namespaces that match the pattern and their pod watches, if we
+        # are not watching the whole cluster
+        self.namespaces: Set[str] = set()
+        self.pod_selectors: Dict[str, ObjectSelector] = {}
+        self.cluster_selector: Optional[ObjectSelector] = None
+
+        # the initial lists, until we start
+        self.pod_lists: Dict[ObjectSelector, List[Any]] = {}
+
+        self.task: Optional[asyncio.Task] = None
+
+    def __repr__(self) -> str:
+        return "<%s context=%r, pattern=%r, namespaces=%r, is_cluster_wide=%r>" % (
+            self.__class__.__name__,
+            self.facade.context.short_name,
+            self.pattern,
+            len(self.namespaces),
+            self.is_cluster_wide,
+        )
+
+    @property
+    def is_cluster_wide(self) -> bool:
+        return self.cluster_selector is not None
+
+    def matches(self, namespace: str) -> bool:
+        return self.matcher.match(namespace)
+
+    def is_tracked(self, obj: Any) -> bool:
+        # match the pattern rather than look up self.namespaces, the pods of a
+        # new namespace can arrive before the namespace itself
+        return self.matches(obj["metadata"].get("namespace") or "")
+
+    def filter_event(self, event: ObjectEvent) -> bool:
+        # let watch status events through
+        if not isinstance(event.object, dict):
+            return True
+
+        return self.is_tracked(event.object)
+
+    def send_listed(self, items: List[Any]) -> None:
+        for item in items:
+            event = ObjectEvent(
+                context=self.facade.context, action=Action.LISTED, object=item
+            )
+            self.oev_sender.send(event)
+
+    async def prepare(self) -> None:
+        "Lists what we are going to watch, without starting anything yet"
+
+        namespace_objs = await self.facade.list_objects(
+            selector=self.namespace_selector
+        )
+        names = [obj["metadata"]["name"] for obj in namespace_objs]
+        self.namespaces = set(name for name in names if self.matches(name))
+
+        # a pattern that matches everything is best served by one watch
+        if self.matcher.matches_everything or len(self.namespaces) > self.max_watches:
+            self.cluster_selector = ObjectSelector(res=PodKind, projection=PodFields)
+            selectors = [self.cluster_selector]
+        else:
+            self.pod_selectors = {
+                namespace: ObjectSelector(
+                    res=PodKind, namespace=namespace, projection=PodFields
+                )
+                for namespace in self.namespaces
+            }
+            selectors = list(self.pod_selectors.values())
+
+        coros = [self.facade.list_objects(selector=selector) for selector in selectors]
+        lists = await asyncio.gather(*coros)
+        self.pod_lists = dict(zip(selectors, lists))
+
+    async def start(self) -> None:
+        "Starts watching what prepare() listed"
+
+        cluster_loop = await self.facade.async_loop.get_cluster_loop(
+            self.facade.context
+        )
+
+        for selector, items in self.pod_lists.items():
+            oev_sender = self.oev_sender
+            if selector is self.cluster_selector:
+                oev_sender = FilteredOEvSender(oev_sender, self.filter_event)
+                items = [item for item in items if self.is_tracked(item)]
+
+            self.send_listed(items)
+            await cluster_loop.start_watch(selector, oev_sender)
+
+        self.pod_lists = {}
+
+        if self.is_cluster_wide:
+            self.logger.info("Started %r", self)
+            return
+
+        receiver = await self.facade.start_watching(selector=self.namespace_selector)
+        loop = self.facade.async_loop.get_loop()
+        self.task = loop.create_task(self.follow_namespaces(receiver))
+
+        self.logger.info("Started %r", self)
+
+    async def follow_namespaces(self, receiver: AsyncOEvReceiver) -> None:
+        async for event in receiver:
+            if not isinstance(event.object, dict):
+                self.logger.warn("Namespace watch on %r: %r", self, event.action)
+                continue
+
+            name = event.object["metadata"]["name"]
+
+            try:
+                if event.action is Action.DELETED:
+                    await self.remove_namespace(name)
+                elif self.matches(name):
+                    await self.add_namespace(name)
+
+            except Exception:
+                self.logger.exception("Failed to follow namespace %r", name)
+
+            if self.is_cluster_wide:
+                break
+
+        # switched to a cluster-wide watch
+        if self.is_cluster_wide:
+            self.task = None
+            await self.facade.stop_watching(selector=self.namespace_selector)
+
+    async def add_namespace(self, namespace: str) -> None:
+        if namespace in self.namespaces:
+            return
+
+        self.namespaces.add(namespace)
+        self.logger.info("Namespace %r appeared on %r", namespace, self)
+
+        if self.is_cluster_wide:
+            return
+
+        if len(self.namespaces) > self.max_watches:
+            await self.switch_to_cluster_wide()
+            return
+
+        selector = ObjectSelector(
+            res=PodKind, namespace=namespace, projection=PodFields
+        )
+
+        items = await self.facade.list_objects(selector=selector)
+        self.send_listed(items)
+
+        cluster_loop = await self.facade.async_loop.get_cluster_loop(
+            self.facade.context
+        )
+        await cluster_loop.start_watch(selector, self.oev_sender)
+        self.pod_selectors[namespace] = selector
+
+    async def remove_namespace(self, namespace: str) -> None:
+        if namespace not in self.namespaces:
+            return
+
+        self.namespaces.discard(namespace)
+        self.logger.info("Namespace %r disappeared from %r", namespace, self)
+
+        selector = self.pod_selectors.pop(namespace, None)
+        if selector is not None:
+            cluster_loop = await self.facade.async_loop.get_cluster_loop(
+                self.facade.context
+            )
+            await cluster_loop.stop_watch(selector)
+
+    async def switch_to_cluster_wide(self) -> None:
+        self.logger.info("Switching to a cluster-wide pod watch on %r", self)
+
+        cluster_loop = await self.facade.async_loop.get_cluster_loop(
+            self.facade.context
+        )
+
+        selector = ObjectSelector(res=PodKind, projection=PodFields)
+        items = await self.facade.list_objects(selector=selector)
+        self.send_listed([item for item in items if self.is_tracked(item)])
+
+        oev_sender = FilteredOEvSender(self.oev_sender, self.filter_event)
+        await cluster_loop.start_watch(selector, oev_sender)
+        self.cluster_selector = selector
+
+        # the cluster-wide watch covers these now
+        for namespace_selector in self.pod_selectors.values():
+            await cluster_loop.stop_watch(namespace_selector)
+        self.pod_selectors = {}
+
+    async def stop(self) -> None:
+        "Stops all the watches, eg. when the context is gone from the kube config"
+
+        # following namespaces
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+            await self.facade.stop_watching(selector=self.namespace_selector)
+
+        cluster_loop = await self.facade.async_loop.get_cluster_loop(
+            self.facade.context
+        )
+
+        selectors = list(self.pod_selectors.values())
+        if self.cluster_selector is not None:
+            selectors.append(self.cluster_selector)
+
+        for selector in selectors:
+            await cluster_loop.stop_watch(selector)
+
+        self.pod_selectors = {}
+        self.cluster_selector = None
+        self.logger.info("Stopped %r", self)
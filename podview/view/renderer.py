@@ -177,10 +177,14 @@ class BufferRenderer:
             return self.buffer
 
         for cluster in clusters:
+            color = cluster.name.current_color
+            if cluster.is_degraded:
+                color = self.color_picker.get_warn_color()
+
             self.buffer.write(
                 text=cluster.name.current_value or "",
                 width=self.cluster_name_width,
-                color=cluster.name.current_color,
+                color=color,
             )
 
             with self.buffer.indent(width=3):